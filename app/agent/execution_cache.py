@@ -0,0 +1,110 @@
+"""
+Execution-level cache for complete planning runs.
+
+Recurring planning for the same well and objectives reproduces the same plan.
+Only runs that passed validation are stored, in SQLite keyed on
+sha256(well_id, objectives, max_loops, graph_snapshot_version, app settings),
+so a repeat run is served without any LLM or database work, and entries go
+stale automatically when the well's graph data changes. The cache is opt-in
+(EXECUTION_CACHE_ENABLED=true).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# Under the repository root rather than the working directory
+DEFAULT_CACHE_PATH = str(Path(__file__).resolve().parents[2] / "workflow_logs" / "execution_cache.sqlite")
+
+
+def execution_key(well_id: str, objectives: str, max_loops: int, snapshot_version: str,
+                  app_settings: str) -> str:
+    """
+    Build the cache key for one planning run.
+
+    Args:
+        app_settings: Fingerprint of the app the run executes on (evidence
+            weights and objective specialization), so differently configured
+            apps never share results
+    """
+    raw = "\x00".join([well_id, objectives, str(max_loops), snapshot_version, app_settings])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ExecutionCache:
+    """
+    SQLite-backed store of run results with per-entry expiry.
+
+    A connection is opened per operation, so one instance can be shared across threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: int = 86400):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS executions ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, result TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None on miss/expiry."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT expires_at, result FROM executions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= time.time():
+                conn.execute("DELETE FROM executions WHERE key = ?", (key,))
+                return None
+        return json.loads(row[1])
+
+    def set(self, key: str, result: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Store a run result under key."""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO executions (key, expires_at, result) VALUES (?, ?, ?)",
+                (key, expires_at, json.dumps(result, default=str))
+            )
+
+    def clear(self) -> None:
+        """Drop all cached runs."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM executions")
+
+
+_cache: Optional[ExecutionCache] = None
+_cache_configured = False
+
+
+def get_execution_cache() -> Optional[ExecutionCache]:
+    """
+    Return the process-wide execution cache, or None unless EXECUTION_CACHE_ENABLED is true.
+
+    Configuration:
+        EXECUTION_CACHE_ENABLED: "true"/"false" (default "false")
+        EXECUTION_CACHE_PATH: SQLite file (default <repo>/workflow_logs/execution_cache.sqlite)
+        EXECUTION_CACHE_TTL: Entry lifetime in seconds (default 86400)
+
+    The environment is read once, on first call.
+    """
+    global _cache, _cache_configured
+    if not _cache_configured:
+        if os.getenv("EXECUTION_CACHE_ENABLED", "false").lower() == "true":
+            _cache = ExecutionCache(
+                path=os.getenv("EXECUTION_CACHE_PATH", DEFAULT_CACHE_PATH),
+                ttl=int(os.getenv("EXECUTION_CACHE_TTL", "86400"))
+            )
+        _cache_configured = True
+    return _cache
@@ -22,12 +22,24 @@ Dependencies: langgraph>=0.2, ibm-watsonx-ai>=1.2.0, neo4j>=5.16.0, astrapy>=1.4
 import os
 import re
 import time
+import string
+import hashlib
+import asyncio
 import logging
-from typing import TypedDict, List, Dict, Any, Optional
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import islice
+from types import MappingProxyType
+from typing import TypedDict, Annotated, Callable, Deque, List, Dict, Any, Optional, Iterable, Tuple
 from uuid import uuid4
 
 from langgraph.graph import StateGraph, END
 
+from app.agent.execution_cache import execution_key, get_execution_cache
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,17 +47,58 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Environment validation at module level - STRICT MODE
+# Level-2 markdown headers ("## Plan Summary") - one pass yields both presence and count
+_H2_RE = re.compile(r"(?m)^##\s+(.+)$")
+
+# Reflection section appended to the plan - only the four placeholders vary per iteration
+_REFLECTION_TMPL = string.Template("""
+
+---
+
+## Iteration $loop - Constraint Violation Analysis
+
+### Validation Results
+- **Status**: FAILED
+- **Violations Found**: $violations
+- **Confidence**: $confidence
+
+### Root Cause Analysis and Optimization Strategy
+$analysis
+
+---
+""")
+
+_REQUIRED_WORKFLOW_VARS = (
+    "WX_API_KEY", "WX_PROJECT_ID",  # Watson X AI
+    "NEO4J_URI", "NEO4J_USERNAME", "NEO4J_PASSWORD",  # Neo4j
+    "ASTRA_DB_API_ENDPOINT", "ASTRA_DB_APPLICATION_TOKEN",  # AstraDB
+    "GRAPH_WEIGHT", "ASTRA_WEIGHT", "MAX_LOOPS"  # Required workflow parameters
+)
+
+
+# Environment validation - STRICT MODE
 def validate_workflow_environment():
-    """Validate workflow-specific environment variables - STRICT VALIDATION."""
-    required_vars = [
-        "WX_API_KEY", "WX_PROJECT_ID",  # Watson X AI
-        "NEO4J_URI", "NEO4J_USERNAME", "NEO4J_PASSWORD",  # Neo4j
-        "ASTRA_DB_API_ENDPOINT", "ASTRA_DB_APPLICATION_TOKEN",  # AstraDB
-        "GRAPH_WEIGHT", "ASTRA_WEIGHT", "MAX_LOOPS"  # Required workflow parameters
-    ]
-    
-    missing = [var for var in required_vars if not os.getenv(var)]
+    """
+    Validate workflow-specific environment variables - STRICT VALIDATION.
+    
+    The check runs once per distinct set of values: a repeat call with an
+    unchanged environment is a digest lookup. Failures are never cached.
+    Call _validate_env.cache_clear() to force re-validation.
+    
+    Raises:
+        EnvironmentError: If a variable is missing or malformed
+    """
+    digest = hashlib.blake2b(
+        "\x00".join(os.getenv(var, "") for var in _REQUIRED_WORKFLOW_VARS).encode("utf-8"),
+        digest_size=8
+    ).hexdigest()
+    _validate_env(digest)
+
+
+@lru_cache(maxsize=None)
+def _validate_env(digest: str) -> None:
+    """Validate the current environment; memoized on its digest, see validate_workflow_environment."""
+    missing = [var for var in _REQUIRED_WORKFLOW_VARS if not os.getenv(var)]
     if missing:
         raise EnvironmentError(f"Missing required environment variables for workflow: {missing}")
 
@@ -69,8 +122,66 @@ def validate_workflow_environment():
     except ValueError:
         raise EnvironmentError(f"MAX_LOOPS must be integer, got: {max_loops_str}")
 
-# Call validation on import - CRITICAL FOR FAIL-FAST
-#validate_workflow_environment()
+# Validation runs lazily on the first build_app() call - see _compile_app
+
+
+@dataclass(frozen=True)
+class WorkflowConfig:
+    """
+    Workflow parameters snapshotted once at build time.
+
+    Nodes read this instead of os.environ so concurrent runs never observe
+    each other's settings and the hot loop does no env parsing.
+    """
+    graph_weight: float
+    astra_weight: float
+
+    @classmethod
+    def from_env(cls) -> "WorkflowConfig":
+        """
+        Build config from GRAPH_WEIGHT and ASTRA_WEIGHT - STRICT MODE.
+
+        The loop limit is per run (run_once's max_loops), so it is not part of the config.
+
+        Raises:
+            EnvironmentError: If a variable is missing or not numeric
+        """
+        missing = [var for var in ("GRAPH_WEIGHT", "ASTRA_WEIGHT") if not os.getenv(var)]
+        if missing:
+            raise EnvironmentError(f"Missing required environment variables for workflow: {missing}")
+
+        try:
+            return cls(
+                graph_weight=float(os.environ["GRAPH_WEIGHT"]),
+                astra_weight=float(os.environ["ASTRA_WEIGHT"])
+            )
+        except ValueError as e:
+            raise EnvironmentError(f"Invalid workflow configuration: {e}")
+
+
+# Upper bound on max_loops - history never needs to hold more entries than this
+_MAX_LOOPS_LIMIT = 20
+
+
+def _append_history(existing: Optional[Iterable[Dict[str, Any]]],
+                    new: Iterable[Dict[str, Any]]) -> Deque[Dict[str, Any]]:
+    """
+    History reducer - appends new entries to a bounded deque (never mutates the old one).
+    
+    The copy is deliberate: LangGraph shares a channel's value between channel
+    copies and re-applies pending writes to them (e.g. when conditional edges
+    read the state), so extending in place would record entries twice. The
+    copy is shallow and bounded by _MAX_LOOPS_LIMIT entries.
+    """
+    history = deque(existing or (), maxlen=_MAX_LOOPS_LIMIT)
+    history.extend(new)
+    return history
+
+
+def _tail(history: Deque[Dict[str, Any]], n: int) -> List[Dict[str, Any]]:
+    """Last n history entries, oldest first."""
+    return list(islice(history, max(0, len(history) - n), None))
+
 
 class PlanState(TypedDict):
     """
@@ -79,14 +190,22 @@ class PlanState(TypedDict):
     This TypedDict defines the shared state that flows through all nodes in the 
     LangGraph workflow, implementing the knowledge-driven architecture described
     in the project documentation.
+    
+    Nodes return only the keys they change; LangGraph merges them into the state.
+    ``history`` is append-only - nodes return new entries and the reducer appends
+    them to a bounded deque.
+    ``draft`` is the current plan; ``draft_parts`` is the plan followed by the
+    reflection section of every iteration so far, joined only when the result
+    is returned.
     """
     plan_id: str
     well_id: str
     context: Dict[str, Any]
     draft: str
+    draft_parts: List[str]
     validation: Dict[str, Any]
     kpis: Dict[str, float]
-    history: List[Dict[str, Any]]
+    history: Annotated[Deque[Dict[str, Any]], _append_history]
     loop: int
     objectives: str
     max_loops: int
@@ -94,6 +213,73 @@ class PlanState(TypedDict):
     parsed_plan: Optional[Dict[str, Any]]
     retrieval_metadata: Optional[Dict[str, Any]]
     performance_metrics: Optional[Dict[str, Any]]
+    reflection_metadata: Optional[Dict[str, Any]]
+    convergence_info: Optional[Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class NodeDependencies:
+    """
+    Service functions the nodes call, resolved once when the graph is built.
+    
+    The modules are imported lazily (they import this package's config at load
+    time), but only once - nodes receive the resolved functions instead of
+    running import statements on every loop iteration.
+    """
+    retrieve_subgraph_context: Callable
+    validate_against_constraints: Callable
+    record_iteration: Callable
+    compress_context: Callable
+    estimate_tokens: Callable
+    generate_drilling_plan_structured: Callable
+    plan_prompt_header: Callable
+    generate_reflection_structured: Callable
+    cache_context: Callable
+    compute_kpis: Callable
+
+
+@lru_cache(maxsize=1)
+def load_node_dependencies() -> NodeDependencies:
+    """
+    Import the service modules used by the workflow nodes - fails fast.
+    
+    Raises:
+        EnvironmentError: If a required module is not available
+    """
+    try:
+        from app.graph.graph_rag import retrieve_subgraph_context, validate_against_constraints, record_iteration
+        from app.llm.context_compress import compress_context, estimate_tokens
+        from app.llm.watsonx_client import (
+            generate_drilling_plan_structured, plan_prompt_header, generate_reflection_structured, cache_context
+        )
+        from app.evaluation.kpi import compute_kpis
+    except ImportError as e:
+        raise EnvironmentError(f"Required module not available: {e}")
+    
+    return NodeDependencies(
+        retrieve_subgraph_context=retrieve_subgraph_context,
+        validate_against_constraints=validate_against_constraints,
+        record_iteration=record_iteration,
+        compress_context=compress_context,
+        estimate_tokens=estimate_tokens,
+        generate_drilling_plan_structured=generate_drilling_plan_structured,
+        plan_prompt_header=plan_prompt_header,
+        generate_reflection_structured=generate_reflection_structured,
+        cache_context=cache_context,
+        compute_kpis=compute_kpis
+    )
+
+
+@dataclass(frozen=True)
+class ObjectiveProfile:
+    """
+    Objectives an app is specialized for (see build_app).
+
+    The plan prompt header - instructions, evidence weights and objectives - is
+    rendered once when the app is compiled instead of on every draft.
+    """
+    objectives: str
+    prompt_header: str
 
 
 def _validate_state_structure(state: PlanState, required_keys: List[str]) -> None:
@@ -105,7 +291,29 @@ def _validate_state_structure(state: PlanState, required_keys: List[str]) -> Non
         raise KeyError(f"State missing required keys: {missing_keys}")
 
 
-def node_retrieve(state: PlanState) -> PlanState:
+# Audit-trail writes (record_iteration) run here so validation never waits on Neo4j
+_AUDIT_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="plan-audit")
+
+
+def _log_audit_result(plan_id: str, iteration: int, future: Future) -> None:
+    """Done-callback for audit writes - failures are logged, never raised."""
+    error = future.exception()
+    if error is not None:
+        logger.warning(f"Failed to record iteration {iteration} of {plan_id} in knowledge graph: {error}")
+
+
+def _wrap_err(e: Exception, node_name: str, message: str) -> Dict[str, Any]:
+    """
+    Turn a node failure into an error-channel state update.
+    
+    The error is logged and returned, never re-raised; the conditional edges
+    route any state carrying "error" straight to END.
+    """
+    logger.error(f"Error in {node_name}: {e}")
+    return {"error": f"{message}: {e}"}
+
+
+def node_retrieve(state: PlanState, deps: Optional[NodeDependencies] = None) -> Dict[str, Any]:
     """
     Retrieve contextual information for well planning using GraphRAG.
     
@@ -115,20 +323,19 @@ def node_retrieve(state: PlanState) -> PlanState:
     
     Args:
         state: Current planning state
+        deps: Service functions bound by build_app (loaded on demand when called directly)
         
     Returns:
-        Updated state with retrieved context
-        
-    Raises:
-        ConnectionError: If Neo4j or AstraDB connection fails
-        ValueError: If no data found for well_id
+        State update with retrieved context, or an "error" update (see _wrap_err)
+        if Neo4j/AstraDB is unavailable or no data is found for well_id
     """
     try:
         # Validate required state keys
         _validate_state_structure(state, ["well_id", "objectives"])
         
-        # Import here to avoid circular dependencies
-        from app.graph.graph_rag import retrieve_subgraph_context
+        # Service functions resolved once at build time
+        deps = deps or load_node_dependencies()
+        retrieve_subgraph_context = deps.retrieve_subgraph_context
         
         logger.info(f"Retrieving context for well {state['well_id']} with objectives: {state['objectives']}")
         
@@ -162,28 +369,60 @@ def node_retrieve(state: PlanState) -> PlanState:
         if docs_count == 0:
             raise ValueError(f"Zero documents found for well {state['well_id']}")
         
-        # Update state with retrieved context
-        state = dict(state)  # Create a copy to avoid mutation issues
-        state["context"] = ctx
-        
         if "retrieval_metadata" not in ctx:
             raise ValueError("Missing retrieval metadata from context")
         
-        state["retrieval_metadata"] = ctx["retrieval_metadata"]
-        
         logger.info(f"Successfully retrieved context: {formations_count} formations, {docs_count} docs, "
                    f"{examples_count} historical examples")
         
-        return state
+        return {
+            "context": ctx,
+            "retrieval_metadata": ctx["retrieval_metadata"]
+        }
         
     except Exception as e:
-        logger.error(f"Error in node_retrieve: {e}")
-        state = dict(state)
-        state["error"] = f"Context retrieval failed: {str(e)}"
-        return state
+        return _wrap_err(e, "node_retrieve", "Context retrieval failed")
 
 
-def node_draft(state: PlanState) -> PlanState:
+def node_compress(state: PlanState, deps: Optional[NodeDependencies] = None) -> Dict[str, Any]:
+    """
+    Compress the retrieved context into a compact prompt block.
+    
+    Documents are deduplicated and trimmed to their most objective-relevant
+    sentences, and the graph context is serialized as compact JSON under a
+    token budget. The result is stored in context["prompt_ready"] and reused
+    verbatim by every draft iteration.
+    
+    Args:
+        state: Current planning state with retrieved context
+        deps: Service functions bound by build_app (loaded on demand when called directly)
+        
+    Returns:
+        State update with the compressed context, or an "error" update (see _wrap_err)
+    """
+    try:
+        # Validate required state keys
+        _validate_state_structure(state, ["well_id", "objectives", "context"])
+        
+        # Service functions resolved once at build time
+        deps = deps or load_node_dependencies()
+        compress_context, estimate_tokens = deps.compress_context, deps.estimate_tokens
+        
+        context = state["context"]
+        prompt_ready = compress_context(context, state["objectives"])
+        
+        logger.info(f"Compressed context for well {state['well_id']} to "
+                   f"~{estimate_tokens(prompt_ready)} tokens")
+        
+        return {"context": {**context, "prompt_ready": prompt_ready}}
+        
+    except Exception as e:
+        return _wrap_err(e, "node_compress", "Context compression failed")
+
+
+def node_draft(state: PlanState, cfg: Optional[WorkflowConfig] = None,
+               deps: Optional[NodeDependencies] = None,
+               profile: Optional[ObjectiveProfile] = None) -> Dict[str, Any]:
     """
     Generate drilling plan draft using watsonx.ai LLM with markdown formatting.
     
@@ -193,42 +432,53 @@ def node_draft(state: PlanState) -> PlanState:
     
     Args:
         state: Current planning state with context
+        cfg: Workflow config bound by build_app (read from env when called directly)
+        deps: Service functions bound by build_app (loaded on demand when called directly)
+        profile: Objective profile bound by build_app(objectives=...), if specialized
         
     Returns:
-        Updated state with draft plan
-        
-    Raises:
-        ValueError: If plan generation or parsing fails
-        ConnectionError: If watsonx.ai API is unavailable
+        State update with draft plan, or an "error" update (see _wrap_err) if
+        plan generation or parsing fails or watsonx.ai is unavailable
     """
     try:
         # Validate required state keys
         _validate_state_structure(state, ["well_id", "objectives", "context", "loop"])
         
-        # Import here to avoid circular dependencies
-        from app.llm.watsonx_client import generate_drilling_plan_markdown, parse_markdown_plan
+        # Service functions resolved once at build time
+        deps = deps or load_node_dependencies()
+        generate_drilling_plan_structured = deps.generate_drilling_plan_structured
+        cache_context = deps.cache_context
         
         logger.info(f"Generating draft plan for well {state['well_id']}, iteration {state['loop']}")
         
-        # Check for previous errors
-        if state.get("error"):
-            logger.warning(f"Skipping draft generation due to previous error: {state['error']}")
-            return state
-        
         # STRICT validation - no fallback values
         context = state["context"]
         objectives = state["objectives"]
         
-        # Get weight configuration - STRICT validation required
-        graph_weight = float(os.environ["GRAPH_WEIGHT"])
-        astra_weight = float(os.environ["ASTRA_WEIGHT"])
+        # run_once rejects this before the graph runs; guards direct app.invoke callers
+        if profile is not None and objectives != profile.objectives:
+            raise ValueError(f"App specialized for objectives '{profile.objectives}' "
+                             f"cannot plan for '{objectives}'")
+        
+        # Weight configuration - snapshotted by build_app, STRICT validation required
+        if cfg is None:
+            cfg = WorkflowConfig.from_env()
+        graph_weight = cfg.graph_weight
+        astra_weight = cfg.astra_weight
         
         # Validate weights sum appropriately
         total_weight = graph_weight + astra_weight
         if abs(total_weight - 1.0) > 0.1:
             logger.warning(f"Weights don't sum to 1.0: Graph={graph_weight}, Astra={astra_weight}")
         
-        # Add iteration context for refinement
+        # Render the per-well evidence once - later iterations reuse it through the handle.
+        # Context is never mutated in place; a new dict is returned when it changes.
+        if "cache_handle" not in context:
+            context = {**context, "cache_handle": cache_context(context)}
+        
+        # Add iteration context for refinement. A redraft follows a failed validation,
+        # so it must reach the model - a cached plan would just repeat the failure.
+        use_cache = state["loop"] == 0
         if state["loop"] > 0:
             if "validation" not in state:
                 raise ValueError("Previous validation data missing for iteration")
@@ -238,76 +488,77 @@ def node_draft(state: PlanState) -> PlanState:
             if "violations" not in previous_validation:
                 raise ValueError("Previous validation missing violations data")
             
-            if previous_validation["violations"]:
-                context["previous_violations"] = previous_validation["violations"]
-                context["iteration_number"] = state["loop"]
-        
-        # Generate markdown-formatted drilling plan - STRICT MODE
+            violations = previous_validation["violations"]
+            if violations:
+                # Compact refinement payload - the current violations, which of them
+                # survived the previous redraft, and the change proposed by the latest
+                # reflection. Never the accumulated plan, so the prompt stays bounded.
+                earlier = set(context.get("previous_violations") or ())
+                reflection = state.get("reflection_metadata") or {}
+                context = {
+                    **context,
+                    "previous_violations": violations,
+                    "persisting_violations": [v for v in violations if v in earlier],
+                    "latest_reflection": (reflection.get("proposed_change")
+                                          if reflection.get("iteration") == state["loop"] - 1 else None),
+                    "iteration_number": state["loop"]
+                }
+        
+        # Generate structured drilling plan - STRICT MODE
         try:
-            markdown_plan = generate_drilling_plan_markdown(
+            parsed_plan = generate_drilling_plan_structured(
                 context=context,
                 objectives=objectives,
                 graph_weight=graph_weight,
-                astra_weight=astra_weight
+                astra_weight=astra_weight,
+                use_cache=use_cache,
+                prompt_header=profile.prompt_header if profile else None
             )
         except Exception as e:
             raise ConnectionError(f"watsonx.ai generation failed: {e}")
-        
+
+        # Schema-constrained output is already structured - the markdown is rendered from it
+        markdown_plan = parsed_plan["plan_text"]
+
         if not markdown_plan:
             raise ValueError("Generated plan is empty")
         
         if len(markdown_plan.strip()) < 100:
             raise ValueError(f"Generated plan is too short: {len(markdown_plan)} characters")
         
-        # Parse markdown plan to structured data - STRICT validation
-        try:
-            parsed_plan = parse_markdown_plan(markdown_plan)
-        except Exception as e:
-            raise ValueError(f"Plan parsing failed: {e}")
-        
-        if not parsed_plan:
-            raise ValueError("Plan parsing returned empty result")
-        
-        # Validate parsing results
-        if parsed_plan.get("parsing_error"):
-            raise ValueError(f"Plan parsing error: {parsed_plan['parsing_error']}")
-        
         # Enhanced plan validation - STRICT requirements
+        headers = {match.group(1).strip() for match in _H2_RE.finditer(markdown_plan)}
         required_sections = ["Plan Summary", "BHA Configuration", "Drilling Parameters"]
-        missing_sections = [section for section in required_sections 
-                          if section not in markdown_plan]
+        missing_sections = [section for section in required_sections
+                          if section not in headers]
         
         if missing_sections:
             raise ValueError(f"Generated plan missing required sections: {missing_sections}")
         
-        # Update state with both formats
-        state = dict(state)
-        state["draft"] = markdown_plan  # Store full markdown for human readability
-        state["parsed_plan"] = parsed_plan  # Store structured data for processing
-        
-        # Add performance metrics
-        state["performance_metrics"] = {
-            "plan_length": len(markdown_plan),
-            "parsing_successful": not parsed_plan.get("parsing_error"),
-            "sections_count": len(re.findall(r'^##\s+', markdown_plan, re.MULTILINE)),
-            "generation_iteration": state["loop"],
-            "graph_weight_used": graph_weight,
-            "astra_weight_used": astra_weight
-        }
-        
         logger.info(f"Successfully generated draft plan ({len(markdown_plan)} characters, "
                    f"parsing successful: {not parsed_plan.get('parsing_error')})")
         
-        return state
+        return {
+            "context": context,
+            "draft": markdown_plan,  # Store full markdown for human readability
+            # New plan first, followed by the reflection sections of earlier iterations
+            "draft_parts": [markdown_plan, *state.get("draft_parts", [])[1:]],
+            "parsed_plan": parsed_plan,  # Store structured data for processing
+            "performance_metrics": {
+                "plan_length": len(markdown_plan),
+                "parsing_successful": not parsed_plan.get("parsing_error"),
+                "sections_count": len(headers),
+                "generation_iteration": state["loop"],
+                "graph_weight_used": graph_weight,
+                "astra_weight_used": astra_weight
+            }
+        }
         
     except Exception as e:
-        logger.error(f"Error in node_draft: {e}")
-        state = dict(state)
-        state["error"] = f"Draft generation failed: {str(e)}"
-        return state
+        return _wrap_err(e, "node_draft", "Draft generation failed")
 
 
-def node_validate(state: PlanState) -> PlanState:
+def node_validate(state: PlanState, deps: Optional[NodeDependencies] = None) -> Dict[str, Any]:
     """
     Validate drilling plan against engineering constraints and calculate KPIs.
     
@@ -317,36 +568,34 @@ def node_validate(state: PlanState) -> PlanState:
     
     Args:
         state: Current planning state with draft plan
+        deps: Service functions bound by build_app (loaded on demand when called directly)
         
     Returns:
-        Updated state with validation results and KPIs
-        
-    Raises:
-        ValueError: If plan validation fails
-        ConnectionError: If knowledge graph is unavailable
+        State update with validation results, KPIs and a new history entry, or an
+        "error" update (see _wrap_err) if validation fails or the knowledge graph
+        is unavailable
     """
     try:
         # Validate required state keys
         _validate_state_structure(state, ["well_id", "draft", "loop", "plan_id"])
         
-        # Import here to avoid circular dependencies
-        from app.graph.graph_rag import validate_against_constraints, record_iteration
-        from app.evaluation.kpi import compute_kpis
+        # Service functions resolved once at build time
+        deps = deps or load_node_dependencies()
+        validate_against_constraints = deps.validate_against_constraints
+        record_iteration = deps.record_iteration
+        compute_kpis = deps.compute_kpis
         
         logger.info(f"Validating plan for well {state['well_id']}, loop {state['loop']}")
         
-        # Check for previous errors
-        if state.get("error"):
-            logger.warning(f"Skipping validation due to previous error: {state['error']}")
-            return state
-        
         draft = state["draft"]
         if len(draft.strip()) < 50:
             raise ValueError("Draft plan is too short for meaningful validation")
         
         # Validate against engineering constraints using the knowledge graph - STRICT MODE
         try:
-            validation_result = validate_against_constraints(state["well_id"], draft)
+            validation_result = validate_against_constraints(
+                state["well_id"], draft, parsed_plan=state.get("parsed_plan")
+            )
         except Exception as e:
             raise ConnectionError(f"Constraint validation failed: {e}")
         
@@ -381,23 +630,17 @@ def node_validate(state: PlanState) -> PlanState:
         if not isinstance(kpi_scores, dict):
             raise ValueError(f"KPI scores must be a dict, got: {type(kpi_scores)}")
         
-        # Record this iteration in the knowledge graph for audit trail
-        try:
-            record_iteration(
-                plan_id=state["plan_id"],
-                iteration=state["loop"],
-                draft=draft,
-                validation=validation_result,
-                kpis=kpi_scores
-            )
-        except Exception as e:
-            logger.warning(f"Failed to record iteration in knowledge graph: {e}")
-            # Don't fail the validation if recording fails, but log it
-        
-        # Update state
-        state = dict(state)
-        state["validation"] = validation_result
-        state["kpis"] = kpi_scores
+        # Record this iteration in the knowledge graph for audit trail - in the
+        # background; a failed write is logged but never fails the validation
+        audit = _AUDIT_POOL.submit(
+            record_iteration,
+            plan_id=state["plan_id"],
+            iteration=state["loop"],
+            draft=draft,
+            validation=validation_result,
+            kpis=kpi_scores
+        )
+        audit.add_done_callback(partial(_log_audit_result, state["plan_id"], state["loop"]))
         
         # Add to history for tracking - STRICT structure
         history_entry = {
@@ -407,13 +650,9 @@ def node_validate(state: PlanState) -> PlanState:
             "violations_count": len(violations),
             "high_severity_violations": validation_result.get("high_severity_violations", 0),
             "confidence": validation_result["confidence"],
-            "timestamp": str(uuid4())  # Simple timestamp substitute
+            "timestamp": time.time_ns()  # Epoch nanoseconds - orderable across iterations
         }
         
-        if "history" not in state:
-            state["history"] = []
-        state["history"].append(history_entry)
-        
         passes = validation_result["passes"]
         score = kpi_scores.get("kpi_overall", 0.0)
         violations_count = len(violations)
@@ -425,54 +664,45 @@ def node_validate(state: PlanState) -> PlanState:
         if violations:
             logger.info(f"Constraint violations: {violations[:3]}...")  # Log first 3 violations
         
-        return state
+        return {
+            "validation": validation_result,
+            "kpis": kpi_scores,
+            "history": [history_entry]  # Appended by the history reducer
+        }
         
     except Exception as e:
-        logger.error(f"Error in node_validate: {e}")
-        state = dict(state)
-        state["error"] = f"Validation failed: {str(e)}"
-        return state
+        return _wrap_err(e, "node_validate", "Validation failed")
 
 
-def node_reflect(state: PlanState) -> PlanState:
+def node_reflect(state: PlanState, deps: Optional[NodeDependencies] = None) -> Dict[str, Any]:
     """
     Reflect on validation results and propose targeted improvements using markdown format.
     
     This node implements the causal reasoning approach described in the project
     documentation, using the knowledge graph to identify root causes and propose
-    specific optimization strategies. Only executes if validation failed.
+    specific optimization strategies. Only reached for failed validations (see should_reflect).
     
     Args:
         state: Current planning state with validation results
+        deps: Service functions bound by build_app (loaded on demand when called directly)
         
     Returns:
-        Updated state with reflection and proposed changes
-        
-    Raises:
-        ValueError: If reflection generation fails
-        ConnectionError: If LLM API is unavailable
+        State update with reflection and proposed changes, or an "error" update
+        (see _wrap_err) if reflection generation fails or the LLM API is unavailable
     """
     try:
         # Validate required state keys
         _validate_state_structure(state, ["well_id", "loop", "validation", "context", "draft"])
         
-        # Import here to avoid circular dependencies
-        from app.llm.watsonx_client import generate_reflection_markdown, parse_markdown_reflection
+        # Service functions resolved once at build time
+        deps = deps or load_node_dependencies()
+        generate_reflection_structured = deps.generate_reflection_structured
         
         logger.info(f"Reflecting on validation results for well {state['well_id']}, iteration {state['loop']}")
         
-        # Check for previous errors
-        if state.get("error"):
-            logger.warning(f"Skipping reflection due to previous error: {state['error']}")
-            return state
-        
+        # Passing plans never reach this node - should_reflect routes them to "check"
         validation = state["validation"]
-        
-        # If validation passed, no reflection needed
-        if validation["passes"]:
-            logger.info("Validation passed - no reflection needed")
-            return state
-        
+
         # STRICT validation of required data for reflection
         violations = validation["violations"]
         if not violations:
@@ -493,77 +723,62 @@ def node_reflect(state: PlanState) -> PlanState:
             "constraint_types_checked": validation["constraint_types_checked"],
             "confidence": validation["confidence"],
             "iteration": state["loop"],
+            "well_info": context["well_info"],
             "well_context": context,
-            "previous_attempts": state.get("history", [])
+            "previous_attempts": list(state.get("history", ()))
         }
         
-        # Generate reflection using markdown format for better LLM performance
+        # Generate structured reflection - the markdown analysis is rendered from it
         try:
-            reflection_response = generate_reflection_markdown(
+            parsed_reflection = generate_reflection_structured(
                 validation_failures=violations,
                 current_plan=current_draft,
                 context=reflection_context
             )
         except Exception as e:
             raise ConnectionError(f"Reflection generation failed: {e}")
-        
+
+        reflection_response = parsed_reflection["reflection_text"]
+
         if not reflection_response:
             raise ValueError("Generated reflection is empty")
         
         if len(reflection_response.strip()) < 50:
             raise ValueError(f"Generated reflection is too short: {len(reflection_response)} characters")
         
-        # Parse the reflection for structured data if needed
-        try:
-            parsed_reflection = parse_markdown_reflection(reflection_response)
-            if parsed_reflection.get("parsing_error"):
-                logger.warning(f"Reflection parsing failed: {parsed_reflection['parsing_error']}")
-        except Exception as e:
-            logger.warning(f"Failed to parse reflection: {e}")
-            parsed_reflection = {"reflection_text": reflection_response}
-        
-        # Append reflection to draft for next iteration with clear separation
-        state = dict(state)
-        reflection_section = f"""
-
----
-
-## Iteration {state['loop']} - Constraint Violation Analysis
-
-### Validation Results
-- **Status**: FAILED
-- **Violations Found**: {len(violations)}
-- **Confidence**: {validation['confidence']:.2f}
-
-### Root Cause Analysis and Optimization Strategy
-{reflection_response}
-
----
-"""
-        
-        state["draft"] += reflection_section
-        
-        # Store reflection metadata
-        state["reflection_metadata"] = {
-            "violations_analyzed": len(violations),
-            "reflection_length": len(reflection_response),
-            "parsing_successful": not parsed_reflection.get("parsing_error"),
-            "iteration": state["loop"]
-        }
+        # Reflection section kept as its own draft part with clear separation
+        reflection_section = _REFLECTION_TMPL.substitute(
+            loop=state["loop"],
+            violations=len(violations),
+            confidence=f"{validation['confidence']:.2f}",
+            analysis=reflection_response
+        )
         
         logger.info(f"Reflection complete - analyzed {len(violations)} violations, "
                    f"generated {len(reflection_response)} chars of analysis")
         
-        return state
+        return {
+            # Appended as a chunk - the plan string itself is never copied
+            "draft_parts": state.get("draft_parts", [current_draft]) + [reflection_section],
+            "reflection_metadata": {
+                "violations_analyzed": len(violations),
+                "reflection_length": len(reflection_response),
+                "parsing_successful": not parsed_reflection.get("parsing_error"),
+                "iteration": state["loop"],
+                # Forwarded to the next draft instead of the full reflection text
+                "proposed_change": {
+                    "change_type": parsed_reflection["change_type"],
+                    "proposed_change": parsed_reflection["proposed_change"],
+                    "new_value": parsed_reflection["new_value"]
+                }
+            }
+        }
         
     except Exception as e:
-        logger.error(f"Error in node_reflect: {e}")
-        state = dict(state)
-        state["error"] = f"Reflection failed: {str(e)}"
-        return state
+        return _wrap_err(e, "node_reflect", "Reflection failed")
 
 
-def node_check(state: PlanState) -> PlanState:
+def node_check(state: PlanState) -> Dict[str, Any]:
     """
     Check loop conditions and prepare for next iteration or termination.
     
@@ -574,7 +789,8 @@ def node_check(state: PlanState) -> PlanState:
         state: Current planning state
         
     Returns:
-        Updated state with incremented loop counter and convergence analysis
+        State update with incremented loop counter and convergence analysis, or an
+        "error" update (see _wrap_err)
     """
     try:
         # Validate required state keys
@@ -583,8 +799,7 @@ def node_check(state: PlanState) -> PlanState:
         logger.info(f"Checking loop conditions for well {state['well_id']}")
         
         # Increment loop counter
-        state = dict(state)
-        state["loop"] += 1
+        current_loop = state["loop"] + 1
         
         # STRICT validation of state data
         validation = state["validation"]
@@ -592,8 +807,7 @@ def node_check(state: PlanState) -> PlanState:
         
         # Enhanced status logging
         passes = validation["passes"]
-        max_loops = int(os.environ["MAX_LOOPS"])
-        current_loop = state["loop"]
+        max_loops = state["max_loops"]
         
         overall_kpi = kpis.get("kpi_overall", 0.0)
         violations = validation["violations"]
@@ -601,27 +815,22 @@ def node_check(state: PlanState) -> PlanState:
         confidence = validation["confidence"]
         
         # Convergence analysis - STRICT validation
-        if "history" not in state:
-            state["history"] = []
-        
-        history = state["history"]
+        history = state.get("history", ())
         convergence_info = {}
         
         if len(history) > 1:
             # Check for improvement trends
-            recent_scores = [h.get("kpi_score", 0.0) for h in history[-3:]]
+            recent_scores = [h.get("kpi_score", 0.0) for h in _tail(history, 3)]
             if len(recent_scores) >= 2:
                 is_improving = recent_scores[-1] < recent_scores[-2]  # Lower KPI is better
                 convergence_info["is_improving"] = is_improving
                 convergence_info["score_trend"] = recent_scores
             
             # Check for oscillation (same violations repeating)
-            recent_violation_counts = [h.get("violations_count", 0) for h in history[-2:]]
+            recent_violation_counts = [h.get("violations_count", 0) for h in _tail(history, 2)]
             if len(recent_violation_counts) == 2:
                 convergence_info["is_oscillating"] = recent_violation_counts[0] == recent_violation_counts[1]
         
-        state["convergence_info"] = convergence_info
-        
         logger.info(f"Loop {current_loop}/{max_loops} - Validation: {passes}, "
                    f"KPI: {overall_kpi:.3f}, Violations: {violations_count}, "
                    f"Confidence: {confidence:.2f}")
@@ -630,17 +839,58 @@ def node_check(state: PlanState) -> PlanState:
             logger.info(f"Convergence trend - Improving: {convergence_info['is_improving']}, "
                        f"Oscillating: {convergence_info.get('is_oscillating', False)}")
         
-        # Check for errors
-        if state.get("error"):
-            logger.warning(f"Terminating due to error: {state['error']}")
-        
-        return state
+        return {
+            "loop": current_loop,
+            "convergence_info": convergence_info
+        }
         
     except Exception as e:
-        logger.error(f"Error in node_check: {e}")
-        state = dict(state)
-        state["error"] = f"Loop check failed: {str(e)}"
-        return state
+        return _wrap_err(e, "node_check", "Loop check failed")
+
+
+def should_proceed(state: PlanState) -> str:
+    """
+    Conditional edge function between pipeline nodes.
+    
+    A node that failed returns an "error" update (see _wrap_err); the graph
+    then ends immediately instead of running the remaining nodes.
+    
+    Args:
+        state: Current planning state
+        
+    Returns:
+        "error" or "ok"
+    """
+    if state.get("error"):
+        logger.error(f"Terminating workflow due to error: {state['error']}")
+        return "error"
+    return "ok"
+
+
+def should_reflect(state: PlanState) -> str:
+    """
+    Conditional edge function after validation.
+    
+    Reflection only feeds the next draft, so it is skipped when the plan passed
+    or when this is the final allowed iteration. Errors end the workflow.
+    
+    Args:
+        state: Current planning state
+        
+    Returns:
+        "reflect", "check" or "error"
+    """
+    if should_proceed(state) == "error":
+        return "error"
+    
+    if state.get("validation", {}).get("passes"):
+        return "check"
+    
+    if state["loop"] >= state["max_loops"] - 1:
+        logger.info("Final iteration - skipping reflection")
+        return "check"
+    
+    return "reflect"
 
 
 def should_continue(state: PlanState) -> str:
@@ -708,49 +958,115 @@ def should_continue(state: PlanState) -> str:
         return "draft"
 
 
-def build_app() -> StateGraph:
+def build_app(cfg: Optional[WorkflowConfig] = None, objectives: Optional[str] = None) -> StateGraph:
     """
     Build and compile the LangGraph workflow for well planning.
-    
-    This function creates the stateful workflow graph implementing the 
+
+    This function creates the stateful workflow graph implementing the
     knowledge-driven architecture described in the project documentation.
-    Includes comprehensive error handling and monitoring.
-    
+    The compiled graph depends only on module code, cfg and objectives, so it
+    is built once per combination and reused by every subsequent call.
+
+    Passing objectives compiles an app specialized for them: the plan prompt
+    header is rendered at build time and reused by every draft. Such an app
+    only accepts runs with exactly those objectives; the generic app (the
+    default) accepts any.
+
+    Args:
+        cfg: Workflow config bound into the nodes (defaults to WorkflowConfig.from_env())
+        objectives: Objectives to specialize the app for (default: generic app)
+
     Returns:
         Compiled LangGraph application
-        
+
     Raises:
         EnvironmentError: If required dependencies are not available
     """
+    # Snapshot configuration once - nodes never read os.environ in the loop
+    if cfg is None:
+        cfg = WorkflowConfig.from_env()
+
+    if objectives is not None and (not objectives or not isinstance(objectives, str)):
+        raise ValueError("objectives must be a non-empty string")
+
+    return _compile_app(cfg, objectives)
+
+
+# cfg and profile each compiled app was built with - read by run_once to scope the execution cache
+_APP_SETTINGS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _app_settings(app: StateGraph) -> Optional[Tuple[WorkflowConfig, Optional["ObjectiveProfile"]]]:
+    """cfg and profile app was compiled with, or None for an app not built by build_app."""
+    try:
+        return _APP_SETTINGS.get(app)
+    except TypeError:
+        return None
+
+
+def _app_fingerprint(settings: Tuple[WorkflowConfig, Optional["ObjectiveProfile"]]) -> str:
+    """Execution cache scope for an app: its evidence weights and objective specialization."""
+    cfg, profile = settings
+    return "\x00".join([repr(cfg.graph_weight), repr(cfg.astra_weight), profile.prompt_header if profile else ""])
+
+
+@lru_cache(maxsize=32)
+def _compile_app(cfg: WorkflowConfig, objectives: Optional[str] = None) -> StateGraph:
+    """Compile the workflow graph for cfg and objectives - memoized, see build_app."""
     try:
         logger.info("Building LangGraph workflow with knowledge-driven architecture")
         
-        # Validate that all required modules are available
-        try:
-            from app.graph.graph_rag import retrieve_subgraph_context
-            from app.llm.watsonx_client import generate_drilling_plan_markdown
-            from app.evaluation.kpi import compute_kpis
-        except ImportError as e:
-            raise EnvironmentError(f"Required module not available: {e}")
+        # Environment is validated on first build rather than at import time
+        validate_workflow_environment()
         
+        # Resolve all service modules once - fails fast if any is unavailable
+        deps = load_node_dependencies()
+        
+        # Objective-specialized apps get their prompt header constant-folded here
+        profile = None
+        if objectives is not None:
+            profile = ObjectiveProfile(
+                objectives=objectives,
+                prompt_header=deps.plan_prompt_header(objectives, cfg.graph_weight, cfg.astra_weight)
+            )
+            logger.info(f"Specializing workflow for objectives: {objectives}")
+
         # Create state graph with enhanced state schema
         workflow = StateGraph(PlanState)
         
         # Add nodes with descriptive names and error handling
-        workflow.add_node("retrieve", node_retrieve)
-        workflow.add_node("draft", node_draft)  
-        workflow.add_node("validate", node_validate)
-        workflow.add_node("reflect", node_reflect)
+        workflow.add_node("retrieve", partial(node_retrieve, deps=deps))
+        workflow.add_node("compress", partial(node_compress, deps=deps))
+        workflow.add_node("draft", partial(node_draft, cfg=cfg, deps=deps, profile=profile))
+        workflow.add_node("validate", partial(node_validate, deps=deps))
+        workflow.add_node("reflect", partial(node_reflect, deps=deps))
         workflow.add_node("check", node_check)
         
         # Set entry point
         workflow.set_entry_point("retrieve")
         
-        # Add edges for the workflow
-        workflow.add_edge("retrieve", "draft")
-        workflow.add_edge("draft", "validate") 
-        workflow.add_edge("validate", "reflect")
-        workflow.add_edge("reflect", "check")
+        # Add edges for the workflow - a node error ends the run right away
+        for source, target in (("retrieve", "compress"), ("compress", "draft"),
+                               ("draft", "validate"), ("reflect", "check")):
+            workflow.add_conditional_edges(
+                source,
+                should_proceed,
+                {
+                    "ok": target,
+                    "error": END
+                }
+            )
+        
+        # Reflect only when another draft iteration will use the result
+        workflow.add_conditional_edges(
+            "validate",
+            should_reflect,
+            {
+                "reflect": "reflect",
+                "check": "check",
+                "error": END
+            }
+        )
         
         # Add conditional edge for loop control
         workflow.add_conditional_edges(
@@ -764,6 +1080,7 @@ def build_app() -> StateGraph:
         
         # Compile the workflow
         app = workflow.compile()
+        _APP_SETTINGS[app] = (cfg, profile)
         
         logger.info("LangGraph workflow compiled successfully ✅")
         return app
@@ -773,12 +1090,232 @@ def build_app() -> StateGraph:
         raise
 
 
+def _validate_run_inputs(app: StateGraph, well_id: str, objectives: str, max_loops: int) -> None:
+    """Validate run parameters - fail fast on bad input, before any node runs."""
+    if not well_id or not isinstance(well_id, str):
+        raise ValueError("well_id must be a non-empty string")
+
+    if not objectives or not isinstance(objectives, str):
+        raise ValueError("objectives must be a non-empty string")
+
+    # A specialized app only plans for the objectives its prompt header was built for
+    settings = _app_settings(app)
+    profile = settings[1] if settings else None
+    if profile is not None and objectives != profile.objectives:
+        raise ValueError(f"App specialized for objectives '{profile.objectives}' "
+                         f"cannot plan for '{objectives}'")
+
+    if not isinstance(max_loops, int) or max_loops < 1 or max_loops > _MAX_LOOPS_LIMIT:
+        raise ValueError(f"max_loops must be an integer between 1 and {_MAX_LOOPS_LIMIT}")
+
+
+def _initial_state(plan_id: str, well_id: str, objectives: str, max_loops: int) -> PlanState:
+    """Build the starting state for one planning run."""
+    return {
+        "plan_id": plan_id,
+        "well_id": well_id,
+        "context": {"objectives": objectives},
+        "draft": "",
+        "draft_parts": [],
+        "validation": {},
+        "kpis": {},
+        "history": deque(maxlen=_MAX_LOOPS_LIMIT),
+        "loop": 0,
+        "objectives": objectives,
+        "max_loops": max_loops,
+        "error": None,
+        "parsed_plan": None,
+        "retrieval_metadata": None,
+        "performance_metrics": None
+    }
+
+
+def _build_result(final_state: Dict[str, Any], max_loops: int, execution_time: float,
+                  log_file: Optional[str] = None) -> Dict[str, Any]:
+    """Convert a final workflow state into the run result dictionary."""
+    # STRICT validation of final state
+    if not isinstance(final_state, dict):
+        raise ValueError("Workflow returned invalid state type")
+
+    validation = final_state.get("validation", {})
+
+    return {
+        "plan_id": final_state["plan_id"],
+        "well_id": final_state["well_id"],
+        "objectives": final_state["objectives"],
+        "plan": "".join(final_state.get("draft_parts") or [final_state.get("draft", "")]),
+        "parsed_plan": final_state.get("parsed_plan"),
+        "kpis": final_state.get("kpis", {}),
+        "validation": validation,
+        "iterations": final_state.get("loop", 0),
+        "max_loops": max_loops,
+        "history": list(final_state.get("history", ())),
+        "success": validation.get("passes", False),
+        "error": final_state.get("error"),
+        "execution_time_seconds": round(execution_time, 2),
+        "retrieval_metadata": final_state.get("retrieval_metadata"),
+        "performance_metrics": final_state.get("performance_metrics"),
+        "convergence_info": final_state.get("convergence_info"),
+        "timestamp": time.time(),
+        "monitoring_log": log_file
+    }
+
+
+# Constant part of a failed-run result - read-only, copied per failure
+_ERR_TEMPLATE = MappingProxyType({
+    "plan": "",
+    "parsed_plan": None,
+    "iterations": 0,
+    "success": False,
+    "execution_time_seconds": 0,
+    "retrieval_metadata": None,
+    "performance_metrics": None,
+    "convergence_info": None
+})
+
+
+def _error_result(well_id: str, objectives: str, max_loops: int, error: str,
+                  plan_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Result dictionary for a run that failed before producing a final state.
+    
+    plan_id is reused when the run had already been assigned one.
+    """
+    return {
+        **_ERR_TEMPLATE,
+        "plan_id": plan_id or f"plan-{uuid4()}",
+        "well_id": well_id,
+        "objectives": objectives,
+        "kpis": {},
+        "validation": {},
+        "max_loops": max_loops,
+        "history": [],
+        "error": error,
+        "timestamp": time.time()
+    }
+
+
+def _run_plan_id(run: Optional[Dict[str, Any]]) -> Optional[str]:
+    """plan_id assigned by _start_run, if the run got that far."""
+    if run and run.get("initial_state"):
+        return run["initial_state"]["plan_id"]
+    return None
+
+
+def _start_run(
+    app: StateGraph,
+    well_id: str,
+    objectives: str,
+    max_loops: int,
+    enable_monitoring: bool,
+    force: bool
+) -> Dict[str, Any]:
+    """
+    Prepare a planning run: consult the execution cache, start monitoring and
+    build the initial state.
+
+    Returns:
+        Run context dict; "cached_result" is set when the cache served the run
+    """
+    logger.info(f"Starting knowledge-driven well planning workflow for well {well_id}")
+    logger.info(f"Objectives: {objectives}")
+    logger.info(f"Max iterations: {max_loops}")
+    
+    run = {"well_id": well_id, "max_loops": max_loops, "cached_result": None,
+           "cache_key": None, "execution_cache": None, "monitor": None}
+    
+    # Execution cache - identical inputs on an unchanged graph and identically
+    # configured app reproduce the same plan; apps not built by build_app are never cached
+    execution_cache = get_execution_cache()
+    settings = _app_settings(app)
+    if execution_cache and settings is not None:
+        from app.graph.graph_rag import get_graph_snapshot_version
+        run["execution_cache"] = execution_cache
+        run["cache_key"] = execution_key(well_id, objectives, max_loops, get_graph_snapshot_version(well_id),
+                                         _app_fingerprint(settings))
+        
+        cached_result = None if force else execution_cache.get(run["cache_key"])
+        if cached_result is not None:
+            logger.info(f"⚡ Serving cached plan {cached_result['plan_id']} for well {well_id}")
+            run["cached_result"] = {**cached_result, "cached": True}
+            return run
+    
+    # Initialize monitoring if enabled
+    monitor = None
+    if enable_monitoring:
+        try:
+            from app.monitoring.workflow_monitor import WorkflowMonitor
+            monitor = WorkflowMonitor()
+        except ImportError:
+            logger.warning("Monitoring module not available - continuing without monitoring")
+            monitor = None
+    
+    # Initialize planning state with enhanced metadata
+    plan_id = f"plan-{uuid4()}"
+    
+    if monitor:
+        execution_id = monitor.start_execution(plan_id, well_id, objectives)
+        logger.info(f"Monitoring enabled - execution ID: {execution_id}")
+    
+    initial_state = _initial_state(plan_id, well_id, objectives, max_loops)
+    
+    # Add monitor to state for node access
+    if monitor:
+        initial_state["_monitor"] = monitor
+    
+    logger.info(f"Initialized planning state with plan_id: {plan_id}")
+    
+    run["monitor"] = monitor
+    run["initial_state"] = initial_state
+    return run
+
+
+def _finish_run(run: Dict[str, Any], final_state: Dict[str, Any], execution_time: float) -> Dict[str, Any]:
+    """Finalize monitoring, log the outcome and store the result in the execution cache."""
+    max_loops = run["max_loops"]
+    
+    # Finalize monitoring
+    log_file = None
+    if run["monitor"]:
+        log_file = run["monitor"].finalize_execution(final_state, execution_time)
+    
+    # Prepare comprehensive result
+    result = _build_result(final_state, max_loops, execution_time, log_file)
+    success = result["success"]
+    iterations = result["iterations"]
+    kpis = result["kpis"]
+    validation = result["validation"]
+    
+    # Enhanced logging
+    if success:
+        logger.info(f"✅ Workflow completed successfully!")
+    else:
+        logger.warning(f"⚠️ Workflow completed without full validation")
+    
+    logger.info(f"📊 Final Results:")
+    logger.info(f"   - Iterations: {iterations}/{max_loops}")
+    logger.info(f"   - Validation passed: {success}")
+    logger.info(f"   - KPI overall: {kpis.get('kpi_overall', 'N/A')}")
+    logger.info(f"   - Violations: {len(validation.get('violations', []))}")
+    logger.info(f"   - Execution time: {execution_time:.2f}s")
+    
+    if final_state.get("error"):
+        logger.error(f"   - Error: {final_state['error']}")
+    
+    # Only passing plans are worth serving again - a failed run is retried next time
+    if run["cache_key"] and success and not result["error"]:
+        run["execution_cache"].set(run["cache_key"], result)
+    
+    return result
+
+
 def run_once(
     app: StateGraph, 
     well_id: str, 
     objectives: str = "Minimize cost and vibration while maintaining ROP",
     max_loops: int = 5,
-    enable_monitoring: bool = True
+    enable_monitoring: bool = True,
+    force: bool = False
 ) -> Dict[str, Any]:
     """
     Execute the well planning workflow once for a given well.
@@ -792,154 +1329,129 @@ def run_once(
         well_id: Identifier for the target well
         objectives: Planning objectives and constraints
         max_loops: Maximum number of optimization iterations
+        enable_monitoring: Record the execution with WorkflowMonitor
+        force: Bypass the execution cache and re-plan (a passing result is still stored)
         
     Returns:
         Dictionary containing plan results and metadata
         
     Raises:
-        ValueError: If input parameters are invalid
+        ValueError: If input parameters are invalid, or app is specialized for other objectives
         EnvironmentError: If required services are unavailable
     """
     # STRICT input validation
-    if not well_id or not isinstance(well_id, str):
-        raise ValueError("well_id must be a non-empty string")
-    
-    if not objectives or not isinstance(objectives, str):
-        raise ValueError("objectives must be a non-empty string")
-    
-    if not isinstance(max_loops, int) or max_loops < 1 or max_loops > 20:
-        raise ValueError("max_loops must be an integer between 1 and 20")
+    _validate_run_inputs(app, well_id, objectives, max_loops)
     
+    run = None
     try:
-        logger.info(f"Starting knowledge-driven well planning workflow for well {well_id}")
-        logger.info(f"Objectives: {objectives}")
-        logger.info(f"Max iterations: {max_loops}")
-        
-        # Initialize monitoring if enabled
-        monitor = None
-        if enable_monitoring:
-            try:
-                from app.monitoring.workflow_monitor import WorkflowMonitor
-                monitor = WorkflowMonitor()
-            except ImportError:
-                logger.warning("Monitoring module not available - continuing without monitoring")
-                monitor = None
-        
-        # Initialize planning state with enhanced metadata
-        plan_id = f"plan-{uuid4()}"
-        
-        if monitor:
-            execution_id = monitor.start_execution(plan_id, well_id, objectives)
-            logger.info(f"Monitoring enabled - execution ID: {execution_id}")
-        
-        initial_state: PlanState = {
-            "plan_id": plan_id,
-            "well_id": well_id,
-            "context": {"objectives": objectives},
-            "draft": "",
-            "validation": {},
-            "kpis": {},
-            "history": [],
-            "loop": 0,
-            "objectives": objectives,
-            "max_loops": max_loops,
-            "error": None,
-            "parsed_plan": None,
-            "retrieval_metadata": None,
-            "performance_metrics": None
-        }
-        
-        # Add monitor to state for node access
-        if monitor:
-            initial_state["_monitor"] = monitor
-        
-        logger.info(f"Initialized planning state with plan_id: {plan_id}")
+        run = _start_run(app, well_id, objectives, max_loops, enable_monitoring, force)
+        if run["cached_result"] is not None:
+            return run["cached_result"]
         
         # Execute workflow with timing
         start_time = time.time()
         
-        final_state = app.invoke(initial_state)
-        
-        execution_time = time.time() - start_time
-        
-        # Finalize monitoring
-        log_file = None
-        if monitor:
-            log_file = monitor.finalize_execution(final_state, execution_time)
-        
-        # STRICT validation of final state
-        if not isinstance(final_state, dict):
-            raise ValueError("Workflow returned invalid state type")
-        
-        # Prepare comprehensive result
-        validation = final_state.get("validation", {})
-        success = validation.get("passes", False)
-        iterations = final_state.get("loop", 0)
-        kpis = final_state.get("kpis", {})
-        
-        result = {
-            "plan_id": final_state["plan_id"],
-            "well_id": final_state["well_id"],
-            "objectives": final_state["objectives"],
-            "plan": final_state.get("draft", ""),
-            "parsed_plan": final_state.get("parsed_plan"),
-            "kpis": kpis,
-            "validation": validation,
-            "iterations": iterations,
-            "max_loops": max_loops,
-            "history": final_state.get("history", []),
-            "success": success,
-            "error": final_state.get("error"),
-            "execution_time_seconds": round(execution_time, 2),
-            "retrieval_metadata": final_state.get("retrieval_metadata"),
-            "performance_metrics": final_state.get("performance_metrics"),
-            "convergence_info": final_state.get("convergence_info"),
-            "timestamp": time.time(),
-            "monitoring_log": log_file
-        }
-        
-        # Enhanced logging
-        if success:
-            logger.info(f"✅ Workflow completed successfully!")
-        else:
-            logger.warning(f"⚠️ Workflow completed without full validation")
-        
-        logger.info(f"📊 Final Results:")
-        logger.info(f"   - Iterations: {iterations}/{max_loops}")
-        logger.info(f"   - Validation passed: {success}")
-        logger.info(f"   - KPI overall: {kpis.get('kpi_overall', 'N/A')}")
-        logger.info(f"   - Violations: {len(validation.get('violations', []))}")
-        logger.info(f"   - Execution time: {execution_time:.2f}s")
+        final_state = app.invoke(run["initial_state"])
         
-        if final_state.get("error"):
-            logger.error(f"   - Error: {final_state['error']}")
-        
-        return result
+        return _finish_run(run, final_state, time.time() - start_time)
         
     except Exception as e:
         logger.error(f"Workflow execution failed: {e}")
         
         # Return error result with partial state if available
-        return {
-            "plan_id": f"plan-{uuid4()}",
-            "well_id": well_id,
-            "objectives": objectives,
-            "plan": "",
-            "parsed_plan": None,
-            "kpis": {},
-            "validation": {},
-            "iterations": 0,
-            "max_loops": max_loops,
-            "history": [],
-            "success": False,
-            "error": str(e),
-            "execution_time_seconds": 0,
-            "retrieval_metadata": None,
-            "performance_metrics": None,
-            "convergence_info": None,
-            "timestamp": time.time()
-        }
+        return _error_result(well_id, objectives, max_loops, str(e), _run_plan_id(run))
+
+
+async def arun_once(
+    app: StateGraph,
+    well_id: str,
+    objectives: str = "Minimize cost and vibration while maintaining ROP",
+    max_loops: int = 5,
+    enable_monitoring: bool = True,
+    force: bool = False
+) -> Dict[str, Any]:
+    """
+    Async variant of run_once for callers that already run an event loop.
+    
+    The graph is driven with ``app.ainvoke``; LangGraph executes the blocking
+    Neo4j/AstraDB/watsonx.ai nodes in its thread executor, and the cache lookup
+    and monitoring I/O run via asyncio.to_thread, so the event loop is never blocked.
+    Arguments and result are the same as run_once.
+    """
+    # STRICT input validation
+    _validate_run_inputs(app, well_id, objectives, max_loops)
+    
+    run = None
+    try:
+        run = await asyncio.to_thread(_start_run, app, well_id, objectives, max_loops, enable_monitoring, force)
+        if run["cached_result"] is not None:
+            return run["cached_result"]
+        
+        start_time = time.time()
+        
+        final_state = await app.ainvoke(run["initial_state"])
+        
+        return await asyncio.to_thread(_finish_run, run, final_state, time.time() - start_time)
+        
+    except Exception as e:
+        logger.error(f"Workflow execution failed for well {well_id}: {e}")
+        return _error_result(well_id, objectives, max_loops, str(e), _run_plan_id(run))
+
+
+async def run_many(
+    app: StateGraph,
+    well_ids: List[str],
+    objectives: str = "Minimize cost and vibration while maintaining ROP",
+    max_loops: int = 5,
+    concurrency: Optional[int] = None,
+    enable_monitoring: bool = True,
+    force: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Plan several wells concurrently.
+
+    Runs are independent and dominated by LLM/database wait time, so they are
+    overlapped with arun_once. Concurrency is bounded to stay under LLM rate limits.
+
+    Args:
+        app: Compiled LangGraph application
+        well_ids: Wells to plan
+        objectives: Planning objectives shared by all wells
+        max_loops: Maximum optimization iterations per well
+        concurrency: Maximum simultaneous runs (default PLAN_CONCURRENCY env, 8)
+        enable_monitoring: Record each execution with WorkflowMonitor
+        force: Bypass the execution cache for every well
+
+    Returns:
+        One result dictionary per well, in the order of well_ids
+
+    Raises:
+        ValueError: If input parameters are invalid, or app is specialized for other objectives
+    """
+    if not well_ids or not isinstance(well_ids, list):
+        raise ValueError("well_ids must be a non-empty list")
+
+    for well_id in well_ids:
+        _validate_run_inputs(app, well_id, objectives, max_loops)
+
+    if concurrency is None:
+        concurrency = int(os.getenv("PLAN_CONCURRENCY", "8"))
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got: {concurrency}")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run(well_id: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await arun_once(app, well_id, objectives, max_loops, enable_monitoring, force)
+
+    logger.info(f"🚀 Planning {len(well_ids)} wells with concurrency {concurrency}")
+    results = await asyncio.gather(*[_run(well_id) for well_id in well_ids])
+
+    succeeded = sum(1 for result in results if result["success"])
+    logger.info(f"📊 Multi-well planning complete: {succeeded}/{len(results)} plans passed validation")
+    return list(results)
 
 
 # Expose the main functions for the application
-__all__ = ["build_app", "run_once", "PlanState"]
\ No newline at end of file
+__all__ = ["build_app", "run_once", "arun_once", "run_many", "PlanState", "WorkflowConfig", "NodeDependencies"]
\ No newline at end of file
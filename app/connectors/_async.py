@@ -0,0 +1,88 @@
+"""Async Neo4j write helpers, used to run several connector loads concurrently."""
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from neo4j import AsyncGraphDatabase
+
+from app.connectors._bolt import NEO4J_DATABASE, _ensured
+from app.connectors._csv import iter_csv_records
+
+_async_driver = None
+
+
+def get_async_driver():
+    """Get the shared async Neo4j driver, created on first use inside the running event loop."""
+    global _async_driver
+    if _async_driver is None:
+        from app.graph.graph_rag import URI, USER, PWD
+        _async_driver = AsyncGraphDatabase.driver(URI, auth=(USER, PWD))
+    return _async_driver
+
+
+async def close_async_driver() -> None:
+    """Close the async driver; call before the event loop that used it exits."""
+    global _async_driver
+    if _async_driver is not None:
+        await _async_driver.close()
+        _async_driver = None
+
+
+async def _write_batch(tx, cypher: str, rows: List[Dict[str, Any]]) -> None:
+    result = await tx.run(cypher, rows=rows)
+    await result.consume()
+
+
+async def aensure_schema(*statements: str) -> None:
+    """Async counterpart of _bolt.ensure_schema (shares its once-per-process record)."""
+    pending = [statement for statement in statements if statement not in _ensured]
+    if not pending:
+        return
+    async with get_async_driver().session(database=NEO4J_DATABASE) as s:
+        for statement in pending:
+            result = await s.run(statement)
+            await result.consume()
+    _ensured.update(pending)
+
+
+async def abulk_unwind(cypher: str, rows: List[Dict[str, Any]], sem: asyncio.Semaphore,
+                       batch_size: int = 1000) -> int:
+    """
+    Async counterpart of _bolt.bulk_unwind.
+
+    Batches are written concurrently, each in its own managed transaction;
+    sem bounds the number of transactions in flight across all loaders.
+
+    Returns:
+        Number of rows written
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got: {batch_size}")
+    driver = get_async_driver()
+
+    async def _batch(chunk: List[Dict[str, Any]]) -> None:
+        async with sem:
+            async with driver.session(database=NEO4J_DATABASE) as s:
+                await s.execute_write(_write_batch, cypher, chunk)
+
+    await asyncio.gather(*(_batch(rows[i:i + batch_size]) for i in range(0, len(rows), batch_size)))
+    return len(rows)
+
+
+async def aload_csv(path: str, cypher: str, sem: asyncio.Semaphore, limit: Optional[int] = None,
+                    transform: Optional[Callable] = None, column_types: Optional[Dict] = None,
+                    schema: Sequence[str] = ()) -> int:
+    """
+    Stream a CSV file into Neo4j with abulk_unwind, after aensure_schema(*schema).
+
+    transform and column_types are passed to iter_csv_records. Parsing runs in a worker thread,
+    so other loaders keep writing meanwhile.
+
+    Returns:
+        Number of rows written
+    """
+    await aensure_schema(*schema)
+    batches = iter_csv_records(path, limit=limit, transform=transform, column_types=column_types)
+    loaded = 0
+    while (rows := await asyncio.to_thread(next, batches, None)) is not None:
+        loaded += await abulk_unwind(cypher, rows, sem)
+    return loaded
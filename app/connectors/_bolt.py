@@ -0,0 +1,102 @@
+"""Shared Neo4j write helpers for the connector loaders."""
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pyarrow as pa
+from dotenv import load_dotenv
+
+from app.connectors._csv import iter_csv_records, iter_table_records
+
+load_dotenv()
+
+# Explicit target database - spares each session the home-database resolution round trip
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+
+
+def _write_batch(tx, cypher: str, rows: List[Dict[str, Any]]) -> None:
+    tx.run(cypher, rows=rows).consume()
+
+
+def bulk_unwind(driver, cypher: str, rows: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+    """
+    Run an `UNWIND $rows AS r ...` write in fixed-size batches.
+
+    Each batch is its own managed write transaction, so large inputs never turn
+    into one huge Bolt message or one huge server-side transaction, and a
+    transient failure only retries the affected batch.
+
+    Returns:
+        Number of rows written
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got: {batch_size}")
+    with driver.session(database=NEO4J_DATABASE) as s:
+        for i in range(0, len(rows), batch_size):
+            s.execute_write(_write_batch, cypher, rows[i:i + batch_size])
+    return len(rows)
+
+
+# MERGE keys - with a uniqueness constraint the MERGE is an index seek, not a label scan
+WELL_ID_CONSTRAINT = "CREATE CONSTRAINT well_id_unique IF NOT EXISTS FOR (w:Well) REQUIRE w.well_id IS UNIQUE"
+REGION_GRID_CONSTRAINT = (
+    "CREATE CONSTRAINT region_grid_id_unique IF NOT EXISTS FOR (g:RegionGrid) REQUIRE g.grid_id IS UNIQUE"
+)
+
+_ensured = set()
+
+
+def ensure_schema(driver, *statements: str) -> None:
+    """Run idempotent schema statements, each at most once per process."""
+    pending = [statement for statement in statements if statement not in _ensured]
+    if not pending:
+        return
+    with driver.session(database=NEO4J_DATABASE) as s:
+        for statement in pending:
+            s.run(statement).consume()
+    _ensured.update(pending)
+
+
+def write_rows(cypher: str, rows: List[Dict[str, Any]], *schema: str) -> int:
+    """
+    Write rows with bulk_unwind on the shared driver, after ensure_schema(*schema).
+
+    An empty batch returns 0 without touching the driver.
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+    # Process-wide driver - its connection pool outlives this call
+    from app.graph.graph_rag import get_driver
+    driver = get_driver()
+    ensure_schema(driver, *schema)
+    return bulk_unwind(driver, cypher, rows)
+
+
+def to_neo4j(df, normalize: Callable[[pa.Table], pa.Table], cypher: str, schema: Sequence[str] = ()) -> int:
+    """
+    Write a pandas DataFrame through a connector's normalize and Cypher.
+
+    Converted via Arrow (NaN becomes null) and written one batch of dicts at a time.
+
+    Returns:
+        Number of rows written
+    """
+    if df.empty:
+        return 0
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    return sum(write_rows(cypher, rows, *schema) for rows in iter_table_records(table, transform=normalize))
+
+
+def load_csv(path: str, cypher: str, schema: Sequence[str] = (), limit: Optional[int] = None,
+             transform: Optional[Callable[[pa.Table], pa.Table]] = None,
+             column_types: Optional[Dict[str, pa.DataType]] = None) -> int:
+    """
+    Stream a CSV file into Neo4j with write_rows (sync counterpart of _async.aload_csv).
+
+    Returns:
+        Number of rows written
+    """
+    return sum(write_rows(cypher, rows, *schema)
+               for rows in iter_csv_records(path, limit=limit, transform=transform, column_types=column_types))
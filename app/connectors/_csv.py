@@ -0,0 +1,102 @@
+"""CSV input helpers for the connector loaders (pyarrow reader)."""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
+
+# Large blocks let the multithreaded reader tokenize big exports in parallel
+_READ_OPTIONS = pacsv.ReadOptions(block_size=8 << 20)
+# Empty cells load as null so coalesce_columns (pc.coalesce) falls through to the next column
+_CONVERT_OPTIONS = pacsv.ConvertOptions(strings_can_be_null=True)
+
+
+def coalesce_columns(table: pa.Table, columns: Dict[str, Sequence[str]]) -> pa.Table:
+    """
+    Collapse alternative source columns into canonical ones, vectorized.
+
+    Each canonical column takes, per row, the first non-null value among its
+    candidate columns (those absent from the file are skipped), as a string.
+    Only the canonical columns are kept.
+    """
+    canonical = {}
+    for name, candidates in columns.items():
+        present = [pc.cast(table[column], pa.string()) for column in candidates if column in table.column_names]
+        if not present:
+            canonical[name] = pa.nulls(table.num_rows, pa.string())
+        else:
+            canonical[name] = pc.coalesce(*present) if len(present) > 1 else present[0]
+    return pa.table(canonical)
+
+
+def project_columns(table: pa.Table, columns: Dict[str, str]) -> pa.Table:
+    """
+    Rename source columns to canonical property names, keeping their types.
+    Only the canonical columns are kept; sources absent from the file load as null.
+    """
+    return pa.table({
+        name: table[source] if source in table.column_names else pa.nulls(table.num_rows)
+        for name, source in columns.items()
+    })
+
+
+def cast_int_columns(table: pa.Table, columns: Sequence[str]) -> pa.Table:
+    """
+    Cast columns to int64 in one vectorized pass each (truncating, like Cypher
+    toInteger). Nulls stay null; columns absent from the table are skipped.
+    """
+    for name in columns:
+        if name not in table.column_names:
+            continue
+        column = table[name]
+        if not pa.types.is_integer(column.type):
+            column = pc.cast(pc.cast(column, pa.float64()), pa.int64(), safe=False)
+        table = table.set_column(table.column_names.index(name), name, column)
+    return table
+
+
+def iter_table_records(table: pa.Table, batch_size: int = 1000,
+                       transform: Optional[Callable[[pa.Table], pa.Table]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield a table's rows as lists of dicts, batch_size rows at a time.
+
+    Only one batch of Python dicts exists at once - the full row list is never
+    materialized next to the columnar data.
+    """
+    if transform is not None:
+        table = transform(table)
+    for offset in range(0, table.num_rows, batch_size):
+        yield table.slice(offset, batch_size).to_pylist()
+
+
+def iter_csv_records(path: str, batch_size: int = 1000, limit: Optional[int] = None,
+                     transform: Optional[Callable[[pa.Table], pa.Table]] = None,
+                     column_types: Optional[Dict[str, pa.DataType]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream a CSV file as lists of row dicts, batch_size rows at a time.
+
+    The file is read block by block, so peak memory is one block rather than
+    the whole file, and reading stops as soon as limit rows have been yielded.
+    transform, if given, is applied to each block (as a table) before
+    conversion to dicts.
+
+    Types of columns not listed in column_types are inferred from the first
+    block only, so a later value that does not fit fails mid-load - pin ID and
+    text columns to pa.string() (which also keeps leading zeros) and numeric
+    ones to pa.float64(). Listed columns absent from the file are ignored.
+    """
+    convert_options = _CONVERT_OPTIONS
+    if column_types:
+        convert_options = pacsv.ConvertOptions(strings_can_be_null=True, column_types=column_types)
+    remaining = limit
+    # Memory-mapped input: blocks are parsed straight out of the page cache, so
+    # re-ingesting the same file skips the buffered read copy
+    with pa.memory_map(str(path)) as source, \
+            pacsv.open_csv(source, read_options=_READ_OPTIONS, convert_options=convert_options) as reader:
+        for block in reader:
+            if remaining is not None:
+                block = block.slice(0, remaining)
+                remaining -= block.num_rows
+            yield from iter_table_records(pa.Table.from_batches([block]), batch_size, transform)
+            if remaining == 0:
+                return
@@ -0,0 +1,62 @@
+"""
+Run the connector loads concurrently in one process.
+
+    python -m app.connectors.load_all [--nsta-limit 50] [--rrc-csv path --rrc-limit 200]
+
+Every loader writes through the shared async driver and one semaphore, so
+NSTA's HTTPS fetch and all sources' Neo4j batches overlap instead of running
+as separate sequential CLI invocations.
+"""
+import asyncio, argparse
+from typing import Dict, Optional
+
+from app.connectors import boem_wells, npd_wellbores, nsta_offshore_wells, rrc_loader, usgs_aggregated
+from app.connectors._async import close_async_driver, get_async_driver
+
+
+async def load_all(nsta_limit: int = 50, rrc_csv: Optional[str] = None, rrc_limit: Optional[int] = 200,
+                   concurrency: int = 16) -> Dict[str, object]:
+    """
+    Load every source concurrently.
+
+    Returns:
+        Rows written per source, or the exception that source failed with
+    """
+    sem = asyncio.Semaphore(concurrency)
+    try:
+        # One connectivity check up front instead of every loader failing separately
+        await get_async_driver().verify_connectivity()
+        jobs = {
+            "NSTA": nsta_offshore_wells.amain(limit=nsta_limit, sem=sem),
+            "BOEM": boem_wells.amain(sem=sem),
+            "NPD": npd_wellbores.amain(sem=sem),
+            "USGS": usgs_aggregated.amain(sem=sem),
+        }
+        if rrc_csv:
+            jobs["RRC"] = rrc_loader.amain(rrc_csv, limit=rrc_limit or None, sem=sem)
+        results = await asyncio.gather(*jobs.values(), return_exceptions=True)
+    finally:
+        await close_async_driver()
+    return dict(zip(jobs, results))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nsta-limit", type=int, default=50)
+    ap.add_argument("--rrc-csv", type=str, default=None)
+    ap.add_argument("--rrc-limit", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=16)
+    args = ap.parse_args()
+    results = asyncio.run(load_all(args.nsta_limit, args.rrc_csv, args.rrc_limit, args.concurrency))
+    failed = False
+    for source, result in results.items():
+        if isinstance(result, Exception):
+            failed = True
+            print(f"❌ {source}: {result}")
+        else:
+            print(f"✅ {source}: loaded {result} rows into Neo4j.")
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,41 @@
-import os, argparse, pandas as pd
+import os, asyncio, argparse
+import pyarrow as pa
 from dotenv import load_dotenv
-from neo4j import GraphDatabase
+
+from app.connectors._async import aload_csv
+from app.connectors._bolt import load_csv, WELL_ID_CONSTRAINT
+from app.connectors._csv import coalesce_columns, project_columns
 
 load_dotenv()
 
-def to_neo4j(df: pd.DataFrame):
-    from app.graph.graph_rag import URI, USER, PWD
-    driver = GraphDatabase.driver(URI, auth=(USER, PWD))
-    q = """
+_MERGE_Q = """
 UNWIND $rows AS r
-MERGE (w:Well {well_id: coalesce(r.WELLBORE, r.NAME)})
-SET w.country='NO', w.source='NPD', w.status=r.STATUS, w.field=r.FIELD,
-    w.location = apoc.convert.toJson({lat:r.LAT, lon:r.LON})
+MERGE (w:Well {well_id: r.well_id})
+SET w += r, w.country='NO', w.source='NPD', w.location = toString(r.lat) + ',' + toString(r.lon)
 """
-    with driver.session() as s:
-        s.run(q, rows=df.to_dict("records"))
-    driver.close()
+_SCHEMA = (WELL_ID_CONSTRAINT,)
+
+_WELL_ID = {"well_id": ("WELLBORE", "NAME")}
+_NPD_COLUMNS = {"status": "STATUS", "field": "FIELD", "lat": "LAT", "lon": "LON"}
+_COLUMN_TYPES = {**{column: pa.string() for column in ("WELLBORE", "NAME", "STATUS", "FIELD")},
+                 "LAT": pa.float64(), "LON": pa.float64()}
+
+def normalize_columns(table: pa.Table) -> pa.Table:
+    return project_columns(table, _NPD_COLUMNS).append_column("well_id", coalesce_columns(table, _WELL_ID)["well_id"])
+
+async def amain(csv_path="data/external_samples/npd_wellbores_sample.csv", sem=None) -> int:
+    """Async load for load_all - batches share sem with the other loaders."""
+    return await aload_csv(csv_path, _MERGE_Q, sem or asyncio.Semaphore(16), transform=normalize_columns,
+                           column_types=_COLUMN_TYPES, schema=_SCHEMA)
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--sample", type=str, default="data/external_samples/npd_wellbores_sample.csv")
     args = ap.parse_args()
-    df = pd.read_csv(args.sample)
-    if df.empty:
+    loaded = load_csv(args.sample, _MERGE_Q, _SCHEMA, transform=normalize_columns, column_types=_COLUMN_TYPES)
+    if loaded == 0:
         raise SystemExit("No NPD rows in sample.")
-    to_neo4j(df)
-    print(f"Loaded {len(df)} NPD wellbores into Neo4j.")
+    print(f"Loaded {loaded} NPD wellbores into Neo4j.")
 
 if __name__ == "__main__":
     main()
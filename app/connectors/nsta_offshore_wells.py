@@ -1,41 +1,96 @@
-import os, argparse, requests, pandas as pd
+import os, asyncio, argparse, httpx
+import pyarrow as pa
 from dotenv import load_dotenv
-from neo4j import GraphDatabase
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from app.connectors._async import abulk_unwind, aensure_schema
+from app.connectors._csv import coalesce_columns, iter_table_records, project_columns
+from app.connectors._bolt import write_rows, WELL_ID_CONSTRAINT
 
 load_dotenv()
 NSTA_FEATURE_URL = os.getenv("NSTA_WELLS_URL",
     "https://services9.arcgis.com/8pcKnVYHe23zA6C4/arcgis/rest/services/Offshore_Wells_WGS84/FeatureServer/0/query")
 
-def fetch_nsta(limit=50):
-    params = {"where":"1=1","outFields":"*","f":"json","resultRecordCount":limit}
-    r = requests.get(NSTA_FEATURE_URL, params=params, timeout=60)
+# Fallback page size when the layer metadata does not advertise maxRecordCount
+_DEFAULT_PAGE_SIZE = 1000
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+def _retryable(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRYABLE_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+@retry(retry=retry_if_exception(_retryable), wait=wait_exponential(multiplier=0.5, max=10),
+       stop=stop_after_attempt(5), reraise=True)
+async def _get_json(client: httpx.AsyncClient, url: str, params: dict) -> dict:
+    r = await client.get(url, params=params)
     r.raise_for_status()
     data = r.json()
-    rows = [f["attributes"] for f in data.get("features", [])]
-    return pd.DataFrame(rows)
+    if "error" in data:
+        raise ConnectionError(f"NSTA feature service error: {data['error']}")
+    return data
+
+async def _page_size(client: httpx.AsyncClient) -> int:
+    """The layer's maxRecordCount - the most features one query may return."""
+    layer = await _get_json(client, NSTA_FEATURE_URL.removesuffix("/query"), {"f": "json"})
+    return int(layer.get("maxRecordCount") or _DEFAULT_PAGE_SIZE)
+
+async def _fetch_page(client: httpx.AsyncClient, offset: int, count: int) -> list:
+    """Fetch count features from offset, following up while the server reports exceededTransferLimit."""
+    rows = []
+    while len(rows) < count:
+        params = {"where":"1=1","outFields":"*","f":"json",
+                  "resultOffset":offset + len(rows),"resultRecordCount":count - len(rows)}
+        data = await _get_json(client, NSTA_FEATURE_URL, params)
+        features = data.get("features", [])
+        rows.extend(f["attributes"] for f in features)
+        if not features or not data.get("exceededTransferLimit"):
+            break
+    return rows
 
-def to_neo4j(df: pd.DataFrame):
-    from app.graph.graph_rag import URI, USER, PWD
-    driver = GraphDatabase.driver(URI, auth=(USER, PWD))
-    q = """
+async def afetch_nsta(limit=50, concurrency=8) -> list:
+    """Fetch up to limit wells as parallel pages of the layer's maxRecordCount; transient failures back off exponentially."""
+    sem = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=concurrency)) as client:
+        page_size = await _page_size(client)
+        async def page(offset):
+            async with sem:
+                return await _fetch_page(client, offset, min(page_size, limit - offset))
+        pages = await asyncio.gather(*(page(offset) for offset in range(0, limit, page_size)))
+    return [row for rows in pages for row in rows]
+
+_MERGE_Q = """
 UNWIND $rows AS r
-MERGE (w:Well {well_id: coalesce(r.WELL_ID, r.WELL_WONS, toString(r.OBJECTID))})
-SET w.country='UK', w.source='NSTA', w.status = r.STATUS, w.year = r.YEAR, w.kb = r.KB_ELEVATION,
-    w.location = apoc.convert.toJson({lat:r.LATITUDE, lon:r.LONGITUDE})
+MERGE (w:Well {well_id: r.well_id})
+SET w += r, w.country='UK', w.source='NSTA', w.location = toString(r.lat) + ',' + toString(r.lon)
 """
-    with driver.session() as s:
-        s.run(q, rows=df.to_dict("records"))
-    driver.close()
+_SCHEMA = (WELL_ID_CONSTRAINT,)
+
+_WELL_ID = {"well_id": ("WELL_ID", "WELL_WONS", "OBJECTID")}
+_NSTA_COLUMNS = {"status": "STATUS", "year": "YEAR", "kb": "KB_ELEVATION", "lat": "LATITUDE", "lon": "LONGITUDE"}
+
+def normalize_columns(table: pa.Table) -> pa.Table:
+    return project_columns(table, _NSTA_COLUMNS).append_column("well_id", coalesce_columns(table, _WELL_ID)["well_id"])
+
+async def amain(limit=50, sem=None) -> int:
+    """Async load for load_all - the HTTPS fetch overlaps the other loaders' writes."""
+    rows = await afetch_nsta(limit)
+    if not rows:
+        return 0
+    await aensure_schema(*_SCHEMA)
+    rows = normalize_columns(pa.Table.from_pylist(rows)).to_pylist()
+    return await abulk_unwind(_MERGE_Q, rows, sem or asyncio.Semaphore(16))
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--limit", type=int, default=50)
     args = ap.parse_args()
-    df = fetch_nsta(args.limit)
-    if df.empty:
+    rows = asyncio.run(afetch_nsta(args.limit))
+    if not rows:
         raise SystemExit("No NSTA records fetched.")
-    to_neo4j(df)
-    print(f"Loaded {len(df)} NSTA wells into Neo4j.")
+    loaded = sum(write_rows(_MERGE_Q, batch, *_SCHEMA)
+                 for batch in iter_table_records(pa.Table.from_pylist(rows), transform=normalize_columns))
+    print(f"Loaded {loaded} NSTA wells into Neo4j.")
 
 if __name__ == "__main__":
     main()
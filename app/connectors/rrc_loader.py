@@ -1,35 +1,48 @@
-import os, argparse, pandas as pd
+import os, asyncio, argparse
+import pyarrow as pa
 from dotenv import load_dotenv
-from neo4j import GraphDatabase
+
+from app.connectors._async import aload_csv
+from app.connectors._bolt import load_csv, WELL_ID_CONSTRAINT
+from app.connectors._csv import coalesce_columns
 
 load_dotenv()
 
-def to_neo4j(df: pd.DataFrame):
-    from app.graph.graph_rag import URI, USER, PWD
-    driver = GraphDatabase.driver(URI, auth=(USER, PWD))
-    q = """
+_MERGE_Q = """
 UNWIND $rows AS r
-MERGE (w:Well {well_id: coalesce(r.API_NUMBER, r.API, r.WELL_API, r.WELL_NO)})
-SET w.country='US', w.state='TX', w.source='RRC',
-    w.operator = coalesce(r.OPERATOR, r.Operator, r.OPERATOR_NAME),
-    w.county = coalesce(r.COUNTY, r.COUNTY_NAME),
-    w.field = coalesce(r.FIELD, r.Field),
-    w.location = coalesce(r.SURVEY, r.SURF_LOCATION, r.LOCATION)
+MERGE (w:Well {well_id: r.well_id})
+SET w += r, w.country='US', w.state='TX', w.source='RRC'
 """
-    with driver.session() as s:
-        s.run(q, rows=df.to_dict("records"))
-    driver.close()
+_SCHEMA = (WELL_ID_CONSTRAINT,)
+
+# RRC extracts name the same attribute differently - resolved client-side, first present wins
+_RRC_COLUMNS = {
+    "well_id": ("API_NUMBER", "API", "WELL_API", "WELL_NO"),
+    "operator": ("OPERATOR", "Operator", "OPERATOR_NAME"),
+    "county": ("COUNTY", "COUNTY_NAME"),
+    "field": ("FIELD", "Field"),
+    "location": ("SURVEY", "SURF_LOCATION", "LOCATION"),
+}
+# Every source column is text - pinned so API numbers keep leading zeros and mixed values never break a later block
+_COLUMN_TYPES = {column: pa.string() for candidates in _RRC_COLUMNS.values() for column in candidates}
+
+def normalize_columns(table: pa.Table) -> pa.Table:
+    return coalesce_columns(table, _RRC_COLUMNS)
+
+async def amain(csv_path, limit=None, sem=None) -> int:
+    """Async load for load_all - batches share sem with the other loaders."""
+    return await aload_csv(csv_path, _MERGE_Q, sem or asyncio.Semaphore(16), limit=limit,
+                           transform=normalize_columns, column_types=_COLUMN_TYPES, schema=_SCHEMA)
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--csv", required=True)
     ap.add_argument("--limit", type=int, default=200)
     args = ap.parse_args()
-    df = pd.read_csv(args.csv)
-    if args.limit:
-        df = df.head(args.limit)
-    to_neo4j(df)
-    print(f"Loaded {len(df)} RRC wells into Neo4j.")
+    # Streamed - with --limit only the first rows of a large export are ever read
+    loaded = load_csv(args.csv, _MERGE_Q, _SCHEMA, limit=args.limit or None, transform=normalize_columns,
+                      column_types=_COLUMN_TYPES)
+    print(f"Loaded {loaded} RRC wells into Neo4j.")
 
 if __name__ == "__main__":
     main()
@@ -1,31 +1,43 @@
-import os, argparse, pandas as pd
+import os, asyncio, argparse
+import pyarrow as pa
 from dotenv import load_dotenv
-from neo4j import GraphDatabase
+
+from app.connectors._async import aload_csv
+from app.connectors._bolt import load_csv, REGION_GRID_CONSTRAINT
+from app.connectors._csv import cast_int_columns, project_columns
 
 load_dotenv()
 
-def to_neo4j(df: pd.DataFrame):
-    from app.graph.graph_rag import URI, USER, PWD
-    driver = GraphDatabase.driver(URI, auth=(USER, PWD))
-    q = """
+_MERGE_Q = """
 UNWIND $rows AS r
 MERGE (g:RegionGrid {grid_id:r.grid_id})
-SET g.source='USGS', g.total_wells=toInteger(r.total_wells), g.oil=toInteger(r.oil), g.gas=toInteger(r.gas),
-    g.horiz=toInteger(r.horizontal), g.frac=toInteger(r.fractured)
+SET g += r, g.source='USGS'
 """
-    with driver.session() as s:
-        s.run(q, rows=df.to_dict("records"))
-    driver.close()
+_SCHEMA = (REGION_GRID_CONSTRAINT,)
+
+# Counts arrive as native ints - cast client-side so the server does no conversion
+_INT_COLUMNS = ("total_wells", "oil", "gas", "horizontal", "fractured")
+_USGS_COLUMNS = {"grid_id": "grid_id", "total_wells": "total_wells", "oil": "oil", "gas": "gas",
+                 "horiz": "horizontal", "frac": "fractured"}
+# Pinned CSV types - counts read as float (a later "12.0" cannot break the load) and are cast to int above
+_COLUMN_TYPES = {"grid_id": pa.string(), **{column: pa.float64() for column in _INT_COLUMNS}}
+
+def normalize_columns(table: pa.Table) -> pa.Table:
+    return project_columns(cast_int_columns(table, _INT_COLUMNS), _USGS_COLUMNS)
+
+async def amain(csv_path="data/external_samples/usgs_drilling_history_sample.csv", sem=None) -> int:
+    """Async load for load_all - batches share sem with the other loaders."""
+    return await aload_csv(csv_path, _MERGE_Q, sem or asyncio.Semaphore(16), transform=normalize_columns,
+                           column_types=_COLUMN_TYPES, schema=_SCHEMA)
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--csv", type=str, default="data/external_samples/usgs_drilling_history_sample.csv")
     args = ap.parse_args()
-    df = pd.read_csv(args.csv)
-    if df.empty:
+    loaded = load_csv(args.csv, _MERGE_Q, _SCHEMA, transform=normalize_columns, column_types=_COLUMN_TYPES)
+    if loaded == 0:
         raise SystemExit("Empty USGS sample.")
-    to_neo4j(df)
-    print(f"Loaded {len(df)} USGS grid records into Neo4j.")
+    print(f"Loaded {loaded} USGS grid records into Neo4j.")
 
 if __name__ == "__main__":
     main()
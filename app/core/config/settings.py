@@ -1,13 +1,49 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from typing import Optional
 
-class Settings(BaseSettings):
+# Project-root .env, resolved once - independent of the working directory
+_ENV_FILE = Path(__file__).resolve().parents[3] / ".env"
+
+
+class _EnvSettings(BaseSettings):
+    """Shared .env source and parsing rules for every settings model."""
+
+    class Config:
+        env_file = str(_ENV_FILE)
+        case_sensitive = False
+        populate_by_name = True
+        # Add this to allow extra environment variables
+        extra = "ignore"  # This will ignore extra env vars instead of rejecting them
+
+
+class Neo4jSettings(_EnvSettings):
+    """Neo4j section only - for callers that never touch AstraDB or WatsonX."""
+
+    neo4j_uri: Optional[str] = Field(default=None, alias="NEO4J_URI")
+    neo4j_user: str = Field(default="neo4j", alias="NEO4J_USERNAME")
+    neo4j_password: Optional[str] = Field(default=None, alias="NEO4J_PASSWORD")
+    neo4j_database: str = Field(default="neo4j", alias="NEO4J_DATABASE")
+
+
+class AstraSettings(_EnvSettings):
+    """AstraDB section only."""
+
+    astra_endpoint: Optional[str] = Field(default=None, alias="ASTRA_DB_API_ENDPOINT")
+    astra_token: Optional[str] = Field(default=None, alias="ASTRA_DB_APPLICATION_TOKEN")
+    astra_collection: str = Field(default="drilling_docs", alias="ASTRA_DB_VECTOR_COLLECTION")
+
+
+class Settings(Neo4jSettings, AstraSettings):
     """
     Centralized configuration management using Pydantic.
     Validates environment variables and provides defaults.
+    
+    The Neo4j and AstraDB fields are inherited from their section models, so
+    each env var's alias and default is declared once.
     """
     
     # Core settings
@@ -15,17 +51,6 @@ class Settings(BaseSettings):
     debug: bool = Field(default=False)
     environment: str = Field(default="development")
     
-    # Neo4j settings
-    neo4j_uri: Optional[str] = Field(default=None, alias="NEO4J_URI")
-    neo4j_user: str = Field(default="neo4j", alias="NEO4J_USERNAME")
-    neo4j_password: Optional[str] = Field(default=None, alias="NEO4J_PASSWORD")
-    neo4j_database: str = Field(default="neo4j", alias="NEO4J_DATABASE")
-    
-    # AstraDB settings
-    astra_endpoint: Optional[str] = Field(default=None, alias="ASTRA_DB_API_ENDPOINT")
-    astra_token: Optional[str] = Field(default=None, alias="ASTRA_DB_APPLICATION_TOKEN")
-    astra_collection: str = Field(default="drilling_docs", alias="ASTRA_DB_VECTOR_COLLECTION")
-    
     # Add the missing fields that were causing validation errors
     astra_db_vector_dim: Optional[str] = Field(default="1536", alias="ASTRA_DB_VECTOR_DIM")
     astra_use_server_vectorize: Optional[str] = Field(default="true", alias="ASTRA_USE_SERVER_VECTORIZE")
@@ -46,13 +71,27 @@ class Settings(BaseSettings):
     max_loops: int = Field(default=5, alias="MAX_LOOPS")
     enable_monitoring: bool = Field(default=True, alias="ENABLE_MONITORING")
     enable_multi_agent: bool = Field(default=False, alias="ENABLE_MULTI_AGENT")
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-        populate_by_name = True
-        # Add this to allow extra environment variables
-        extra = "ignore"  # This will ignore extra env vars instead of rejecting them
 
-# Global settings instance
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings, built (and .env parsed) on first use."""
+    return Settings()
+
+
+@lru_cache(maxsize=1)
+def get_neo4j_settings() -> Neo4jSettings:
+    """Return the Neo4j settings alone - validates 4 fields instead of the full Settings model."""
+    return Neo4jSettings()
+
+
+@lru_cache(maxsize=1)
+def get_astra_settings() -> AstraSettings:
+    """Return the AstraDB settings alone."""
+    return AstraSettings()
+
+
+def __getattr__(name: str):
+    # Backward compatible `from app.core.config.settings import settings`, now lazy
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,36 @@
 import re
+import copy
 import json
-from typing import Dict, List, Optional, Tuple
+import hashlib
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
 import logging
 
+import numpy as np
+import orjson
+from cachetools import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Optional linear-time engine (google-re2) for scanning large plan texts; the
+# patterns below use inline flags so they compile identically under either module
+try:
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+# Text-plan patterns, compiled once at import instead of looked up on every parse.
+# One alternation covers all drilling parameters, so the plan is scanned once, not per parameter
+_PARAMS_RE = _regex.compile(r'(?i)(?P<key>WOB|RPM|Flow)[:\s]+(?P<val>\d+(?:\.\d+)?)')
+_PARAM_NAMES = {"wob": "wob", "rpm": "rpm", "flow": "flow_rate"}
+_BHA_RE = _regex.compile(r'(?i)(bit|motor|mwd|lwd|stabilizer)[:\s]+([^\n]+)')
+# JSON plans start with '{' after optional whitespace - checked without copying the text
+_JSON_START_RE = re.compile(r'\s*\{')
+
 class RiskCategory(Enum):
     VIBRATION = "vibration"
     PRESSURE = "pressure"
@@ -15,14 +39,6 @@ class RiskCategory(Enum):
     EQUIPMENT = "equipment"
     ENVIRONMENTAL = "environmental"
 
-@dataclass
-class DrillingParameters:
-    wob: Optional[float] = None  # Weight on Bit
-    rpm: Optional[float] = None  # Rotations per minute
-    flow_rate: Optional[float] = None  # Mud flow rate
-    mud_weight: Optional[float] = None
-    torque: Optional[float] = None
-    
 @dataclass
 class BHAComponent:
     component_type: str
@@ -31,6 +47,26 @@ class BHAComponent:
     position: int
     operating_limits: Dict
 
+@dataclass(slots=True, frozen=True)
+class ValidationSummary:
+    """Validation fields the KPI formulas read - attribute access instead of repeated dict lookups"""
+    violations: int
+    confidence: float
+    passes: bool
+    critical_violations: int = 0
+    hydraulics_ok: bool = True
+    
+    @classmethod
+    def from_dict(cls, validation: Dict) -> "ValidationSummary":
+        """Build from a validation result; required keys are accessed strictly"""
+        return cls(
+            violations=validation["violations"],
+            confidence=validation["confidence"],
+            passes=validation["passes"],
+            critical_violations=validation.get("critical_violations", 0),
+            hydraulics_ok=validation.get("hydraulics_ok", True)
+        )
+
 @dataclass
 class FormationData:
     name: str
@@ -40,25 +76,52 @@ class FormationData:
     pore_pressure: Optional[float] = None
     formation_type: Optional[str] = None
 
+# Industry benchmarks (these should come from the knowledge graph) - shared read-only by every calculator
+_BENCHMARKS = MappingProxyType({
+    "avg_cost_per_foot": 500.0,
+    "target_rop": 50.0,  # feet per hour
+    "max_acceptable_risk": 0.3,
+    "target_npt_hours": 24.0
+})
+
+
+_KEY_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+
+def _kpi_key(plan_text: str, validation: Dict, well_id: Optional[str]) -> bytes:
+    """Content hash of one KPI evaluation's inputs."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(plan_text.encode("utf-8"))
+    h.update(b"\x00")
+    # orjson emits sorted UTF-8 bytes directly - no intermediate str to encode
+    h.update(orjson.dumps(validation, option=_KEY_OPTIONS, default=str))
+    h.update(b"\x00")
+    h.update((well_id or "").encode("utf-8"))
+    return h.digest()
+
+
 class KPICalculator:
-    def __init__(self, graph_client=None, historical_data_client=None):
+    def __init__(self, graph_client=None, historical_data_client=None, cache_size: int = 256,
+                 context_ttl: int = 300):
         """
         Initialize KPI calculator with graph and historical data access
         
         Args:
             graph_client: Neo4j client for accessing knowledge graph
             historical_data_client: Client for accessing historical performance data
+            cache_size: Number of KPI results kept for repeat evaluations (0 disables)
+            context_ttl: Seconds a well's graph context - and any KPI result
+                computed from it - stays cached
         """
         self.graph_client = graph_client
         self.historical_data_client = historical_data_client
+        # Results embed the well context, so they expire with it
+        self._kpi_cache = TTLCache(maxsize=cache_size, ttl=context_ttl) if cache_size > 0 else None
+        self._kpi_cache_lock = threading.Lock()
+        # Per-well graph lookups are shared by every plan for that well
+        self._well_ctx_cache = TTLCache(maxsize=256, ttl=context_ttl)
         
-        # Industry benchmarks (these should come from the knowledge graph)
-        self.benchmarks = {
-            "avg_cost_per_foot": 500.0,
-            "target_rop": 50.0,  # feet per hour
-            "max_acceptable_risk": 0.3,
-            "target_npt_hours": 24.0
-        }
+        self.benchmarks = _BENCHMARKS
     
     def _validate_required_data(self, plan_data: Dict, validation: Dict) -> None:
         """
@@ -78,10 +141,20 @@ class KPICalculator:
         if "passes" not in validation:
             raise KeyError("Required key 'passes' missing from validation")
     
+    def clear_cache(self) -> None:
+        """Drop cached KPI results - call after the graph data behind them changes"""
+        with self._kpi_cache_lock:
+            if self._kpi_cache is not None:
+                self._kpi_cache.clear()
+            self._well_ctx_cache.clear()
+    
     def compute_kpis(self, plan_text: str, validation: Dict, well_id: str = None) -> Dict[str, float]:
         """
         Compute comprehensive KPIs for a drilling plan
         
+        Repeat evaluations of identical inputs are served from a cache keyed on
+        a content hash of (plan_text, validation, well_id) for context_ttl seconds.
+        
         Args:
             plan_text: The drilling plan text/JSON
             validation: Validation results from engineering models
@@ -90,20 +163,39 @@ class KPICalculator:
         Returns:
             Dictionary of KPI scores and components
         """
+        if self._kpi_cache is None:
+            return self._compute_kpis(plan_text, validation, well_id)
+        
+        key = _kpi_key(plan_text, validation, well_id)
+        with self._kpi_cache_lock:
+            cached = self._kpi_cache.get(key)
+        if cached is None:
+            cached = self._compute_kpis(plan_text, validation, well_id)
+            with self._kpi_cache_lock:
+                self._kpi_cache[key] = cached
+        # Callers get their own copy - the cached result stays untouched
+        return copy.deepcopy(cached)
+    
+    def _compute_kpis(self, plan_text: str, validation: Dict, well_id: str = None) -> Dict[str, float]:
+        """Uncached KPI computation behind compute_kpis"""
         # Parse the drilling plan
         plan_data = self._parse_plan(plan_text)
         
         # Validate all required data is present - fail fast if missing
         self._validate_required_data(plan_data, validation)
+        summary = ValidationSummary.from_dict(validation)
         
         # Get contextual data from knowledge graph
         context = self._get_plan_context(well_id, plan_data) if well_id else {}
         
+        # ROP feeds both drilling time (cost) and performance - estimated once
+        estimated_rop = self._estimate_rop(plan_data["parameters"], context)
+        
         # Calculate individual KPI components
-        cost_metrics = self._calculate_cost_kpis(plan_data, validation, context)
-        risk_metrics = self._calculate_risk_kpis(plan_data, validation, context)
-        performance_metrics = self._calculate_performance_kpis(plan_data, validation, context)
-        safety_metrics = self._calculate_safety_kpis(plan_data, validation, context)
+        cost_metrics = self._calculate_cost_kpis(plan_data, summary, context, estimated_rop)
+        risk_metrics = self._calculate_risk_kpis(plan_data, summary, context)
+        performance_metrics = self._calculate_performance_kpis(plan_data, summary, context, estimated_rop)
+        safety_metrics = self._calculate_safety_kpis(plan_data, summary, context)
         
         # Calculate composite scores
         kpi_cost = self._normalize_cost_score(cost_metrics)
@@ -134,18 +226,98 @@ class KPICalculator:
             "safety_components": safety_metrics,
             
             # Validation-based metrics
-            "constraint_violations": validation["violations"],
-            "validation_confidence": validation["confidence"],
+            "constraint_violations": summary.violations,
+            "validation_confidence": summary.confidence,
             
             # Context-aware metrics
             "historical_comparison": context.get("historical_performance", 0.0),
             "formation_difficulty": context.get("formation_complexity", 0.0),
         }
     
+    def compute_kpis_batch(self, plans: List[Dict], validations: List[Dict],
+                           contexts: Optional[List[Dict]] = None) -> Dict[str, np.ndarray]:
+        """
+        Compute the headline KPIs for many parsed plans at once (grid search, backtesting)
+        
+        Same formulas as compute_kpis, evaluated column-wise with NumPy instead of
+        once per plan in Python.
+        
+        Args:
+            plans: Parsed plans, as returned by _parse_plan
+            validations: Validation result per plan
+            contexts: Graph context per plan (default: no context)
+            
+        Returns:
+            Arrays of kpi_overall, kpi_cost, kpi_risk, kpi_rop and kpi_safety, one entry per plan
+        """
+        if len(validations) != len(plans):
+            raise ValueError(f"Expected {len(plans)} validations, got: {len(validations)}")
+        if contexts is None:
+            contexts = [{}] * len(plans)
+        elif len(contexts) != len(plans):
+            raise ValueError(f"Expected {len(plans)} contexts, got: {len(contexts)}")
+        
+        for plan_data, validation in zip(plans, validations):
+            self._validate_required_data(plan_data, validation)
+        summaries = [ValidationSummary.from_dict(validation) for validation in validations]
+        
+        def column(values) -> np.ndarray:
+            return np.fromiter(values, dtype=np.float64, count=len(plans))
+        
+        # Structure of arrays: one column per input the formulas read
+        wob = column(p["parameters"].get("wob", 30) for p in plans)
+        rpm = column(p["parameters"].get("rpm", 120) for p in plans)
+        mud_weight = column(p["parameters"].get("mud_weight", 9.0) for p in plans)
+        n_bha = column(len(p["bha_components"]) for p in plans)
+        violations = column(v.violations for v in summaries)
+        critical = column(v.critical_violations for v in summaries)
+        hydraulics_ok = column(v.hydraulics_ok for v in summaries).astype(bool)
+        hardness = column(c.get("formation_hardness", 0.5) for c in contexts)
+        pore_pressure = column(c.get("pore_pressure", 8.5) for c in contexts)
+        depth = column(c.get("well_depth", 10000) for c in contexts)
+        cost_depth = column(c.get("well_depth", 1000) for c in contexts)
+        formation_risk = column(c.get("formation_complexity", 0.3) for c in contexts)
+        
+        # Performance
+        rop = np.maximum(
+            30.0 * (1.0 - hardness * 0.5) * np.minimum(wob / 40.0, 1.5) * np.minimum(rpm / 120.0, 1.3), 5.0
+        )
+        mechanical = np.maximum(((1.0 - np.abs(wob - 35) / 50.0) + (1.0 - np.abs(rpm - 120) / 120.0)) / 2, 0.0)
+        hydraulic = np.where(hydraulics_ok, 0.8, 0.4)
+        kpi_rop = np.minimum(rop / self.benchmarks["target_rop"], 2.0) * 0.6 + (mechanical + hydraulic) / 2 * 0.4
+        
+        # Cost
+        time_cost = depth / np.maximum(rop, 1.0) * 1000.0
+        total_cost = (n_bha * 50000 + time_cost + 25000.0) * (1.0 + violations * 0.15)
+        cost_per_foot = total_cost / np.maximum(cost_depth, 1000)
+        # Piecewise rules are written as masks and selects - no per-plan branching
+        ratio = cost_per_foot / self.benchmarks["avg_cost_per_foot"]
+        kpi_cost = np.clip(np.where(ratio <= 1.0, 1.0 - 0.3 * ratio, 0.7 - (ratio - 1.0)), 0.0, 1.0)
+        
+        # Risk
+        vibration = np.select([(rpm > 150) & (hardness > 0.7), (rpm > 120) & (hardness > 0.5)], [0.8, 0.5], default=0.2)
+        margin = mud_weight - pore_pressure
+        pressure = np.select([margin < 0.5, margin < 1.0], [0.9, 0.5], default=0.1)
+        equipment = np.where(n_bha == 0, 0.5, np.minimum(n_bha / 10.0, 1.0))
+        overall_risk = (np.minimum(violations * 0.2, 1.0) + vibration + pressure + equipment + formation_risk) / 5
+        kpi_risk = np.maximum(1.0 - overall_risk, 0.0)
+        
+        # Safety
+        kpi_safety = np.maximum(1.0 - critical * 0.3, 0.0)
+        
+        return {
+            "kpi_overall": kpi_cost * 0.25 + kpi_risk * 0.35 + kpi_rop * 0.25 + kpi_safety * 0.15,
+            "kpi_cost": kpi_cost,
+            "kpi_risk": kpi_risk,
+            "kpi_rop": kpi_rop,
+            "kpi_safety": kpi_safety,
+        }
+    
     def _parse_plan(self, plan_text: str) -> Dict:
         """Parse drilling plan text to extract structured data"""
+        # Same schema as _parse_text_plan - parameters is always a plain dict
         plan_data = {
-            "parameters": DrillingParameters(),
+            "parameters": {},
             "bha_components": [],
             "formations": [],
             "sections": []
@@ -153,8 +325,8 @@ class KPICalculator:
         
         try:
             # Try to parse as JSON first
-            if plan_text.strip().startswith('{'):
-                json_data = json.loads(plan_text)
+            if _JSON_START_RE.match(plan_text):
+                json_data = orjson.loads(plan_text)
                 plan_data.update(json_data)
             else:
                 # Parse text-based plan using regex patterns
@@ -168,23 +340,19 @@ class KPICalculator:
     
     def _parse_text_plan(self, plan_text: str) -> Dict:
         """Parse text-based drilling plan using regex patterns"""
-        plan_data = {"parameters": {}, "bha_components": [], "sections": []}
+        plan_data = {"parameters": {}, "bha_components": [], "formations": [], "sections": []}
         
         # Extract drilling parameters
-        wob_match = re.search(r'WOB[:\s]+(\d+(?:\.\d+)?)', plan_text, re.IGNORECASE)
-        rpm_match = re.search(r'RPM[:\s]+(\d+(?:\.\d+)?)', plan_text, re.IGNORECASE)
-        flow_match = re.search(r'Flow[:\s]+(\d+(?:\.\d+)?)', plan_text, re.IGNORECASE)
-        
-        if wob_match:
-            plan_data["parameters"]["wob"] = float(wob_match.group(1))
-        if rpm_match:
-            plan_data["parameters"]["rpm"] = float(rpm_match.group(1))
-        if flow_match:
-            plan_data["parameters"]["flow_rate"] = float(flow_match.group(1))
+        params = plan_data["parameters"]
+        for match in _PARAMS_RE.finditer(plan_text):
+            # First occurrence of each parameter wins
+            params.setdefault(_PARAM_NAMES[match.group("key").lower()], float(match.group("val")))
+            # All found - stop scanning instead of walking the rest of a long plan
+            if len(params) == len(_PARAM_NAMES):
+                break
             
         # Extract BHA components (simplified)
-        bha_pattern = r'(bit|motor|mwd|lwd|stabilizer)[:\s]+([^\n]+)'
-        for match in re.finditer(bha_pattern, plan_text, re.IGNORECASE):
+        for match in _BHA_RE.finditer(plan_text):
             component_type = match.group(1).lower()
             description = match.group(2).strip()
             plan_data["bha_components"].append({
@@ -203,18 +371,29 @@ class KPICalculator:
                 # Query for historical performance of similar plans
                 context["historical_performance"] = self._query_historical_performance(well_id, plan_data)
                 
-                # Query for formation complexity
-                context["formation_complexity"] = self._query_formation_complexity(well_id)
-                
-                # Query for offset well performance
-                context["offset_performance"] = self._query_offset_wells(well_id)
+                # Formation complexity and offset well performance depend only on the well
+                context.update(self._get_well_context(well_id))
                 
             except Exception as e:
-                logger.warning(f"Failed to retrieve graph context: {str(e)}")
+                logger.warning("Failed to retrieve graph context: %s", e)
                 
         return context
     
-    def _calculate_cost_kpis(self, plan_data: Dict, validation: Dict, context: Dict) -> Dict:
+    def _get_well_context(self, well_id: str) -> Dict:
+        """Per-well graph context, cached for context_ttl seconds"""
+        with self._kpi_cache_lock:
+            cached = self._well_ctx_cache.get(well_id)
+        if cached is None:
+            cached = {
+                "formation_complexity": self._query_formation_complexity(well_id),
+                "offset_performance": self._query_offset_wells(well_id)
+            }
+            with self._kpi_cache_lock:
+                self._well_ctx_cache[well_id] = cached
+        return copy.deepcopy(cached)
+    
+    def _calculate_cost_kpis(self, plan_data: Dict, validation: ValidationSummary, context: Dict,
+                             estimated_rop: Optional[float] = None) -> Dict:
         """Calculate cost-related KPI components"""
         base_drilling_cost = 1000.0  # Base cost per day
         
@@ -222,14 +401,14 @@ class KPICalculator:
         bha_cost = self._estimate_bha_cost(plan_data["bha_components"])
         
         # Time-based costs (from drilling parameters and formation data)
-        estimated_time = self._estimate_drilling_time(plan_data, context)
+        estimated_time = self._estimate_drilling_time(plan_data, context, estimated_rop)
         time_cost = estimated_time * base_drilling_cost
         
         # Mud and consumables cost
         consumables_cost = self._estimate_consumables_cost(plan_data)
         
         # Risk-adjusted costs (from validation failures)
-        risk_cost_multiplier = 1.0 + (validation["violations"] * 0.15)
+        risk_cost_multiplier = 1.0 + (validation.violations * 0.15)
         
         total_cost = (bha_cost + time_cost + consumables_cost) * risk_cost_multiplier
         
@@ -242,12 +421,12 @@ class KPICalculator:
             "cost_per_foot": total_cost / max(context.get("well_depth", 1000), 1000)
         }
     
-    def _calculate_risk_kpis(self, plan_data: Dict, validation: Dict, context: Dict) -> Dict:
+    def _calculate_risk_kpis(self, plan_data: Dict, validation: ValidationSummary, context: Dict) -> Dict:
         """Calculate risk-related KPI components"""
         risk_components = {}
         
-        # Validation-based risks - strict access
-        validation_risk = min(validation["violations"] * 0.2, 1.0)
+        # Validation-based risks
+        validation_risk = min(validation.violations * 0.2, 1.0)
         
         # Parameter-based risks
         drilling_params = plan_data.get("parameters", {})
@@ -275,7 +454,8 @@ class KPICalculator:
         
         return risk_components
     
-    def _calculate_performance_kpis(self, plan_data: Dict, validation: Dict, context: Dict) -> Dict:
+    def _calculate_performance_kpis(self, plan_data: Dict, validation: ValidationSummary, context: Dict,
+                                    estimated_rop: Optional[float] = None) -> Dict:
         """Calculate performance-related KPI components"""
         # STRICT validation - no fallback values
         if "parameters" not in plan_data:
@@ -284,7 +464,8 @@ class KPICalculator:
         drilling_params = plan_data["parameters"]
         
         # Estimated ROP based on parameters and formation
-        estimated_rop = self._estimate_rop(drilling_params, context)
+        if estimated_rop is None:
+            estimated_rop = self._estimate_rop(drilling_params, context)
         
         # Efficiency metrics
         mechanical_efficiency = self._calculate_mechanical_efficiency(drilling_params)
@@ -301,12 +482,12 @@ class KPICalculator:
             "rop_normalized": min(estimated_rop / self.benchmarks["target_rop"], 2.0)
         }
     
-    def _calculate_safety_kpis(self, plan_data: Dict, validation: Dict, context: Dict) -> Dict:
+    def _calculate_safety_kpis(self, plan_data: Dict, validation: ValidationSummary, context: Dict) -> Dict:
         """Calculate safety-related KPI components"""
         safety_score = 1.0
         
         # Reduce safety score based on validation violations
-        critical_violations = validation.get("critical_violations", 0)
+        critical_violations = validation.critical_violations
         safety_score -= critical_violations * 0.3
         
         # Environmental considerations
@@ -323,7 +504,7 @@ class KPICalculator:
         }
     
     # Helper methods for risk assessment
-    def _assess_vibration_risk(self, params: Dict, context: Dict) -> float:
+    def _assess_vibration_risk(self, params: Dict[str, float], context: Dict[str, Any]) -> float:
         """Assess vibration risk based on RPM and formation characteristics"""
         rpm = params.get("rpm", 120)
         formation_hardness = context.get("formation_hardness", 0.5)
@@ -336,7 +517,7 @@ class KPICalculator:
         else:
             return 0.2
     
-    def _assess_pressure_risk(self, params: Dict, context: Dict) -> float:
+    def _assess_pressure_risk(self, params: Dict[str, float], context: Dict[str, Any]) -> float:
         """Assess pressure-related risks"""
         mud_weight = params.get("mud_weight", 9.0)
         pore_pressure = context.get("pore_pressure", 8.5)
@@ -349,7 +530,7 @@ class KPICalculator:
         else:
             return 0.1  # Low risk
     
-    def _assess_equipment_risk(self, bha_components: List[Dict]) -> float:
+    def _assess_equipment_risk(self, bha_components: List[Dict[str, Any]]) -> float:
         """Assess equipment-related risks"""
         if not bha_components:
             return 0.5
@@ -358,7 +539,7 @@ class KPICalculator:
         complexity_score = len(bha_components) / 10.0
         return min(complexity_score, 1.0)
     
-    def _estimate_rop(self, params: Dict, context: Dict) -> float:
+    def _estimate_rop(self, params: Dict[str, float], context: Dict[str, Any]) -> float:
         """Estimate Rate of Penetration"""
         base_rop = 30.0  # feet per hour
         
@@ -375,7 +556,7 @@ class KPICalculator:
         estimated_rop = base_rop * formation_factor * wob_factor * rpm_factor
         return max(estimated_rop, 5.0)  # Minimum 5 ft/hr
     
-    def _normalize_cost_score(self, cost_metrics: Dict) -> float:
+    def _normalize_cost_score(self, cost_metrics: Dict[str, float]) -> float:
         """Normalize cost metrics to 0-1 scale (lower is better)"""
         cost_per_foot = cost_metrics.get("cost_per_foot", 500)
         benchmark = self.benchmarks["avg_cost_per_foot"]
@@ -386,12 +567,12 @@ class KPICalculator:
         else:
             return max(0.7 - ((cost_per_foot - benchmark) / benchmark), 0.0)
     
-    def _normalize_risk_score(self, risk_metrics: Dict) -> float:
+    def _normalize_risk_score(self, risk_metrics: Dict[str, float]) -> float:
         """Normalize risk metrics to 0-1 scale (lower risk = higher score)"""
         overall_risk = risk_metrics.get("overall_risk", 0.5)
         return max(1.0 - overall_risk, 0.0)
     
-    def _normalize_performance_score(self, performance_metrics: Dict) -> float:
+    def _normalize_performance_score(self, performance_metrics: Dict[str, float]) -> float:
         """Normalize performance metrics to 0-1 scale"""
         rop_normalized = performance_metrics.get("rop_normalized", 0.5)
         efficiency = (performance_metrics.get("mechanical_efficiency", 0.7) + 
@@ -399,20 +580,14 @@ class KPICalculator:
         
         return (rop_normalized * 0.6 + efficiency * 0.4)
     
-    def _normalize_safety_score(self, safety_metrics: Dict) -> float:
+    def _normalize_safety_score(self, safety_metrics: Dict[str, float]) -> float:
         """Normalize safety metrics to 0-1 scale"""
         return safety_metrics.get("safety_score", 0.8)
     
-    def _calculate_weighted_score(self, scores: Dict) -> float:
+    def _calculate_weighted_score(self, scores: Dict[str, float]) -> float:
         """Calculate weighted overall score"""
-        weights = {
-            "cost": 0.25,
-            "risk": 0.35,
-            "performance": 0.25,
-            "safety": 0.15
-        }
-        
-        return sum(scores[key] * weights[key] for key in weights)
+        # Weights: cost 0.25, risk 0.35, performance 0.25, safety 0.15 - inlined, no per-call dict
+        return scores["cost"] * 0.25 + scores["risk"] * 0.35 + scores["performance"] * 0.25 + scores["safety"] * 0.15
     
     # Placeholder methods for future integration with knowledge graph
     def _query_historical_performance(self, well_id: str, plan_data: Dict) -> float:
@@ -436,13 +611,14 @@ class KPICalculator:
         base_cost_per_component = 50000
         return len(components) * base_cost_per_component
     
-    def _estimate_drilling_time(self, plan_data: Dict, context: Dict) -> float:
+    def _estimate_drilling_time(self, plan_data: Dict, context: Dict, estimated_rop: Optional[float] = None) -> float:
         """Estimate total drilling time in hours"""
         # STRICT validation - no fallback values  
         if "parameters" not in plan_data:
             raise KeyError("Required key 'parameters' missing from plan_data")
         
-        estimated_rop = self._estimate_rop(plan_data["parameters"], context)
+        if estimated_rop is None:
+            estimated_rop = self._estimate_rop(plan_data["parameters"], context)
         well_depth = context.get("well_depth", 10000)
         return well_depth / max(estimated_rop, 1.0)
     
@@ -451,7 +627,7 @@ class KPICalculator:
         # Simplified calculation
         return 25000.0
     
-    def _calculate_mechanical_efficiency(self, params: Dict) -> float:
+    def _calculate_mechanical_efficiency(self, params: Dict[str, float]) -> float:
         """Calculate mechanical drilling efficiency"""
         # Simplified heuristic based on WOB and RPM
         wob = params.get("wob", 30)
@@ -463,10 +639,10 @@ class KPICalculator:
         
         return max((wob_efficiency + rpm_efficiency) / 2, 0.0)
     
-    def _calculate_hydraulic_efficiency(self, params: Dict, validation: Dict) -> float:
+    def _calculate_hydraulic_efficiency(self, params: Dict[str, float], validation: ValidationSummary) -> float:
         """Calculate hydraulic efficiency"""
         # Based on flow rate and pressure predictions
-        if validation.get("hydraulics_ok", True):
+        if validation.hydraulics_ok:
             return 0.8
         else:
             return 0.4
@@ -493,14 +669,27 @@ class KPICalculator:
             return 0.2  # Low risk
 
 
+@lru_cache(maxsize=8)
+def _shared_calculator(graph_client=None, historical_client=None) -> KPICalculator:
+    """One long-lived calculator per client pair, so its caches survive between calls"""
+    return KPICalculator(graph_client, historical_client)
+
+
+def clear_kpi_cache() -> None:
+    """Drop the shared calculators and their cached results - call after the graph data behind them changes"""
+    _shared_calculator.cache_clear()
+
+
 # Example usage and integration with the existing system
 def enhanced_compute_kpis(plan_text: str, validation: Dict, well_id: str = None, 
                          graph_client=None, historical_client=None) -> Dict[str, float]:
     """
     Enhanced KPI computation function that replaces the original simple version
+    
+    Calls with the same clients share one calculator and therefore its result
+    and well-context caches.
     """
-    calculator = KPICalculator(graph_client, historical_client)
-    return calculator.compute_kpis(plan_text, validation, well_id)
+    return _shared_calculator(graph_client, historical_client).compute_kpis(plan_text, validation, well_id)
 
 
 # For backward compatibility, maintain the original function signature
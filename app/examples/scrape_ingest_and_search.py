@@ -1,30 +1,79 @@
 import os, argparse, requests, tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup as BS
-from app.vector.astra_doc_ingest import main as ingest_main
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.vector.astra_doc_ingest import ingest_files
 from app.graph.graph_rag import retrieve_subgraph_context
 
 load_dotenv()
 
+_SCRAPE_WORKERS = 8
+# Keep-alive session shared by all scrapes - one TLS handshake per host, transient failures back off
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16, pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=["GET"])
+))
+
+class _TextSink:
+    """lxml parser target: writes page text straight to a file, skipping script/style."""
+    _SKIP = {"script", "style"}
+
+    def __init__(self, out):
+        self.out, self.skipping = out, 0
+
+    def start(self, tag, attrib):
+        if tag in self._SKIP:
+            self.skipping += 1
+        self.out.write(" ")
+
+    def end(self, tag):
+        if tag in self._SKIP:
+            self.skipping -= 1
+        self.out.write(" ")
+
+    def data(self, text):
+        # Text may arrive split at feed-chunk boundaries - separators go at tags only
+        if not self.skipping:
+            self.out.write(text)
+
+    def close(self):
+        pass
+
 def scrape_to_tempfile(url: str) -> str:
-    r = requests.get(url, timeout=60)
-    r.raise_for_status()
-    html = r.text
-    text = BS(html, "html.parser").get_text(" ")
-    fd, path = tempfile.mkstemp(suffix=".txt", prefix="scrape_")
-    with os.fdopen(fd, "w") as f:
-        f.write(text)
+    # Streamed through lxml's C parser chunk by chunk - no full page or tree held in memory
+    with _SESSION.get(url, stream=True, timeout=60) as r:
+        r.raise_for_status()
+        # Decode with the Content-Type charset when the server sends one (as r.text did);
+        # otherwise lxml detects it from the page's meta charset
+        has_charset = "charset" in r.headers.get("Content-Type", "").lower()
+        fd, path = tempfile.mkstemp(suffix=".txt", prefix="scrape_")
+        try:
+            with os.fdopen(fd, "w") as f:
+                parser = etree.HTMLParser(target=_TextSink(f), encoding=r.encoding if has_charset else None)
+                for chunk in r.iter_content(65536):
+                    parser.feed(chunk)
+                parser.close()
+        except BaseException:
+            os.unlink(path)
+            raise
     return path
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--url", default="https://opendata-nstauthority.hub.arcgis.com/pages/well-data")
+    ap.add_argument("--url", nargs="+", default=["https://opendata-nstauthority.hub.arcgis.com/pages/well-data"])
     ap.add_argument("--well_id", default="W-1001")
     ap.add_argument("--objectives", default="Minimize cost and vibration")
     args = ap.parse_args()
 
-    local_txt = scrape_to_tempfile(args.url)
-    os.system(f"python -m app.vector.astra_doc_ingest --files {local_txt} --source_tag scraped" )
+    # Downloads are I/O bound - overlap them
+    with ThreadPoolExecutor(max_workers=_SCRAPE_WORKERS) as pool:
+        local_txts = list(pool.map(scrape_to_tempfile, args.url))
+    # In-process ingest - no second interpreter start or Astra client handshake
+    ingest_files(local_txts, source_tag="scraped")
 
     ctx = retrieve_subgraph_context(args.well_id, args.objectives)
     print("=== FORMATIONS ===")
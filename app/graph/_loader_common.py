@@ -0,0 +1,68 @@
+"""Helpers shared by the sample-data graph loaders (api_fallback_loader, fixed_load_sample_data)."""
+import os
+from typing import Any, Callable, Dict, List
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Opt-in: batched writes run through apoc.periodic.iterate (needs the APOC plugin)
+USE_APOC = os.getenv("NEO4J_USE_APOC", "false").lower() in ("true", "1", "yes")
+
+# Stored type of each numeric BHA property
+BHA_NUMERIC_FIELDS: Dict[str, Callable[[Any], Any]] = {
+    "size_inches": float,
+    "max_wob_klbs": float,
+    "max_rpm": int,
+    "max_torque_ftlbs": int,
+    "flow_rate_gpm_min": int,
+    "flow_rate_gpm_max": int,
+    "cost_usd": int,
+    "rental_day_rate": int,
+    "max_temperature_f": int,
+    "max_pressure_psi": int,
+    "bend_degrees": float
+}
+
+
+def coerce_fields(row: Dict[str, Any], field_types: Dict[str, Callable[[Any], Any]]) -> Dict[str, Any]:
+    """Cast a row's listed fields to their stored types, keeping None as null."""
+    return {
+        key: field_types[key](value) if value is not None and key in field_types else value
+        for key, value in row.items()
+    }
+
+
+def coerce_bha_tool(tool: Dict[str, Any]) -> Dict[str, Any]:
+    """Cast a BHA tool's numeric fields to their stored types."""
+    return coerce_fields(tool, BHA_NUMERIC_FIELDS)
+
+
+APOC_ITERATE_QUERY = """
+CALL apoc.periodic.iterate(
+    "UNWIND $rows AS row RETURN row", $inner,
+    {batchSize: $batch_size, parallel: $parallel, concurrency: 4, params: {rows: $rows}}
+)
+YIELD failedBatches, errorMessages
+RETURN failedBatches, errorMessages
+"""
+
+
+def apoc_iterate(session, inner_query: str, rows: List[Dict[str, Any]], batch_size: int, parallel: bool) -> None:
+    """
+    Run a per-row statement (reading each row as `row`) through apoc.periodic.iterate.
+
+    The server commits every batch_size rows; parallel batches are only safe
+    for node MERGEs on a uniquely constrained key. Runs auto-commit, since the
+    procedure manages its own batch transactions.
+
+    Raises:
+        RuntimeError: If any batch failed
+    """
+    record = session.run(APOC_ITERATE_QUERY, {
+        "inner": inner_query,
+        "rows": rows,
+        "batch_size": batch_size,
+        "parallel": parallel
+    }).single()
+    if record["failedBatches"]:
+        raise RuntimeError(f"❌ apoc.periodic.iterate failed {record['failedBatches']} batches: {record['errorMessages']}")
@@ -18,13 +18,17 @@ Version: 3.2.0 - Enhanced Sample Data Edition
 import os
 import sys
 import csv
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 import json
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from datetime import datetime
 from neo4j import GraphDatabase
+from neo4j.exceptions import AuthError
 from dotenv import load_dotenv
+from app.graph._loader_common import USE_APOC, apoc_iterate, coerce_bha_tool, coerce_fields
 
 # Configure logging
 logging.basicConfig(
@@ -40,28 +44,79 @@ URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 USER = os.getenv("NEO4J_USERNAME", "neo4j") 
 PWD = os.getenv("NEO4J_PASSWORD")
 
+# With NEO4J_USE_APOC, UNWIND loads larger than one batch run through apoc.periodic.iterate
+_APOC_BATCH_SIZE = 500
+
 if not PWD:
     raise EnvironmentError("NEO4J_PASSWORD environment variable is required")
 
-def get_neo4j_session():
-    """Create Neo4j session with robust error handling."""
-    driver = GraphDatabase.driver(URI, auth=(USER, PWD))
-    try:
-        driver.verify_connectivity()
+_DRIVER = None
+
+def get_driver():
+    """
+    Get the shared Neo4j driver, created and verified on first use.
+    
+    Every loader's session comes from this driver's connection pool, so the
+    Bolt handshake is paid once per run instead of once per loader.
+    
+    Raises:
+        ConnectionError: If Neo4j cannot be reached
+        neo4j.exceptions.AuthError: If Neo4j rejects the credentials
+    """
+    global _DRIVER
+    if _DRIVER is None:
+        driver = GraphDatabase.driver(URI, auth=(USER, PWD), max_connection_pool_size=16)
+        try:
+            driver.verify_connectivity()
+        except AuthError:
+            # Bad credentials are not a connectivity problem - surface them as-is
+            driver.close()
+            raise
+        except Exception as e:
+            driver.close()
+            raise ConnectionError(f"❌ Failed to connect to Neo4j: {e}") from e
         logger.info(f"✅ Connected to Neo4j at {URI}")
-        return driver.session()
-    except Exception as e:
-        driver.close()
-        raise ConnectionError(f"❌ Failed to connect to Neo4j: {e}")
+        _DRIVER = driver
+    return _DRIVER
+
+def close_driver():
+    """Close the shared driver, if one was created."""
+    global _DRIVER
+    if _DRIVER is not None:
+        _DRIVER.close()
+        _DRIVER = None
 
-def run_cypher(session, query: str, parameters: Dict = None):
-    """Execute Cypher query with comprehensive error handling."""
+atexit.register(close_driver)
+
+# Shared by every loader session: each one waits for the writes of those that
+# committed before it, so later steps see earlier loads even on a cluster
+_BOOKMARKS = GraphDatabase.bookmark_manager()
+
+def get_neo4j_session():
+    """Open a causally chained session on the shared driver."""
+    return get_driver().session(bookmark_manager=_BOOKMARKS)
+
+def _run_query(tx, query: str, parameters: Optional[Dict], want_summary: bool):
+    result = tx.run(query, parameters or {})
+    # Without a summary the commit discards any remaining records itself
+    return result.consume() if want_summary else None
+
+def run_cypher(session, query: str, parameters: Dict = None, *, want_summary: bool = False):
+    """
+    Execute Cypher query with comprehensive error handling.
+    
+    Runs as a managed write transaction rather than auto-commit, so transient
+    errors (leader switch, deadlock) are retried by the driver.
+    
+    Args:
+        want_summary: Return the ResultSummary; by default nothing is returned
+            and no summary object is built
+    """
     try:
-        if parameters:
-            result = session.run(query, parameters)
-        else:
-            result = session.run(query)
-        return result.consume()
+        if _needs_apoc(parameters):
+            _run_periodic(session, query, parameters["rows"])
+            return None
+        return session.execute_write(_run_query, query, parameters, want_summary)
     except Exception as e:
         logger.error(f"❌ Cypher query failed: {e}")
         logger.error(f"Query: {query[:200]}...")
@@ -69,6 +124,146 @@ def run_cypher(session, query: str, parameters: Dict = None):
             logger.error(f"Parameters: {list(parameters.keys())}")
         raise
 
+def _run_statements(tx, statements: List[Tuple[str, Optional[Dict]]]):
+    for query, parameters in statements:
+        tx.run(query, parameters or {})
+
+def run_cypher_batch(session, statements: List[Tuple[str, Optional[Dict]]]):
+    """Execute several Cypher statements in one managed write transaction - a single commit."""
+    if any(_needs_apoc(parameters) for _, parameters in statements):
+        # Large loads commit batch by batch server-side, so they cannot share one
+        # transaction - run the statements in order, each on its own
+        for query, parameters in statements:
+            run_cypher(session, query, parameters)
+        return
+    try:
+        session.execute_write(_run_statements, statements)
+    except Exception as e:
+        logger.error(f"❌ Cypher transaction failed: {e}")
+        logger.error(f"Queries: {[query[:80] for query, _ in statements]}")
+        raise
+
+def _needs_apoc(parameters: Optional[Dict]) -> bool:
+    return USE_APOC and bool(parameters) and len(parameters.get("rows", ())) > _APOC_BATCH_SIZE
+
+def _run_periodic(session, query: str, rows: List[Dict[str, Any]]):
+    """
+    Run an `UNWIND $rows AS row ...` query through apoc.periodic.iterate.
+    
+    The server commits every _APOC_BATCH_SIZE rows instead of holding one
+    transaction's locks for the whole load. Batches run in parallel only for
+    node MERGEs on distinct keys (_PARALLEL_SAFE_QUERIES); anything touching
+    shared nodes stays serial to avoid lock contention.
+    """
+    head, marker, inner = query.partition("UNWIND $rows AS row")
+    if not marker or head.strip():
+        raise ValueError(f"apoc.periodic.iterate needs a query starting with 'UNWIND $rows AS row', got: {query[:80]}")
+    apoc_iterate(session, inner, rows, _APOC_BATCH_SIZE, parallel=query in _PARALLEL_SAFE_QUERIES)
+
+# Sample datasets live beside this module as JSON - read only when their loader runs
+_DATA_DIR = Path(__file__).parent / "data"
+
+# Stored type of each numeric property per dataset - the types the original queries
+# cast to with toInteger/toFloat. The queries now SET rows as sent, so _validate types
+# them client-side; BHA tools are coerced by coerce_bha_tool instead.
+_NUMERIC_FIELDS = {
+    "wells": {"total_depth": int, "measured_depth": int, "latitude": float, "longitude": float,
+              "drill_year": int},
+    "formations": {"age_ma": float, "depth_start": int, "depth_end": int, "porosity_avg": float,
+                   "permeability_md": float, "rock_strength_psi": int, "pore_pressure_gradient": float,
+                   "temperature_f": int, "typical_mud_weight": float},
+    "constraints": {"limit_value": float},
+    "historical_plans": {"total_depth": int, "drilling_days": int, "final_kpi_score": float}
+}
+
+def _validate(name: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check a dataset row's numeric fields and cast them to their stored types.
+    
+    Returns:
+        The row with numeric fields typed (nulls are kept)
+    
+    Raises:
+        ValueError: If a numeric field holds anything but an int/float or null
+    """
+    field_types = _NUMERIC_FIELDS.get(name, {})
+    for field in field_types:
+        value = row.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"{name}.json: {field} must be numeric, got {value!r}")
+    return coerce_fields(row, field_types)
+
+def _load_dataset(name: str) -> List[Dict[str, Any]]:
+    """Load one sample dataset (wells, formations, bha_tools, constraints, historical_plans)."""
+    with open(_DATA_DIR / f"{name}.json", encoding="utf-8") as f:
+        rows = json.load(f)
+    return [_validate(name, row) for row in rows]
+
+# Loader queries - fixed text per statement, so the server plans each once and reuses it.
+# Every MERGE is one UNWIND over rows that already carry final property names and types.
+_WELL_MERGE_QUERY = """
+UNWIND $rows AS row
+MERGE (w:Well {well_id: row.well_id})
+SET w += row,
+    w.data_source = "Enhanced_Sample_Data",
+    w.created_timestamp = datetime()
+"""
+
+_FORMATION_MERGE_QUERY = """
+UNWIND $rows AS row
+MERGE (f:Formation {name: row.name, basin: row.basin})
+SET f += row,
+    f.data_source = "Geological_Surveys",
+    f.created_timestamp = datetime()
+"""
+
+# Create relationships with wells - one server-side pass over the wells, no per-formation round trips
+_DRILLED_THROUGH_QUERY = """
+MATCH (w:Well) WHERE w.primary_formation IS NOT NULL
+MATCH (f:Formation {name: w.primary_formation})
+MERGE (w)-[:DRILLED_THROUGH]->(f)
+"""
+
+_BHA_MERGE_QUERY = """
+UNWIND $rows AS row
+MERGE (b:BHATool {part_number: row.part_number})
+SET b += row,
+    b.data_source = "Manufacturer_Specifications",
+    b.created_timestamp = datetime()
+"""
+
+# applies_to_tools drives HAS_CONSTRAINT and is not stored on the node
+_CONSTRAINT_MERGE_QUERY = """
+UNWIND $rows AS row
+MERGE (c:EngineeringConstraint {constraint_id: row.constraint_id})
+SET c += row {.constraint_type, .limit_value, .unit, .description},
+    c.data_source = "Industry_Standards",
+    c.created_timestamp = datetime()
+"""
+
+# Both MATCHes are unique-constraint index seeks
+_HAS_CONSTRAINT_QUERY = """
+UNWIND $pairs AS p
+MATCH (b:BHATool {part_number: p.tool})
+MATCH (c:EngineeringConstraint {constraint_id: p.cid})
+MERGE (b)-[:HAS_CONSTRAINT]->(c)
+"""
+
+_PLAN_MERGE_QUERY = """
+UNWIND $rows AS row
+MERGE (hp:HistoricalPlan {plan_id: row.plan_id})
+SET hp += row {.plan_name, .total_depth, .drilling_days, .final_kpi_score, .lessons_learned},
+    hp.data_source = "Historical_Records",
+    hp.created_timestamp = datetime()
+WITH hp, row
+MATCH (w:Well {well_id: row.well_id})
+MERGE (w)-[:HAS_PLAN]->(hp)
+"""
+
+# Node-only MERGEs backed by a uniqueness constraint - safe for parallel APOC batches.
+# Formation has no constraint on (name, basin), so parallel batches could duplicate it.
+_PARALLEL_SAFE_QUERIES = frozenset({_WELL_MERGE_QUERY, _BHA_MERGE_QUERY, _CONSTRAINT_MERGE_QUERY})
+
 def create_neo4j_schema():
     """Create production Neo4j schema with constraints and indexes."""
     logger.info("🏗️  Creating production Neo4j schema...")
@@ -88,398 +283,79 @@ def create_neo4j_schema():
             "CREATE INDEX constraint_type IF NOT EXISTS FOR (c:EngineeringConstraint) ON (c.constraint_type)"
         ]
         
-        for constraint in constraints:
-            run_cypher(session, constraint)
-            
-        for index in indexes:
-            run_cypher(session, index)
+        # All DDL in one transaction - IF NOT EXISTS keeps re-runs idempotent
+        run_cypher_batch(session, [(statement, None) for statement in constraints + indexes])
 
 def load_enhanced_sample_wells():
     """Load enhanced sample wells from CSV files with additional realistic data."""
     logger.info("🏗️  Loading enhanced sample well data...")
     
     # Enhanced sample wells with realistic data
-    sample_wells = [
-        {
-            "well_id": "PERM_001",
-            "api_number": "42-135-12345",
-            "well_name": "Wolfcamp Demo 1H",
-            "operator": "Demo Energy LLC",
-            "location": "Midland County, Texas",
-            "trajectory_type": "Horizontal",
-            "well_status": "Completed",
-            "total_depth": 12500,
-            "measured_depth": 15800,
-            "latitude": 31.8457,
-            "longitude": -102.0854,
-            "primary_formation": "Wolfcamp_Shale",
-            "drill_year": 2023,
-            "country": "USA",
-            "state": "Texas",
-            "basin": "Permian_Basin"
-        },
-        {
-            "well_id": "EAGLE_002",
-            "api_number": "42-137-67890",
-            "well_name": "Eagle Ford Test 2H",
-            "operator": "South Texas Drilling Inc",
-            "location": "Karnes County, Texas",
-            "trajectory_type": "Horizontal",
-            "well_status": "Producing",
-            "total_depth": 11200,
-            "measured_depth": 14500,
-            "latitude": 28.9234,
-            "longitude": -97.7845,
-            "primary_formation": "Eagle_Ford_Shale",
-            "drill_year": 2022,
-            "country": "USA",
-            "state": "Texas",
-            "basin": "East_Texas"
-        },
-        {
-            "well_id": "BAKKEN_003",
-            "api_number": "33-053-11111",
-            "well_name": "Bakken Development 3H",
-            "operator": "North Dakota Energy Corp",
-            "location": "McKenzie County, North Dakota",
-            "trajectory_type": "Horizontal",
-            "well_status": "Drilling",
-            "total_depth": 10800,
-            "measured_depth": 13200,
-            "latitude": 47.8912,
-            "longitude": -103.4567,
-            "primary_formation": "Bakken_Formation",
-            "drill_year": 2024,
-            "country": "USA",
-            "state": "North Dakota",
-            "basin": "Williston_Basin"
-        },
-        {
-            "well_id": "NORTH_SEA_004",
-            "api_number": "NO-15/12-A-5H",
-            "well_name": "North Sea Chalk Demo",
-            "operator": "Norwegian Demo AS",
-            "location": "Norwegian North Sea",
-            "trajectory_type": "Horizontal",
-            "well_status": "Planning",
-            "total_depth": 11500,
-            "measured_depth": 13800,
-            "latitude": 58.7234,
-            "longitude": 2.1456,
-            "primary_formation": "North_Sea_Chalk",
-            "drill_year": 2024,
-            "country": "Norway",
-            "state": None,
-            "basin": "North_Sea"
-        }
-    ]
+    sample_wells = _load_dataset("wells")
     
     with get_neo4j_session() as session:
-        for well in sample_wells:
-            query = """
-            MERGE (w:Well {well_id: $well_id})
-            SET w.api_number = $api_number,
-                w.well_name = $well_name,
-                w.operator = $operator,
-                w.location = $location,
-                w.trajectory_type = $trajectory_type,
-                w.well_status = $well_status,
-                w.total_depth = toInteger($total_depth),
-                w.measured_depth = toInteger($measured_depth),
-                w.latitude = toFloat($latitude),
-                w.longitude = toFloat($longitude),
-                w.primary_formation = $primary_formation,
-                w.drill_year = toInteger($drill_year),
-                w.country = $country,
-                w.state = $state,
-                w.basin = $basin,
-                w.data_source = "Enhanced_Sample_Data",
-                w.created_timestamp = datetime()
-            """
-            
-            run_cypher(session, query, well)
+        run_cypher(session, _WELL_MERGE_QUERY, {"rows": sample_wells})
     
     logger.info(f"✅ Loaded {len(sample_wells)} enhanced sample wells")
     return len(sample_wells)
 
-def load_formation_data():
-    """Load formation data with well relationships."""
+def load_formation_data(link_wells: bool = True):
+    """
+    Load formation data with well relationships.
+    
+    Args:
+        link_wells: Also create the Well -> Formation relationships; pass False
+            when wells are loaded concurrently and link_formations_to_wells()
+            runs afterwards
+    
+    Returns:
+        Names of the loaded formations
+    """
     logger.info("🏔️  Loading formation data with relationships...")
     
     # Real geological formations
-    formations = [
-        {
-            "name": "Wolfcamp_Shale",
-            "basin": "Permian_Basin",
-            "geological_age": "Pennsylvanian",
-            "age_ma": 300.0,
-            "depth_start": 8000,
-            "depth_end": 14000,
-            "rock_type": "Organic_Rich_Shale",
-            "porosity_avg": 8.5,
-            "permeability_md": 0.0002,
-            "rock_strength_psi": 8500,
-            "pore_pressure_gradient": 0.52,
-            "temperature_f": 280,
-            "drilling_challenges": "High clay content, swelling formations, wellbore instability",
-            "typical_mud_weight": 11.2,
-            "h2s_risk": "Moderate",
-            "co2_risk": "Low"
-        },
-        {
-            "name": "Eagle_Ford_Shale",
-            "basin": "East_Texas",
-            "geological_age": "Cretaceous",
-            "age_ma": 95.0,
-            "depth_start": 4000,
-            "depth_end": 14000,
-            "rock_type": "Calcareous_Shale",
-            "porosity_avg": 12.0,
-            "permeability_md": 0.0005,
-            "rock_strength_psi": 7200,
-            "pore_pressure_gradient": 0.48,
-            "temperature_f": 250,
-            "drilling_challenges": "Natural fractures, lost circulation zones",
-            "typical_mud_weight": 10.8,
-            "h2s_risk": "High",
-            "co2_risk": "Moderate"
-        },
-        {
-            "name": "Bakken_Formation",
-            "basin": "Williston_Basin",
-            "geological_age": "Devonian",
-            "age_ma": 360.0,
-            "depth_start": 8500,
-            "depth_end": 11500,
-            "rock_type": "Tight_Sandstone_Shale",
-            "porosity_avg": 6.8,
-            "permeability_md": 0.00008,
-            "rock_strength_psi": 9800,
-            "pore_pressure_gradient": 0.45,
-            "temperature_f": 240,
-            "drilling_challenges": "Extremely low permeability, high clay content",
-            "typical_mud_weight": 9.8,
-            "h2s_risk": "Low",
-            "co2_risk": "Low"
-        },
-        {
-            "name": "North_Sea_Chalk",
-            "basin": "North_Sea",
-            "geological_age": "Cretaceous",
-            "age_ma": 85.0,
-            "depth_start": 6000,
-            "depth_end": 12000,
-            "rock_type": "Chalk",
-            "porosity_avg": 35.0,
-            "permeability_md": 2.5,
-            "rock_strength_psi": 3200,
-            "pore_pressure_gradient": 0.68,
-            "temperature_f": 320,
-            "drilling_challenges": "High pressure, wellbore collapse, lost circulation",
-            "typical_mud_weight": 16.8,
-            "h2s_risk": "High",
-            "co2_risk": "High"
-        }
-    ]
+    formations = _load_dataset("formations")
+    
+    statements = [(_FORMATION_MERGE_QUERY, {"rows": formations})]
+    if link_wells:
+        statements.append((_DRILLED_THROUGH_QUERY, None))
     
     with get_neo4j_session() as session:
-        for formation in formations:
-            # Create formation
-            form_query = """
-            MERGE (f:Formation {name: $name, basin: $basin})
-            SET f.geological_age = $geological_age,
-                f.age_ma = toFloat($age_ma),
-                f.depth_start = toInteger($depth_start),
-                f.depth_end = toInteger($depth_end),
-                f.rock_type = $rock_type,
-                f.porosity_avg = toFloat($porosity_avg),
-                f.permeability_md = toFloat($permeability_md),
-                f.rock_strength_psi = toInteger($rock_strength_psi),
-                f.pore_pressure_gradient = toFloat($pore_pressure_gradient),
-                f.temperature_f = toInteger($temperature_f),
-                f.drilling_challenges = $drilling_challenges,
-                f.typical_mud_weight = toFloat($typical_mud_weight),
-                f.h2s_risk = $h2s_risk,
-                f.co2_risk = $co2_risk,
-                f.data_source = "Geological_Surveys",
-                f.created_timestamp = datetime()
-            """
-            
-            run_cypher(session, form_query, formation)
-            
-            # Create relationships with wells
-            rel_query = """
-            MATCH (f:Formation {name: $name})
-            MATCH (w:Well {primary_formation: $name})
-            MERGE (w)-[:DRILLED_THROUGH]->(f)
-            """
-            
-            run_cypher(session, rel_query, {"name": formation["name"]})
+        run_cypher_batch(session, statements)
     
-    logger.info(f"✅ Loaded {len(formations)} formations with well relationships")
+    logger.info(f"✅ Loaded {len(formations)} formations" + (" with well relationships" if link_wells else ""))
+    return [formation["name"] for formation in formations]
+
+def link_formations_to_wells():
+    """Create Well -> Formation relationships once both node sets are loaded."""
+    with get_neo4j_session() as session:
+        run_cypher(session, _DRILLED_THROUGH_QUERY)
+    logger.info("✅ Linked wells to their primary formations")
 
 def load_bha_catalog_with_constraints():
     """Load BHA catalog and create constraint relationships."""
     logger.info("🔧 Loading BHA catalog with constraint relationships...")
     
     # Enhanced BHA tools with all required parameters
-    bha_tools = [
-        {
-            "part_number": "BH-PDC-8.5-KY417",
-            "tool_type": "PDC_Bit", 
-            "manufacturer": "Baker Hughes",
-            "size_inches": 8.5,
-            "iadc_code": "M323",
-            "application": "Medium-hard formations",
-            "max_wob_klbs": 45,
-            "max_rpm": 180,
-            "max_torque_ftlbs": 8000,
-            "flow_rate_gpm_min": 350,
-            "flow_rate_gpm_max": 800,
-            "cost_usd": 85000,
-            "rental_day_rate": 1200,
-            "specifications": "5-blade PDC with backup cutters, gauge protection",
-            "measurements": None,
-            "transmission": None,
-            "max_temperature_f": None,
-            "max_pressure_psi": None,
-            "bend_degrees": None
-        },
-        {
-            "part_number": "SLB-MWD-675-RT",
-            "tool_type": "MWD",
-            "manufacturer": "Schlumberger",
-            "size_inches": 6.75,
-            "iadc_code": None,
-            "application": "Real-time measurement while drilling",
-            "max_wob_klbs": None,
-            "max_rpm": None,
-            "max_torque_ftlbs": None,
-            "flow_rate_gpm_min": None,
-            "flow_rate_gpm_max": None,
-            "cost_usd": 285000,
-            "rental_day_rate": 8500,
-            "specifications": "Real-time directional guidance, formation evaluation",
-            "measurements": "gamma_ray,resistivity,inclination,azimuth",
-            "transmission": "mud_pulse",
-            "max_temperature_f": 300,
-            "max_pressure_psi": 25000,
-            "bend_degrees": None
-        },
-        {
-            "part_number": "BH-PWD-675-75",
-            "tool_type": "Positive_Displacement_Motor",
-            "manufacturer": "Baker Hughes",
-            "size_inches": 6.75,
-            "iadc_code": None,
-            "application": "Directional drilling",
-            "max_wob_klbs": None,
-            "max_rpm": 150,
-            "max_torque_ftlbs": 7500,
-            "flow_rate_gpm_min": 300,
-            "flow_rate_gpm_max": 600,
-            "cost_usd": 125000,
-            "rental_day_rate": 3500,
-            "specifications": "5:6 lobe ratio, bent housing, high-temp seals",
-            "measurements": None,
-            "transmission": None,
-            "max_temperature_f": 300,
-            "max_pressure_psi": 15000,
-            "bend_degrees": 1.5
-        }
-    ]
+    bha_tools = _load_dataset("bha_tools")
     
     # Industry constraints
-    constraints = [
-        {
-            "constraint_id": "API_MAX_PRESSURE_5000",
-            "constraint_type": "pressure",
-            "limit_value": 5000.0,
-            "unit": "psi",
-            "description": "API maximum allowable wellbore pressure for surface equipment",
-            "applies_to_tools": ["BH-PDC-8.5-KY417"]
-        },
-        {
-            "constraint_id": "IADC_MAX_RPM_200",
-            "constraint_type": "rotation",
-            "limit_value": 200.0,
-            "unit": "rpm",
-            "description": "IADC recommended maximum rotary speed for PDC bits",
-            "applies_to_tools": ["BH-PDC-8.5-KY417"]
-        },
-        {
-            "constraint_id": "OEM_MAX_TORQUE_8000",
-            "constraint_type": "torque",
-            "limit_value": 8000.0,
-            "unit": "ft-lbs",
-            "description": "Manufacturer maximum torque rating for BHA components",
-            "applies_to_tools": ["BH-PDC-8.5-KY417", "BH-PWD-675-75"]
-        },
-        {
-            "constraint_id": "MWD_TEMP_LIMIT",
-            "constraint_type": "temperature",
-            "limit_value": 300.0,
-            "unit": "fahrenheit",
-            "description": "MWD system maximum operating temperature",
-            "applies_to_tools": ["SLB-MWD-675-RT"]
-        }
+    constraints = _load_dataset("constraints")
+    
+    # Tool -> constraint pairs for one UNWIND
+    pairs = [
+        {"tool": tool_part, "cid": constraint["constraint_id"]}
+        for constraint in constraints for tool_part in constraint["applies_to_tools"]
     ]
     
     with get_neo4j_session() as session:
-        # Load BHA tools
-        for tool in bha_tools:
-            tool_query = """
-            MERGE (b:BHATool {part_number: $part_number})
-            SET b.tool_type = $tool_type,
-                b.manufacturer = $manufacturer,
-                b.size_inches = toFloat($size_inches),
-                b.iadc_code = $iadc_code,
-                b.application = $application,
-                b.max_wob_klbs = CASE WHEN $max_wob_klbs IS NOT NULL THEN toFloat($max_wob_klbs) ELSE null END,
-                b.max_rpm = CASE WHEN $max_rpm IS NOT NULL THEN toInteger($max_rpm) ELSE null END,
-                b.max_torque_ftlbs = CASE WHEN $max_torque_ftlbs IS NOT NULL THEN toInteger($max_torque_ftlbs) ELSE null END,
-                b.flow_rate_gpm_min = CASE WHEN $flow_rate_gpm_min IS NOT NULL THEN toInteger($flow_rate_gpm_min) ELSE null END,
-                b.flow_rate_gpm_max = CASE WHEN $flow_rate_gpm_max IS NOT NULL THEN toInteger($flow_rate_gpm_max) ELSE null END,
-                b.cost_usd = CASE WHEN $cost_usd IS NOT NULL THEN toInteger($cost_usd) ELSE null END,
-                b.rental_day_rate = CASE WHEN $rental_day_rate IS NOT NULL THEN toInteger($rental_day_rate) ELSE null END,
-                b.specifications = $specifications,
-                b.measurements = $measurements,
-                b.transmission = $transmission,
-                b.max_temperature_f = CASE WHEN $max_temperature_f IS NOT NULL THEN toInteger($max_temperature_f) ELSE null END,
-                b.max_pressure_psi = CASE WHEN $max_pressure_psi IS NOT NULL THEN toInteger($max_pressure_psi) ELSE null END,
-                b.bend_degrees = CASE WHEN $bend_degrees IS NOT NULL THEN toFloat($bend_degrees) ELSE null END,
-                b.data_source = "Manufacturer_Specifications",
-                b.created_timestamp = datetime()
-            """
-            
-            run_cypher(session, tool_query, tool)
-        
-        # Load constraints
-        for constraint in constraints:
-            const_query = """
-            MERGE (c:EngineeringConstraint {constraint_id: $constraint_id})
-            SET c.constraint_type = $constraint_type,
-                c.limit_value = toFloat($limit_value),
-                c.unit = $unit,
-                c.description = $description,
-                c.data_source = "Industry_Standards",
-                c.created_timestamp = datetime()
-            """
-            
-            run_cypher(session, const_query, constraint)
-            
-            # Create relationships between tools and constraints
-            for tool_part in constraint["applies_to_tools"]:
-                rel_query = """
-                MATCH (b:BHATool {part_number: $tool_part})
-                MATCH (c:EngineeringConstraint {constraint_id: $constraint_id})
-                MERGE (b)-[:HAS_CONSTRAINT]->(c)
-                """
-                
-                run_cypher(session, rel_query, {
-                    "tool_part": tool_part,
-                    "constraint_id": constraint["constraint_id"]
-                })
+        # Tools, constraints and their relationships commit together in one transaction;
+        # numeric tool fields are typed client-side instead of CASE/toFloat per row
+        run_cypher_batch(session, [
+            (_BHA_MERGE_QUERY, {"rows": [coerce_bha_tool(tool) for tool in bha_tools]}),
+            (_CONSTRAINT_MERGE_QUERY, {"rows": constraints}),
+            (_HAS_CONSTRAINT_QUERY, {"pairs": pairs}),
+        ])
     
     logger.info(f"✅ Loaded {len(bha_tools)} BHA tools and {len(constraints)} constraints with relationships")
 
@@ -487,45 +363,10 @@ def create_historical_plans():
     """Create historical drilling plans with relationships."""
     logger.info("📄 Creating historical drilling plans...")
     
-    historical_plans = [
-        {
-            "plan_id": "PERM_PLAN_001",
-            "well_id": "PERM_001",
-            "plan_name": "Wolfcamp Horizontal Development",
-            "total_depth": 12500,
-            "drilling_days": 28,
-            "final_kpi_score": 0.82,
-            "lessons_learned": "Optimized ROP with balanced mud system. Key success: maintaining hole stability in shale sections."
-        },
-        {
-            "plan_id": "EF_PLAN_001",
-            "well_id": "EAGLE_002",
-            "plan_name": "Eagle Ford Completion Plan",
-            "total_depth": 11200,
-            "drilling_days": 32,
-            "final_kpi_score": 0.75,
-            "lessons_learned": "Managed lost circulation zones effectively. Natural fractures required careful pressure management."
-        }
-    ]
+    historical_plans = _load_dataset("historical_plans")
     
     with get_neo4j_session() as session:
-        for plan in historical_plans:
-            plan_query = """
-            MERGE (hp:HistoricalPlan {plan_id: $plan_id})
-            SET hp.plan_name = $plan_name,
-                hp.total_depth = toInteger($total_depth),
-                hp.drilling_days = toInteger($drilling_days),
-                hp.final_kpi_score = toFloat($final_kpi_score),
-                hp.lessons_learned = $lessons_learned,
-                hp.data_source = "Historical_Records",
-                hp.created_timestamp = datetime()
-                
-            WITH hp
-            MATCH (w:Well {well_id: $well_id})
-            MERGE (w)-[:HAS_PLAN]->(hp)
-            """
-            
-            run_cypher(session, plan_query, plan)
+        run_cypher(session, _PLAN_MERGE_QUERY, {"rows": historical_plans})
     
     logger.info(f"✅ Created {len(historical_plans)} historical plans with well relationships")
 
@@ -537,16 +378,18 @@ def main():
         # Step 1: Create schema
         create_neo4j_schema()
         
-        # Step 2: Load enhanced sample wells
-        wells_loaded = load_enhanced_sample_wells()
-        
-        # Step 3: Load formations with relationships
-        load_formation_data()
-        
-        # Step 4: Load BHA catalog with constraints
-        load_bha_catalog_with_constraints()
+        # Step 2: Wells, formations and the BHA catalog have no write dependencies -
+        # load them concurrently, each worker on its own session from the shared pool
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            wells_future = pool.submit(load_enhanced_sample_wells)
+            formations_future = pool.submit(load_formation_data, link_wells=False)
+            bha_future = pool.submit(load_bha_catalog_with_constraints)
+            wells_loaded = wells_future.result()
+            formations_future.result()
+            bha_future.result()
         
-        # Step 5: Create historical plans
+        # Step 3: Relationships that need wells in place
+        link_formations_to_wells()
         create_historical_plans()
         
         # Summary
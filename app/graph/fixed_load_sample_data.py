@@ -27,6 +27,7 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
+from app.graph._loader_common import USE_APOC, apoc_iterate, coerce_bha_tool
 
 # Configure logging
 logging.basicConfig(
@@ -71,6 +72,73 @@ def run_cypher(session, query: str, parameters: Dict = None):
             logger.error(f"Parameters: {list(parameters.keys())}")
         raise
 
+def _to_float(value: Any) -> Optional[float]:
+    """Python counterpart of Cypher toFloat: None or unparseable values become None."""
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def _to_int(value: Any) -> Optional[int]:
+    """Python counterpart of Cypher toInteger (truncates): None or unparseable values become None."""
+    number = _to_float(value)
+    return int(number) if number is not None else None
+
+# Per-row loader statements for run_batched - rows arrive with final property
+# names and types, so one execution plan serves the whole load
+_WELL_MERGE = """
+MERGE (w:Well {well_id: row.well_id})
+SET w += row.props,
+    w.created_timestamp = datetime()
+"""
+
+_FORMATION_MERGE = """
+MERGE (f:Formation {name: row.name, basin: row.basin})
+SET f += row,
+    f.data_source = "Geological_Surveys",
+    f.created_timestamp = datetime()
+"""
+
+_BHA_MERGE = """
+MERGE (b:BHATool {part_number: row.part_number})
+SET b += row,
+    b.data_source = "Manufacturer_Specifications",
+    b.created_timestamp = datetime()
+"""
+
+_CONSTRAINT_MERGE = """
+MERGE (c:EngineeringConstraint {constraint_id: row.constraint_id})
+SET c += row,
+    c.data_source = "Industry_Standards",
+    c.created_timestamp = datetime()
+"""
+
+def run_batched(session, inner_query: str, rows: List[Dict[str, Any]], batch_size: int = 1000,
+                parallel: bool = False) -> int:
+    """
+    Write rows with a per-row statement that reads each one as `row`.
+    
+    With NEO4J_USE_APOC the rows go through apoc.periodic.iterate: the server
+    commits every batch_size rows and, with parallel=True, runs batches on
+    several threads - only safe for node MERGEs on a uniquely constrained key.
+    Otherwise each batch_size slice is sent as one UNWIND query.
+    
+    Returns:
+        Number of rows written
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got: {batch_size}")
+    if not rows:
+        return 0
+    
+    if USE_APOC:
+        apoc_iterate(session, inner_query, rows, batch_size, parallel)
+    else:
+        query = "UNWIND $rows AS row" + inner_query
+        for i in range(0, len(rows), batch_size):
+            run_cypher(session, query, {"rows": rows[i:i + batch_size]})
+    return len(rows)
+
 def create_neo4j_schema():
     """Create production Neo4j schema with constraints and indexes."""
     logger.info("🏗️  Creating production Neo4j schema...")
@@ -151,86 +219,57 @@ def load_real_well_data():
     npd_wells = fetch_npd_wellbore_data(100)
     nsta_wells = fetch_nsta_well_data(50)
     
-    wells_loaded = 0
-    
-    with get_neo4j_session() as session:
-        # Process NPD wells (Norway)
-        for well in npd_wells:
-            well_data = {
-                "well_id": f"NPD_{well.get('wellboreName', 'UNKNOWN')}",
+    # Property maps per well, numerics typed here so the Cypher needs no CASE/toFloat
+    npd_rows = [
+        {
+            "well_id": f"NPD_{well.get('wellboreName', 'UNKNOWN')}",
+            "props": {
                 "source": "NPD_Norway",
                 "well_name": well.get('wellboreName'),
                 "operator": well.get('wlbDrillingOperator'),
                 "well_type": well.get('wlbWellType'),
-                "total_depth": well.get('wlbTotalDepth'),
-                "water_depth": well.get('wlbWaterDepth'),
-                "latitude": well.get('wlbBottomHoleLatitude'),
-                "longitude": well.get('wlbBottomHoleLongitude'),
+                "total_depth": _to_float(well.get('wlbTotalDepth')),
+                "water_depth": _to_float(well.get('wlbWaterDepth')),
+                "latitude": _to_float(well.get('wlbBottomHoleLatitude')),
+                "longitude": _to_float(well.get('wlbBottomHoleLongitude')),
                 "entry_date": well.get('wlbEntryDate'),
                 "completion_date": well.get('wlbCompletionDate'),
-                "formation_1": well.get('wlbFormationWithHc1'),
-                "formation_age": well.get('wlbAgeWithHc1')
+                "primary_formation": well.get('wlbFormationWithHc1'),
+                "formation_age": well.get('wlbAgeWithHc1'),
+                "country": "Norway",
+                "data_source": "NPD_FactPages"
             }
-            
-            query = """
-            MERGE (w:Well {well_id: $well_id})
-            SET w.source = $source,
-                w.well_name = $well_name,
-                w.operator = $operator,
-                w.well_type = $well_type,
-                w.total_depth = CASE WHEN $total_depth IS NOT NULL THEN toFloat($total_depth) ELSE null END,
-                w.water_depth = CASE WHEN $water_depth IS NOT NULL THEN toFloat($water_depth) ELSE null END,
-                w.latitude = CASE WHEN $latitude IS NOT NULL THEN toFloat($latitude) ELSE null END,
-                w.longitude = CASE WHEN $longitude IS NOT NULL THEN toFloat($longitude) ELSE null END,
-                w.entry_date = $entry_date,
-                w.completion_date = $completion_date,
-                w.primary_formation = $formation_1,
-                w.formation_age = $formation_age,
-                w.country = "Norway",
-                w.data_source = "NPD_FactPages",
-                w.created_timestamp = datetime()
-            """
-            
-            run_cypher(session, query, well_data)
-            wells_loaded += 1
-            
-        # Process NSTA wells (UK)
-        for feature in nsta_wells:
-            attrs = feature.get("attributes", {})
-            well_data = {
-                "well_id": f"NSTA_{attrs.get('WELL_ID', 'UNKNOWN')}",
+        }
+        for well in npd_wells
+    ]
+    
+    nsta_rows = []
+    for feature in nsta_wells:
+        attrs = feature.get("attributes", {})
+        nsta_rows.append({
+            "well_id": f"NSTA_{attrs.get('WELL_ID', 'UNKNOWN')}",
+            "props": {
                 "source": "NSTA_UK",
                 "well_name": attrs.get('WELL_ID'),
                 "operator": attrs.get('OPERATOR'),
                 "well_status": attrs.get('STATUS'),
-                "drill_year": attrs.get('YEAR'),
+                "drill_year": _to_int(attrs.get('YEAR')),
                 "well_type": attrs.get('TYPE'),
-                "total_depth": attrs.get('DEPTH_MD'),
-                "latitude": attrs.get('LATITUDE'),
-                "longitude": attrs.get('LONGITUDE'),
-                "formation": attrs.get('FORMATION')
+                "total_depth": _to_float(attrs.get('DEPTH_MD')),
+                "latitude": _to_float(attrs.get('LATITUDE')),
+                "longitude": _to_float(attrs.get('LONGITUDE')),
+                "primary_formation": attrs.get('FORMATION'),
+                "country": "United_Kingdom",
+                "data_source": "NSTA_OpenData"
             }
-            
-            query = """
-            MERGE (w:Well {well_id: $well_id})
-            SET w.source = $source,
-                w.well_name = $well_name,
-                w.operator = $operator,
-                w.well_status = $well_status,
-                w.drill_year = CASE WHEN $drill_year IS NOT NULL THEN toInteger($drill_year) ELSE null END,
-                w.well_type = $well_type,
-                w.total_depth = CASE WHEN $total_depth IS NOT NULL THEN toFloat($total_depth) ELSE null END,
-                w.latitude = CASE WHEN $latitude IS NOT NULL THEN toFloat($latitude) ELSE null END,
-                w.longitude = CASE WHEN $longitude IS NOT NULL THEN toFloat($longitude) ELSE null END,
-                w.primary_formation = $formation,
-                w.country = "United_Kingdom",
-                w.data_source = "NSTA_OpenData",
-                w.created_timestamp = datetime()
-            """
-            
-            run_cypher(session, query, well_data)
-            wells_loaded += 1
+        })
+    
+    with get_neo4j_session() as session:
+        # Batched per source instead of one round trip per well
+        for rows in (npd_rows, nsta_rows):
+            run_batched(session, _WELL_MERGE, rows, parallel=True)
     
+    wells_loaded = len(npd_rows) + len(nsta_rows)
     logger.info(f"✅ Loaded {wells_loaded} real wells into Neo4j")
     return wells_loaded
 
@@ -315,28 +354,8 @@ def load_real_formations():
     ]
     
     with get_neo4j_session() as session:
-        for formation in formations:
-            query = """
-            MERGE (f:Formation {name: $name, basin: $basin})
-            SET f.geological_age = $geological_age,
-                f.age_ma = toFloat($age_ma),
-                f.depth_start = toInteger($depth_start),
-                f.depth_end = toInteger($depth_end),
-                f.rock_type = $rock_type,
-                f.porosity_avg = toFloat($porosity_avg),
-                f.permeability_md = toFloat($permeability_md),
-                f.rock_strength_psi = toInteger($rock_strength_psi),
-                f.pore_pressure_gradient = toFloat($pore_pressure_gradient),
-                f.temperature_f = toInteger($temperature_f),
-                f.drilling_challenges = $drilling_challenges,
-                f.typical_mud_weight = toFloat($typical_mud_weight),
-                f.h2s_risk = $h2s_risk,
-                f.co2_risk = $co2_risk,
-                f.data_source = "Geological_Surveys",
-                f.created_timestamp = datetime()
-            """
-            
-            run_cypher(session, query, formation)
+        # Serial: Formation has no uniqueness constraint, so parallel MERGEs could duplicate nodes
+        run_batched(session, _FORMATION_MERGE, formations)
     
     logger.info(f"✅ Loaded {len(formations)} real geological formations")
 
@@ -488,33 +507,7 @@ def load_real_bha_catalog():
     ]
     
     with get_neo4j_session() as session:
-        for tool in bha_tools:
-            # FIXED: Query exactly matches the expected parameters from the improved file
-            query = """
-            MERGE (b:BHATool {part_number: $part_number})
-            SET b.tool_type = $tool_type,
-                b.manufacturer = $manufacturer,
-                b.size_inches = toFloat($size_inches),
-                b.iadc_code = $iadc_code,
-                b.application = $application,
-                b.max_wob_klbs = CASE WHEN $max_wob_klbs IS NOT NULL THEN toFloat($max_wob_klbs) ELSE null END,
-                b.max_rpm = CASE WHEN $max_rpm IS NOT NULL THEN toInteger($max_rpm) ELSE null END,
-                b.max_torque_ftlbs = CASE WHEN $max_torque_ftlbs IS NOT NULL THEN toInteger($max_torque_ftlbs) ELSE null END,
-                b.flow_rate_gpm_min = CASE WHEN $flow_rate_gpm_min IS NOT NULL THEN toInteger($flow_rate_gpm_min) ELSE null END,
-                b.flow_rate_gpm_max = CASE WHEN $flow_rate_gpm_max IS NOT NULL THEN toInteger($flow_rate_gpm_max) ELSE null END,
-                b.cost_usd = CASE WHEN $cost_usd IS NOT NULL THEN toInteger($cost_usd) ELSE null END,
-                b.rental_day_rate = CASE WHEN $rental_day_rate IS NOT NULL THEN toInteger($rental_day_rate) ELSE null END,
-                b.specifications = $specifications,
-                b.measurements = $measurements,
-                b.transmission = $transmission,
-                b.max_temperature_f = CASE WHEN $max_temperature_f IS NOT NULL THEN toInteger($max_temperature_f) ELSE null END,
-                b.max_pressure_psi = CASE WHEN $max_pressure_psi IS NOT NULL THEN toInteger($max_pressure_psi) ELSE null END,
-                b.bend_degrees = CASE WHEN $bend_degrees IS NOT NULL THEN toFloat($bend_degrees) ELSE null END,
-                b.data_source = "Manufacturer_Specifications",
-                b.created_timestamp = datetime()
-            """
-            
-            run_cypher(session, query, tool)
+        run_batched(session, _BHA_MERGE, [coerce_bha_tool(tool) for tool in bha_tools], parallel=True)
     
     logger.info(f"✅ Loaded {len(bha_tools)} real BHA tools")
 
@@ -581,20 +574,7 @@ def load_industry_constraints():
     ]
     
     with get_neo4j_session() as session:
-        for constraint in constraints:
-            query = """
-            MERGE (c:EngineeringConstraint {constraint_id: $constraint_id})
-            SET c.constraint_type = $constraint_type,
-                c.limit_value = toFloat($limit_value),
-                c.unit = $unit,
-                c.description = $description,
-                c.source = $source,
-                c.regulation_code = $regulation_code,
-                c.data_source = "Industry_Standards",
-                c.created_timestamp = datetime()
-            """
-            
-            run_cypher(session, query, constraint)
+        run_batched(session, _CONSTRAINT_MERGE, constraints, parallel=True)
     
     logger.info(f"✅ Loaded {len(constraints)} real industry constraints")
 
@@ -1,8 +1,14 @@
 import os
 import json
 import re
-from typing import List, Dict, Any
+import atexit
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+from cachetools import TTLCache
 from neo4j import GraphDatabase
+from neo4j.exceptions import AuthError
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -28,19 +34,45 @@ URI = os.getenv("NEO4J_URI")
 USER = os.getenv("NEO4J_USERNAME") 
 PWD = os.getenv("NEO4J_PASSWORD")
 
-# Global driver instance
+# Global driver instance - one connection pool per process
 _driver = None
+_driver_lock = threading.Lock()
 
-def _get_driver():
-    """Get Neo4j driver instance."""
+def get_driver():
+    """
+    Get the shared Neo4j driver, created on first use and closed at interpreter exit.
+    
+    Raises:
+        ConnectionError: If Neo4j cannot be reached when the driver is created
+        neo4j.exceptions.AuthError: If Neo4j rejects the credentials
+    """
     global _driver
     if _driver is None:
-        _driver = GraphDatabase.driver(URI, auth=(USER, PWD))
+        with _driver_lock:
+            if _driver is None:
+                driver = GraphDatabase.driver(
+                    URI,
+                    auth=(USER, PWD),
+                    max_connection_pool_size=int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "100")),
+                    connection_acquisition_timeout=float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "60"))
+                )
+                # Warm the routing table and pool once - and fail fast if Neo4j is unreachable
+                try:
+                    driver.verify_connectivity()
+                except AuthError:
+                    # Bad credentials are not a connectivity problem - surface them as-is
+                    driver.close()
+                    raise
+                except Exception as e:
+                    driver.close()
+                    raise ConnectionError(f"Neo4j is not reachable at {URI}: {e}") from e
+                _driver = driver
+                atexit.register(close_driver)
     return _driver
 
 def _session():
     """Get Neo4j session."""
-    return _get_driver().session()
+    return get_driver().session()
 
 def close_driver():
     """Call this when shutting down the application"""
@@ -105,100 +137,179 @@ def _astra_snippets(keywords: str, k: int = 3) -> List[Dict[str, str]]:
     except Exception as e:
         raise ConnectionError(f"AstraDB vectorize search failed: {e}")
 
-def retrieve_subgraph_context(well_id: str, objectives: str) -> Dict[str, Any]:
-    """Retrieve context for a well using GraphRAG - fails fast if no data exists."""
+# Well + formation lookup - needed up front to build the vector search keywords
+_WELL_FORMATIONS_Q = """
+UNWIND $wids AS wid
+MATCH (w:Well {well_id: wid})
+OPTIONAL MATCH (w)-[:HAS_FORMATION]->(f:Formation)
+WITH wid, w, collect({
+    name: f.name, 
+    depth: [f.depth_start, f.depth_end], 
+    rock_strength: f.rock_strength, 
+    pore_pressure: f.pore_pressure,
+    properties: properties(f)
+}) AS formations
+
+RETURN wid, {
+    well_id: w.well_id,
+    location: w.location,
+    depth_target: w.depth_target,
+    formations: formations, 
+    well_properties: properties(w)
+} AS ctx
+"""
+
+# Historical examples + BHA limits - independent of the vector search.
+# BHA limits are well-independent so they are collected once for the whole batch.
+_EXAMPLES_BHA_Q = """
+OPTIONAL MATCH (b:BHATool)-[:HAS_CONSTRAINT]->(c:EngineeringConstraint)
+WITH collect({
+    part: b.part_number, 
+    type: b.tool_type, 
+    manufacturer: b.manufacturer,
+    limits: properties(c)
+}) AS bha
+
+UNWIND $wids AS wid
+MATCH (w:Well {well_id: wid})
+OPTIONAL MATCH (w)-[:HAS_PLAN]->(hp:HistoricalPlan)
+WITH wid, bha, collect({
+    plan_id: hp.plan_id, 
+    kpi: hp.final_kpi_score,
+    drilling_days: hp.drilling_days,
+    lessons_learned: hp.lessons_learned
+})[0..3] AS examples
+
+RETURN wid, {examples: examples, bha: bha} AS ctx
+"""
+
+# Worker pool for overlapping AstraDB search with the remaining Neo4j reads
+_retrieval_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="graphrag-retrieve")
+
+
+def _context_query(query: str, well_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Run a batched context query (one round-trip for all wells) - fails fast if any well has no data."""
+    try:
+        with _session() as s:
+            rows = {rec["wid"]: rec["ctx"] for rec in s.run(query, wids=well_ids) if rec["ctx"]}
+    except Exception as e:
+        raise ConnectionError(f"Neo4j query failed: {e}")
     
-    # Enhanced query to get comprehensive well context
-    q = """
-    MATCH (w:Well {well_id: $wid})
-    OPTIONAL MATCH (w)-[:HAS_FORMATION]->(f:Formation)
-    WITH w, collect({
-        name: f.name, 
-        depth: [f.depth_start, f.depth_end], 
-        rock_strength: f.rock_strength, 
-        pore_pressure: f.pore_pressure,
-        properties: properties(f)
-    }) AS formations
+    missing = [wid for wid in well_ids if wid not in rows]
+    if missing:
+        raise ValueError(f"No data found for well_id: {', '.join(missing)}")
     
-    OPTIONAL MATCH (w)-[:HAS_PLAN]->(hp:HistoricalPlan)
-    WITH w, formations, collect({
-        plan_id: hp.plan_id, 
-        kpi: hp.final_kpi_score,
-        drilling_days: hp.drilling_days,
-        lessons_learned: hp.lessons_learned
-    })[0..3] AS examples
-    
-    OPTIONAL MATCH (b:BHATool)-[:HAS_CONSTRAINT]->(c:EngineeringConstraint)
-    WITH w, formations, examples, collect({
-        part: b.part_number, 
-        type: b.tool_type, 
-        manufacturer: b.manufacturer,
-        limits: properties(c)
-    }) AS bha
-    
-    RETURN {
-        well_id: w.well_id,
-        location: w.location,
-        depth_target: w.depth_target,
-        formations: formations, 
-        examples: examples, 
-        bha: bha,
-        well_properties: properties(w)
-    } AS ctx
+    return rows
+
+
+def retrieve_subgraph_contexts(well_ids: List[str], objectives: str) -> Dict[str, Dict[str, Any]]:
     """
+    Retrieve GraphRAG context for several wells with two batched Neo4j queries.
+    Fails fast if any well has no data.
     
-    try:
-        with _session() as s:
-            rec = s.run(q, wid=well_id).single()
-            if not rec or not rec["ctx"]:
-                raise ValueError(f"No data found for well_id: {well_id}")
-            
-            ctx = rec["ctx"]
-    except Exception as e:
-        if "No data found" in str(e):
-            raise
-        else:
-            raise ConnectionError(f"Neo4j query failed: {e}")
-    
-    # Strict validation - no graceful degradation
-    if not ctx.get("well_id"):
-        raise ValueError(f"Invalid well data retrieved for: {well_id}")
-    
-    if not ctx.get("formations"):
-        raise ValueError(f"No formation data found for well: {well_id}")
-    
-    # Add objectives to context
-    ctx["objectives"] = objectives
-    
-    # Create enhanced keywords for vector search
-    form_names = ", ".join([f.get("name", "") for f in ctx.get("formations", [])])
-    well_location = ctx.get("location", "")
-    keywords = f"{form_names} {well_location} {objectives}".strip()
-    
-    if not keywords:
-        keywords = well_id
-    
-    # Get document snippets using GraphRAG approach - STRICT MODE
-    ctx["docs"] = _astra_snippets(keywords, k=5)
-    
-    # Add metadata for transparency
-    ctx["retrieval_metadata"] = {
-        "search_keywords": keywords,
-        "formations_count": len(ctx.get("formations", [])),
-        "historical_examples_count": len(ctx.get("examples", [])),
-        "bha_tools_count": len(ctx.get("bha", [])),
-        "documents_retrieved": len(ctx.get("docs", []))
-    }
+    Returns:
+        Mapping of well_id to its context
+    """
+    if not well_ids:
+        raise ValueError("well_ids cannot be empty")
+    
+    contexts = _context_query(_WELL_FORMATIONS_Q, well_ids)
+    
+    docs_futures = {}
+    for well_id, ctx in contexts.items():
+        # Strict validation - no graceful degradation
+        if not ctx.get("well_id"):
+            raise ValueError(f"Invalid well data retrieved for: {well_id}")
+        
+        if not ctx.get("formations"):
+            raise ValueError(f"No formation data found for well: {well_id}")
+        
+        # Add objectives to context
+        ctx["objectives"] = objectives
+        
+        # Create enhanced keywords for vector search
+        form_names = ", ".join([f.get("name", "") for f in ctx.get("formations", [])])
+        well_location = ctx.get("location", "")
+        keywords = f"{form_names} {well_location} {objectives}".strip()
+        
+        if not keywords:
+            keywords = well_id
+        
+        ctx["retrieval_metadata"] = {"search_keywords": keywords}
+        
+        # Get document snippets using GraphRAG approach - STRICT MODE
+        # AstraDB searches run while the examples/BHA query executes on this thread
+        docs_futures[well_id] = _retrieval_pool.submit(_astra_snippets, keywords, 5)
     
-    return ctx
+    for well_id, extra in _context_query(_EXAMPLES_BHA_Q, well_ids).items():
+        contexts[well_id].update(extra)
+    
+    for well_id, ctx in contexts.items():
+        ctx["docs"] = docs_futures[well_id].result()
+        
+        # Add metadata for transparency
+        ctx["retrieval_metadata"].update({
+            "formations_count": len(ctx.get("formations", [])),
+            "historical_examples_count": len(ctx.get("examples", [])),
+            "bha_tools_count": len(ctx.get("bha", [])),
+            "documents_retrieved": len(ctx.get("docs", []))
+        })
+    
+    return contexts
+
+
+# Retrieved contexts keyed by (well_id, objectives digest) - repeat plans skip Neo4j + AstraDB
+_context_cache = TTLCache(maxsize=256, ttl=int(os.getenv("CONTEXT_CACHE_TTL", "600")))
+_context_cache_lock = threading.Lock()
+
 
-def validate_against_constraints(well_id: str, plan_text: str) -> Dict[str, Any]:
-    """Validate plan against real engineering constraints from knowledge graph."""
+def invalidate_context_cache(well_id: Optional[str] = None) -> None:
+    """Drop cached retrieval contexts for one well, or all wells when well_id is None."""
+    with _context_cache_lock:
+        if well_id is None:
+            _context_cache.clear()
+            return
+        for key in [key for key in _context_cache if key[0] == well_id]:
+            del _context_cache[key]
+
+
+def retrieve_subgraph_context(well_id: str, objectives: str, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Retrieve context for a well using GraphRAG - fails fast if no data exists.
     
-    # Extract parameters from plan text using structured parsing
-    from app.llm.watsonx_client import parse_markdown_plan
+    Results are cached for CONTEXT_CACHE_TTL seconds (default 600); graph loaders
+    call invalidate_context_cache() when they change the data. Pass use_cache=False
+    to force a fresh retrieval.
+    """
+    key = (well_id, hashlib.blake2b(objectives.encode("utf-8"), digest_size=16).hexdigest())
     
-    parsed_plan = parse_markdown_plan(plan_text)
+    if use_cache:
+        with _context_cache_lock:
+            ctx = _context_cache.get(key)
+        if ctx is not None:
+            return dict(ctx)
+    
+    ctx = retrieve_subgraph_contexts([well_id], objectives)[well_id]
+    
+    with _context_cache_lock:
+        _context_cache[key] = ctx
+    return dict(ctx)
+
+def validate_against_constraints(well_id: str, plan_text: str,
+                                 parsed_plan: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Validate plan against real engineering constraints from knowledge graph.
+
+    Pass parsed_plan when the plan was generated as structured output so the
+    markdown is not re-parsed; otherwise plan_text is parsed here.
+    """
+    if parsed_plan is None:
+        # Extract parameters from plan text using structured parsing
+        from app.llm.watsonx_client import parse_markdown_plan
+        parsed_plan = parse_markdown_plan(plan_text)
+    elif "plan_text" not in parsed_plan:
+        parsed_plan = {**parsed_plan, "plan_text": plan_text}
+
     if parsed_plan.get("parsing_error"):
         raise ValueError(f"Cannot parse plan for validation: {parsed_plan['parsing_error']}")
     
@@ -206,21 +317,20 @@ def validate_against_constraints(well_id: str, plan_text: str) -> Dict[str, Any]
     checked_constraints = []
     violation_details = []
     
-    # Get constraints from Neo4j with enhanced query
+    # Get constraints from Neo4j in one round-trip - one row per constraint
+    # (not per formation x constraint), so each limit is checked exactly once
     q = """
-    MATCH (w:Well {well_id: $well_id})-[:HAS_FORMATION]->(f:Formation)
+    MATCH (w:Well {well_id: $well_id})
+    WHERE EXISTS { (w)-[:HAS_FORMATION]->(:Formation) }
     MATCH (b:BHATool)-[:HAS_CONSTRAINT]->(c:EngineeringConstraint)
-    RETURN DISTINCT
-        f.name as formation, 
-        f.pore_pressure as pp, 
-        f.rock_strength as rs,
-        b.part_number as tool_part,
-        b.tool_type as tool_type,
-        c.constraint_id as constraint_id, 
-        c.constraint_type as constraint_type, 
-        c.limit_value as limit_value, 
+    WITH c, collect(DISTINCT b.part_number) as tool_parts
+    RETURN
+        c.constraint_id as constraint_id,
+        c.constraint_type as constraint_type,
+        c.limit_value as limit_value,
         c.unit as unit,
-        c.description as description
+        c.description as description,
+        tool_parts
     """
     
     try:
@@ -232,6 +342,14 @@ def validate_against_constraints(well_id: str, plan_text: str) -> Dict[str, Any]
     if not constraints:
         raise ValueError(f"No constraints found for well: {well_id}")
     
+    # Plan values are extracted once per parameter type and shared by all constraints of that type
+    extracted = {}
+    
+    def _plan_values(extractor) -> List[Dict[str, Any]]:
+        if extractor not in extracted:
+            extracted[extractor] = extractor(parsed_plan)
+        return extracted[extractor]
+    
     # Validate each constraint against plan parameters
     for constraint in constraints:
         constraint_id = constraint["constraint_id"]
@@ -243,7 +361,7 @@ def validate_against_constraints(well_id: str, plan_text: str) -> Dict[str, Any]
         
         # Pressure constraints
         if constraint_type == "pressure":
-            mud_weights = extract_mud_weights(parsed_plan)
+            mud_weights = _plan_values(extract_mud_weights)
             for mw in mud_weights:
                 if mw.get("value", 0) > limit_value:
                     violation_msg = f"Mud weight {mw['value']} {mw.get('unit', 'ppg')} exceeds limit {limit_value} {unit}"
@@ -259,7 +377,7 @@ def validate_against_constraints(well_id: str, plan_text: str) -> Dict[str, Any]
         
         # Torque constraints
         elif constraint_type == "torque":
-            torque_values = extract_torque_values(parsed_plan)
+            torque_values = _plan_values(extract_torque_values)
             for tv in torque_values:
                 if tv.get("value", 0) > limit_value:
                     violation_msg = f"Torque {tv['value']} {tv.get('unit', 'ft-lbs')} exceeds limit {limit_value} {unit}"
@@ -275,7 +393,7 @@ def validate_against_constraints(well_id: str, plan_text: str) -> Dict[str, Any]
         
         # Rotation/RPM constraints
         elif constraint_type in ["rotation", "speed"]:
-            rpm_values = extract_rpm_values(parsed_plan)
+            rpm_values = _plan_values(extract_rpm_values)
             for rpm in rpm_values:
                 if rpm.get("value", 0) > limit_value:
                     violation_msg = f"RPM {rpm['value']} {rpm.get('unit', 'rpm')} exceeds limit {limit_value} {unit}"
@@ -291,7 +409,7 @@ def validate_against_constraints(well_id: str, plan_text: str) -> Dict[str, Any]
         
         # Force/WOB constraints
         elif constraint_type == "force":
-            wob_values = extract_wob_values(parsed_plan)
+            wob_values = _plan_values(extract_wob_values)
             for wob in wob_values:
                 if wob.get("value", 0) > limit_value:
                     violation_msg = f"WOB {wob['value']} {wob.get('unit', 'lbs')} exceeds limit {limit_value} {unit}"
@@ -537,6 +655,30 @@ def record_iteration(plan_id: str, iteration: int, draft: str, validation: Dict,
     except Exception as e:
         raise ConnectionError(f"Failed to record iteration in Neo4j: {e}")
 
+def get_graph_snapshot_version(well_id: str) -> str:
+    """
+    Return a version string for a well's graph data.
+    
+    The version changes when the well's updated_at stamp or its formation set
+    changes, so cached planning results keyed on it go stale with the graph.
+    """
+    q = """
+    MATCH (w:Well {well_id: $well_id})
+    OPTIONAL MATCH (w)-[:HAS_FORMATION]->(f:Formation)
+    RETURN toString(w.updated_at) AS updated_at, count(f) AS formations
+    """
+    
+    try:
+        with _session() as s:
+            record = s.run(q, well_id=well_id).single()
+    except Exception as e:
+        raise ConnectionError(f"Failed to read graph snapshot version: {e}")
+    
+    if record is None:
+        raise ValueError(f"Well not found in graph: {well_id}")
+    
+    return f"{record['updated_at'] or 'unversioned'}:{record['formations']}"
+
 def initialize_schema():
     """Initialize the Neo4j schema - run this once after setting up local Neo4j"""
     schema_queries = [
@@ -590,19 +732,40 @@ def load_sample_data():
         """CREATE (hp1:HistoricalPlan {plan_id: 'HIST_001', final_kpi_score: 85.2, drilling_days: 12.5, lessons_learned: 'Optimal RPM for this formation is 120-140'})""",
         """CREATE (hp2:HistoricalPlan {plan_id: 'HIST_002', final_kpi_score: 78.9, drilling_days: 15.2, lessons_learned: 'Increase mud weight gradually to prevent circulation losses'})""",
         
-        # Create relationships
-        """MATCH (w:Well {well_id: 'WELL_001'}), (f1:Formation {name: 'Sandstone_A'}) CREATE (w)-[:HAS_FORMATION]->(f1)""",
-        """MATCH (w:Well {well_id: 'WELL_001'}), (f2:Formation {name: 'Shale_B'}) CREATE (w)-[:HAS_FORMATION]->(f2)""",
-        """MATCH (b:BHATool {part_number: 'PDC-001'}), (c:EngineeringConstraint {constraint_id: 'MAX_WOB'}) CREATE (b)-[:HAS_CONSTRAINT]->(c)""",
-        """MATCH (b:BHATool {part_number: 'PDC-001'}), (c:EngineeringConstraint {constraint_id: 'MAX_TORQUE'}) CREATE (b)-[:HAS_CONSTRAINT]->(c)""",
-        """MATCH (b:BHATool {part_number: 'MOTOR-001'}), (c:EngineeringConstraint {constraint_id: 'MAX_PRESSURE'}) CREATE (b)-[:HAS_CONSTRAINT]->(c)""",
+        # Historical plans belong to the sample well
         """MATCH (w:Well {well_id: 'WELL_001'}), (hp:HistoricalPlan) CREATE (w)-[:HAS_PLAN]->(hp)""",
     ]
     
+    # Relationships - one UNWIND per relationship type instead of one query per pair
+    relationship_batches = [
+        (
+            """UNWIND $pairs AS p
+            MATCH (w:Well {well_id: p.well_id}), (f:Formation {name: p.formation})
+            CREATE (w)-[:HAS_FORMATION]->(f)""",
+            [
+                {"well_id": "WELL_001", "formation": "Sandstone_A"},
+                {"well_id": "WELL_001", "formation": "Shale_B"},
+            ]
+        ),
+        (
+            """UNWIND $pairs AS p
+            MATCH (b:BHATool {part_number: p.part_number}), (c:EngineeringConstraint {constraint_id: p.constraint_id})
+            CREATE (b)-[:HAS_CONSTRAINT]->(c)""",
+            [
+                {"part_number": "PDC-001", "constraint_id": "MAX_WOB"},
+                {"part_number": "PDC-001", "constraint_id": "MAX_TORQUE"},
+                {"part_number": "MOTOR-001", "constraint_id": "MAX_PRESSURE"},
+            ]
+        ),
+    ]
+    
     try:
         with _session() as s:
             for query in sample_data_queries:
                 s.run(query)
+            for query, pairs in relationship_batches:
+                s.run(query, pairs=pairs)
+        invalidate_context_cache()
         print("✅ Sample data loaded successfully")
     except Exception as e:
         raise ConnectionError(f"Sample data loading failed: {e}")
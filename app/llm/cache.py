@@ -0,0 +1,190 @@
+"""
+Response cache for watsonx.ai generation calls.
+
+Two tiers sit in front of the LLM:
+- L1: exact match on sha256(prompt)
+- L2: similarity match on the prompt's dynamic suffix, restricted to entries that
+  share the same static prefix and cache scope (e.g. well_id)
+
+The L2 tier compares bag-of-words cosine similarity locally - no embedding model
+or external vector store is required.
+"""
+
+import hashlib
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Optional, Tuple
+
+from cachetools import LRUCache
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _vectorize(text: str) -> Tuple[Counter, float]:
+    vector = Counter(_TOKEN_RE.findall(text.lower()))
+    norm = math.sqrt(sum(count * count for count in vector.values()))
+    return vector, norm
+
+
+def _cosine(a: Counter, a_norm: float, b: Counter, b_norm: float) -> float:
+    if not a_norm or not b_norm:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(count * b[token] for token, count in a.items()) / (a_norm * b_norm)
+
+
+class ResponseCache:
+    """
+    Two-tier (exact + similarity) cache for LLM responses.
+
+    Entries expire after their TTL. All operations are thread-safe.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: int = 3600,
+        similarity_threshold: float = 0.9,
+        semantic_maxsize: int = 512
+    ):
+        if not 0 < similarity_threshold <= 1:
+            raise ValueError(f"similarity_threshold must be in (0, 1], got: {similarity_threshold}")
+
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self._exact = LRUCache(maxsize=maxsize)
+        self._semantic = LRUCache(maxsize=semantic_maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _split(prompt: str, dynamic_suffix: Optional[str]) -> Tuple[str, str]:
+        if dynamic_suffix and prompt.endswith(dynamic_suffix):
+            return prompt[:len(prompt) - len(dynamic_suffix)], dynamic_suffix
+        return "", prompt
+
+    def get(self, prompt: str, dynamic_suffix: Optional[str] = None, scope: str = "") -> Optional[str]:
+        """
+        Look up a cached response for a prompt.
+
+        Args:
+            prompt: Full prompt text
+            dynamic_suffix: Trailing per-call part of the prompt used for similarity matching
+            scope: Namespace that similarity hits must share (e.g. well_id)
+
+        Returns:
+            Cached response or None on miss
+        """
+        now = time.monotonic()
+        key = _digest(prompt)
+
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at > now:
+                    self.hits += 1
+                    return response
+                del self._exact[key]
+
+            if dynamic_suffix is None:
+                self.misses += 1
+                return None
+
+            prefix, suffix = self._split(prompt, dynamic_suffix)
+            prefix_key = _digest(f"{scope}\x00{prefix}")
+            vector, norm = _vectorize(suffix)
+
+            best_response = None
+            best_score = self.similarity_threshold
+            for entry_key, (expires_at, entry_prefix_key, entry_vector, entry_norm, response) in list(self._semantic.items()):
+                if expires_at <= now:
+                    del self._semantic[entry_key]
+                    continue
+                if entry_prefix_key != prefix_key:
+                    continue
+                score = _cosine(vector, norm, entry_vector, entry_norm)
+                if score >= best_score:
+                    best_score = score
+                    best_response = response
+
+            if best_response is None:
+                self.misses += 1
+                return None
+
+            self.semantic_hits += 1
+            return best_response
+
+    def set(
+        self,
+        prompt: str,
+        response: str,
+        dynamic_suffix: Optional[str] = None,
+        scope: str = "",
+        ttl: Optional[int] = None
+    ) -> None:
+        """Store a response for a prompt (and its dynamic suffix when given)."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        key = _digest(prompt)
+
+        with self._lock:
+            self._exact[key] = (expires_at, response)
+
+            if dynamic_suffix is not None:
+                prefix, suffix = self._split(prompt, dynamic_suffix)
+                vector, norm = _vectorize(suffix)
+                self._semantic[key] = (expires_at, _digest(f"{scope}\x00{prefix}"), vector, norm, response)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._exact.clear()
+            self._semantic.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "entries": len(self._exact)
+            }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_configured = False
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Return the process-wide response cache, or None when LLM_CACHE_ENABLED is false.
+
+    The environment is read once, on first call; every generation after that
+    gets the same answer without re-parsing it.
+
+    Configuration:
+        LLM_CACHE_ENABLED: "true"/"false" (default "true")
+        LLM_CACHE_TTL: Entry lifetime in seconds (default 3600)
+        LLM_CACHE_SIMILARITY: Cosine threshold for similarity hits (default 0.9)
+    """
+    global _cache, _cache_configured
+    if not _cache_configured:
+        if os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true":
+            _cache = ResponseCache(
+                ttl=int(os.getenv("LLM_CACHE_TTL", "3600")),
+                similarity_threshold=float(os.getenv("LLM_CACHE_SIMILARITY", "0.9"))
+            )
+        _cache_configured = True
+    return _cache
@@ -0,0 +1,135 @@
+"""
+Prompt context compression for drilling plan generation.
+
+GraphRAG results can be large; sending them verbatim on every optimization
+loop wastes input tokens. This module turns a retrieved context into a compact,
+stable prompt block:
+- documents are deduplicated by content hash
+- each document keeps only its top-K sentences by BM25 score against the objectives
+- graph context is serialized as compact JSON
+- the whole block is capped at a token budget
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from rank_bm25 import BM25Okapi
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_TOKEN_RE = re.compile(r"\w+")
+
+# Graph lists are trimmed to this many entries before serialization
+_MAX_LIST_ITEMS = 5
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _dedupe_snippets(docs: List[Any]) -> List[str]:
+    """Return unique non-empty document snippets in retrieval order."""
+    seen = set()
+    snippets = []
+    for doc in docs:
+        if not isinstance(doc, dict):
+            continue
+        snippet = doc.get("snippet", "")
+        if not snippet or not isinstance(snippet, str):
+            continue
+        digest = hashlib.sha256(" ".join(snippet.split()).encode("utf-8")).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        snippets.append(snippet.strip())
+    return snippets
+
+
+def _top_sentences(snippets: List[str], objectives: str, top_k: int) -> List[str]:
+    """Keep each snippet's top_k sentences by BM25 score, in original order."""
+    doc_sentences = [[s for s in _SENTENCE_RE.split(snippet) if s.strip()] for snippet in snippets]
+    corpus = [sentence for sentences in doc_sentences for sentence in sentences]
+    if not corpus:
+        return []
+
+    bm25 = BM25Okapi([_tokenize(sentence) or [""] for sentence in corpus])
+    scores = bm25.get_scores(_tokenize(objectives))
+
+    compressed = []
+    offset = 0
+    for sentences in doc_sentences:
+        doc_scores = scores[offset:offset + len(sentences)]
+        offset += len(sentences)
+        keep = sorted(sorted(range(len(sentences)), key=lambda i: -doc_scores[i])[:top_k])
+        compressed.append(" ".join(sentences[i].strip() for i in keep))
+    return compressed
+
+
+def _graph_json(context: Dict[str, Any]) -> str:
+    """Serialize the graph part of the context as compact JSON."""
+    graph = {
+        "well": context.get("well_info") or {
+            "well_id": context.get("well_id"),
+            "location": context.get("location")
+        },
+        "formations": context.get("formations", [])[:_MAX_LIST_ITEMS],
+        "offset_wells": context.get("offset_wells", [])[:_MAX_LIST_ITEMS],
+        "historical_performance": context.get("historical_performance", {}),
+        "examples": context.get("examples", [])[:_MAX_LIST_ITEMS],
+        "bha": context.get("bha", [])[:_MAX_LIST_ITEMS]
+    }
+    return json.dumps(graph, separators=(",", ":"), sort_keys=True, default=str)
+
+
+def compress_context(context: Dict[str, Any], objectives: str, token_budget: Optional[int] = None,
+                     top_k: Optional[int] = None) -> str:
+    """
+    Build the compressed prompt block for a retrieved context.
+
+    Args:
+        context: Retrieved GraphRAG context (formations, docs, ...)
+        objectives: Planning objectives used to rank document sentences
+        token_budget: Maximum estimated tokens (default PROMPT_TOKEN_BUDGET env, 6000)
+        top_k: Sentences kept per document (default PROMPT_DOC_SENTENCES env, 3)
+
+    Returns:
+        Prompt-ready context block
+
+    Raises:
+        ValueError: If the context has no usable documents or the graph context
+            alone exceeds the budget
+    """
+    if token_budget is None:
+        token_budget = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+    if top_k is None:
+        top_k = int(os.getenv("PROMPT_DOC_SENTENCES", "3"))
+
+    snippets = _dedupe_snippets(context.get("docs", []))
+    if not snippets:
+        raise ValueError("No valid document snippets found")
+
+    graph_block = f"WELL CONTEXT (JSON):\n{_graph_json(context)}"
+    remaining = token_budget - estimate_tokens(graph_block) - estimate_tokens("\n\nDOCUMENTS:\n")
+    if remaining <= 0:
+        raise ValueError(f"Graph context exceeds prompt token budget of {token_budget}")
+
+    doc_lines = []
+    for i, text in enumerate(_top_sentences(snippets, objectives, top_k)):
+        line = f"Document {i + 1}: {text}"
+        cost = estimate_tokens(line) + 1
+        if cost > remaining:
+            if not doc_lines:
+                # Always keep some evidence - truncate the best-ranked document to fit
+                doc_lines.append(line[:remaining * 4])
+            break
+        doc_lines.append(line)
+        remaining -= cost
+
+    return f"{graph_block}\n\nDOCUMENTS:\n" + "\n".join(doc_lines)
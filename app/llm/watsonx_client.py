@@ -2,7 +2,15 @@ import os
 from dotenv import load_dotenv
 from ibm_watsonx_ai.foundation_models import ModelInference
 from ibm_watsonx_ai.metanames import GenTextParamsMetaNames as GenParams
-import re
+import json
+import hashlib
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from cachetools import LRUCache
+
+from app.llm.cache import get_response_cache
 
 load_dotenv()
 
@@ -17,6 +25,16 @@ def validate_watsonx_environment():
 # Call validation on module import - CRITICAL FOR FAIL-FAST
 validate_watsonx_environment()
 
+# STRICT parameter configuration for text generation
+_GEN_PARAMS = {
+    GenParams.MAX_NEW_TOKENS: 3000,
+    GenParams.TEMPERATURE: 0.5,
+    GenParams.DECODING_METHOD: "greedy",
+    GenParams.REPETITION_PENALTY: 1.05,
+    GenParams.TOP_P: 0.9,
+    GenParams.TOP_K: 50
+}
+
 def llm_generate(prompt: str) -> str:
     """
     Generate text using IBM WatsonX foundation models for drilling engineering tasks.
@@ -43,31 +61,8 @@ def llm_generate(prompt: str) -> str:
     if len(prompt.strip()) < 10:
         raise ValueError(f"Prompt too short: {len(prompt)} characters")
     
-    # Get environment variables - STRICT validation
-    model_id = os.environ["WX_MODEL_ID"]
-    api_key = os.environ["WX_API_KEY"]
-    url = os.environ["WX_URL"]
-    project_id = os.environ["WX_PROJECT_ID"]
-    
-    # STRICT parameter configuration
-    params = {
-        GenParams.MAX_NEW_TOKENS: 3000,
-        GenParams.TEMPERATURE: 0.5,
-        GenParams.DECODING_METHOD: "greedy",
-        GenParams.REPETITION_PENALTY: 1.05,
-        GenParams.TOP_P: 0.9,
-        GenParams.TOP_K: 50
-    }
-    
     try:
-        model = ModelInference(
-            model_id=model_id,
-            params=params,
-            credentials={"url": url, "apikey": api_key},
-            project_id=project_id
-        )
-        
-        response = model.generate_text(prompt=prompt)
+        response = _model().generate_text(prompt=prompt, params=_GEN_PARAMS)
         
     except Exception as e:
         raise ConnectionError(f"WatsonX API call failed: {e}")
@@ -105,6 +100,192 @@ def llm_generate(prompt: str) -> str:
     return generated_text.strip()
 
 
+@lru_cache(maxsize=1)
+def _model() -> ModelInference:
+    """
+    Shared ModelInference client built from the validated WX_* environment.
+
+    Construction authenticates and fetches model specs, so it is done once per
+    process; generation parameters are passed per call instead.
+    """
+    return ModelInference(
+        model_id=os.environ["WX_MODEL_ID"],
+        credentials={"url": os.environ["WX_URL"], "apikey": os.environ["WX_API_KEY"]},
+        project_id=os.environ["WX_PROJECT_ID"]
+    )
+
+
+def llm_generate_json(prompt: str, schema: dict, schema_name: str) -> str:
+    """
+    Generate a JSON document using watsonx.ai chat with schema-constrained output.
+    STRICT MODE - No fallbacks, no graceful degradation.
+
+    Args:
+        prompt: Input prompt
+        schema: JSON schema the response must follow
+        schema_name: Name reported to the API for the schema
+
+    Returns:
+        Raw JSON text of the response
+
+    Raises:
+        ValueError: If prompt is invalid or the response is malformed
+        ConnectionError: If API is unavailable
+    """
+    # STRICT input validation
+    if not prompt or not isinstance(prompt, str):
+        raise ValueError("Prompt must be a non-empty string")
+
+    params = {
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": schema_name, "schema": schema, "strict": True}
+        },
+        "max_tokens": 3000,
+        "temperature": 0,
+        "top_p": 0.9
+    }
+
+    try:
+        response = _model().chat(messages=[{"role": "user", "content": prompt}], params=params)
+    except Exception as e:
+        raise ConnectionError(f"WatsonX API call failed: {e}")
+
+    # STRICT response processing
+    try:
+        content = response["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        raise ValueError("WatsonX chat response missing message content")
+
+    if not isinstance(content, str) or not content.strip():
+        raise ValueError("WatsonX returned empty JSON content")
+
+    return content.strip()
+
+
+def _parse_json_object(text: str, what: str) -> dict:
+    """Parse a JSON object returned by the model - fail fast on anything else."""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Generated {what} is not valid JSON: {e}")
+    if not isinstance(data, dict):
+        raise ValueError(f"Generated {what} must be a JSON object, got: {type(data)}")
+    return data
+
+
+def _string_rows(rows, fields: list, what: str) -> list:
+    """Validate a list of row objects and coerce the given fields to strings."""
+    if not isinstance(rows, list):
+        raise ValueError(f"{what} must be a list, got: {type(rows)}")
+    normalized = []
+    for row in rows:
+        if not isinstance(row, dict):
+            raise ValueError(f"{what} entries must be objects, got: {type(row)}")
+        missing = [field for field in fields if field not in row]
+        if missing:
+            raise ValueError(f"{what} entry missing fields: {missing}")
+        normalized.append({field: str(row[field]).strip() for field in fields})
+    return normalized
+
+
+# Static prompt prefixes - kept byte-identical across calls so providers that
+# cache prompt prefixes can reuse them. Only append per-call content after these.
+_PLAN_PROMPT_PREFIX = """You are an expert drilling engineer. Create a detailed drilling plan.
+
+Respond with one JSON object containing:
+- plan_summary: overview of the drilling strategy
+- bha_configuration: list of {position, component, specifications}, starting with the bit
+- parameters: list of {section, depth_range, wob, rpm, flow_rate, mud_weight} per hole section.
+  Give values with units: depth_range "start-end ft", wob "N klbs", rpm "N rpm", flow_rate "N gpm", mud_weight "N ppg"
+- expected_risks: list of {risk_type, probability (Low/Med/High), mitigation}
+- expected_performance: {estimated_days, target_rop (ft/hr), cost_estimate (USD range)}
+
+Use the evidence below to fill in the plan."""
+
+_REFLECTION_PROMPT_PREFIX = """The drilling plan failed validation. Analyze and provide improvements.
+
+Respond with one JSON object containing:
+- root_cause_analysis: primary technical reason for the failure
+- change_type: Parameter, Component or Procedure
+- specific_modification: exact change to implement
+- new_value: recommended value with units
+- rationale: engineering justification for the change
+- expected_impact: how this addresses the failure and affects performance
+- implementation_steps: list of specific actions
+
+Analyze the following failed plan."""
+
+_STR = {"type": "string"}
+
+# JSON schemas passed to the chat API's structured-output mode
+PLAN_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "plan_summary": _STR,
+        "bha_configuration": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"position": _STR, "component": _STR, "specifications": _STR},
+                "required": ["position", "component", "specifications"]
+            }
+        },
+        "parameters": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "section": _STR, "depth_range": _STR, "wob": _STR,
+                    "rpm": _STR, "flow_rate": _STR, "mud_weight": _STR
+                },
+                "required": ["section", "depth_range", "wob", "rpm", "flow_rate", "mud_weight"]
+            }
+        },
+        "expected_risks": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"risk_type": _STR, "probability": _STR, "mitigation": _STR},
+                "required": ["risk_type", "probability", "mitigation"]
+            }
+        },
+        "expected_performance": {
+            "type": "object",
+            "properties": {"estimated_days": _STR, "target_rop": _STR, "cost_estimate": _STR}
+        }
+    },
+    "required": ["plan_summary", "bha_configuration", "parameters", "expected_risks"]
+}
+
+REFLECTION_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "root_cause_analysis": _STR,
+        "change_type": _STR,
+        "specific_modification": _STR,
+        "new_value": _STR,
+        "rationale": _STR,
+        "expected_impact": _STR,
+        "implementation_steps": {"type": "array", "items": _STR}
+    },
+    "required": ["root_cause_analysis", "change_type", "specific_modification", "rationale"]
+}
+
+# Rendered per-well context blocks keyed by cache handle (see cache_context)
+_context_blocks = LRUCache(maxsize=256)
+# cachetools caches are not thread-safe and concurrent runs draft in executor threads
+_context_blocks_lock = threading.Lock()
+
+
+def _assemble_prompt(*segments: str) -> str:
+    """
+    Join prompt segments in order, skipping empty ones.
+    Callers must pass static segments before dynamic ones.
+    """
+    return "\n\n".join(segment for segment in segments if segment)
+
+
 def _validate_context_structure(context: dict) -> None:
     """
     Validate that context contains all required keys - fail fast if missing
@@ -115,52 +296,11 @@ def _validate_context_structure(context: dict) -> None:
         raise KeyError(f"Context missing required keys: {missing_keys}")
 
 
-def generate_drilling_plan_markdown(context: dict, objectives: str, graph_weight: float = 0.7, astra_weight: float = 0.3) -> str:
+def _format_context_block(context: dict) -> str:
     """
-    Generate a comprehensive drilling plan using markdown formatting optimized for LLM generation.
-    STRICT MODE - No fallbacks, comprehensive validation.
-    
-    Args:
-        context: Well and geological context data from GraphRAG
-        objectives: Planning objectives and constraints
-        graph_weight: Weight for graph-based evidence
-        astra_weight: Weight for document-based evidence
-        
-    Returns:
-        Generated drilling plan in markdown format
-        
-    Raises:
-        ValueError: If inputs are invalid
-        ConnectionError: If LLM generation fails
+    Render the per-well evidence (well info, formations, documents) for the plan prompt.
+    STRICT MODE - fails fast on malformed context.
     """
-    # STRICT input validation
-    if not context:
-        raise ValueError("Context cannot be empty")
-    
-    if not isinstance(context, dict):
-        raise ValueError(f"Context must be dict, got: {type(context)}")
-    
-    # Validate context structure - fail fast if required keys missing
-    _validate_context_structure(context)
-    
-    if not objectives:
-        raise ValueError("Objectives cannot be empty")
-    
-    if not isinstance(objectives, str):
-        raise ValueError(f"Objectives must be string, got: {type(objectives)}")
-    
-    if not isinstance(graph_weight, (int, float)):
-        raise ValueError(f"Graph weight must be numeric, got: {type(graph_weight)}")
-    
-    if not isinstance(astra_weight, (int, float)):
-        raise ValueError(f"Astra weight must be numeric, got: {type(astra_weight)}")
-    
-    if graph_weight < 0 or graph_weight > 1:
-        raise ValueError(f"Graph weight must be 0-1, got: {graph_weight}")
-    
-    if astra_weight < 0 or astra_weight > 1:
-        raise ValueError(f"Astra weight must be 0-1, got: {astra_weight}")
-    
     # Extract context components with STRICT validation
     docs = context["docs"]
     if not isinstance(docs, list):
@@ -186,9 +326,6 @@ def generate_drilling_plan_markdown(context: dict, objectives: str, graph_weight
     if not isinstance(historical_performance, dict):
         raise ValueError(f"Context historical_performance must be dict, got: {type(historical_performance)}")
     
-    # Build weight annotation for transparency
-    weight_note = f"Evidence weights → Graph:{graph_weight:.2f} Astra:{astra_weight:.2f}"
-    
     # Format context information with STRICT validation
     well_info_text = f"Well ID: {well_info.get('well_id', 'Unknown')}, Location: {well_info.get('location', 'Unknown')}"
     
@@ -218,78 +355,240 @@ def generate_drilling_plan_markdown(context: dict, objectives: str, graph_weight
     
     docs_text = "\n".join(doc_snippets)
     
-    # Enhanced prompt with simplified structure for better generation
-    prompt = f"""You are an expert drilling engineer. Create a detailed drilling plan.
-
-{weight_note}
+    return _assemble_prompt(
+        f"WELL INFORMATION: {well_info_text}",
+        f"FORMATIONS:\n{formations_text}",
+        f"DOCUMENTS:\n{docs_text}"
+    )
 
-OBJECTIVES: {objectives}
 
-WELL INFORMATION: {well_info_text}
-
-FORMATIONS:
-{formations_text}
-
-DOCUMENTS: 
-{docs_text}
+def cache_context(context: dict) -> str:
+    """
+    Render a well's context block once and return a handle to it.
+    A compressed block in context["prompt_ready"] (see node_compress) is used as-is.
+    
+    Store the handle in context["cache_handle"]; later plan generations for the same
+    context reuse the identical rendered bytes instead of re-formatting the evidence.
+    
+    Raises:
+        ValueError/KeyError: If the context is malformed
+    """
+    if context.get("prompt_ready"):
+        block = context["prompt_ready"]
+    else:
+        _validate_context_structure(context)
+        block = _format_context_block(context)
+    handle = f"ctx-{hashlib.sha256(block.encode('utf-8')).hexdigest()[:16]}"
+    with _context_blocks_lock:
+        _context_blocks[handle] = block
+    return handle
 
-Create a comprehensive drilling plan with the following sections:
 
-## Plan Summary
-[Provide overview of drilling strategy]
+def plan_prompt_header(objectives: str, graph_weight: float = 0.7, astra_weight: float = 0.3) -> str:
+    """
+    Build the static head of the plan prompt (instructions, weights, objectives).
 
-## BHA Configuration
-| Position | Component | Specifications |
-|----------|-----------|----------------|
-| 1 | [Bit Type] | [Size and specs] |
-| 2 | [Motor/Tool] | [Technical details] |
+    The header depends only on its arguments, so a caller planning repeatedly
+    for the same objectives can build it once and pass it as prompt_header.
 
-## Drilling Parameters
-| Section | Depth Range | WOB | RPM | Flow Rate | Mud Weight |
-|---------|-------------|-----|-----|-----------|------------|
-| [Section Name] | [Start-End ft] | [klbs] | [rpm] | [gpm] | [ppg] |
+    Raises:
+        ValueError: If objectives or weights are invalid
+    """
+    if not objectives:
+        raise ValueError("Objectives cannot be empty")
+    
+    if not isinstance(objectives, str):
+        raise ValueError(f"Objectives must be string, got: {type(objectives)}")
+    
+    if not isinstance(graph_weight, (int, float)):
+        raise ValueError(f"Graph weight must be numeric, got: {type(graph_weight)}")
+    
+    if not isinstance(astra_weight, (int, float)):
+        raise ValueError(f"Astra weight must be numeric, got: {type(astra_weight)}")
+    
+    if graph_weight < 0 or graph_weight > 1:
+        raise ValueError(f"Graph weight must be 0-1, got: {graph_weight}")
+    
+    if astra_weight < 0 or astra_weight > 1:
+        raise ValueError(f"Astra weight must be 0-1, got: {astra_weight}")
+    
+    # Build weight annotation for transparency
+    weight_note = f"Evidence weights → Graph:{graph_weight:.2f} Astra:{astra_weight:.2f}"
+    
+    return _assemble_prompt(_PLAN_PROMPT_PREFIX, weight_note, f"OBJECTIVES: {objectives}")
 
-## Risk Mitigation
-| Risk | Probability | Mitigation Strategy |
-|------|-------------|-------------------|
-| [Risk Type] | [Low/Med/High] | [Specific approach] |
 
-## Expected Performance
-- Estimated Days: [time estimate]
-- Target ROP: [ft/hr]
-- Cost Estimate: [USD range]
+def generate_drilling_plan_structured(context: dict, objectives: str, graph_weight: float = 0.7, astra_weight: float = 0.3,
+                                      use_cache: bool = True, prompt_header: Optional[str] = None) -> dict:
+    """
+    Generate a comprehensive drilling plan using schema-constrained JSON output.
+    STRICT MODE - No fallbacks, comprehensive validation.
+    
+    Args:
+        context: Well and geological context data from GraphRAG
+        objectives: Planning objectives and constraints
+        graph_weight: Weight for graph-based evidence
+        astra_weight: Weight for document-based evidence
+        use_cache: Serve/store the response through the LLM response cache (never
+            used for refinement prompts that carry previous violations)
+        prompt_header: Prebuilt plan_prompt_header(objectives, graph_weight, astra_weight);
+            built here when omitted
+        
+    Returns:
+        Structured plan (same keys as parse_markdown_plan) with the rendered
+        markdown in "plan_text"
 
-Generate the complete drilling plan now:"""
+    Raises:
+        ValueError: If inputs are invalid
+        ConnectionError: If LLM generation fails
+    """
+    # STRICT input validation
+    if not context:
+        raise ValueError("Context cannot be empty")
+    
+    if not isinstance(context, dict):
+        raise ValueError(f"Context must be dict, got: {type(context)}")
+    
+    # Validate context structure - fail fast if required keys missing
+    _validate_context_structure(context)
+    
+    # Instructions, weights and objectives - validated and rendered once per caller when prebuilt
+    if prompt_header is None:
+        prompt_header = plan_prompt_header(objectives, graph_weight, astra_weight)
+    
+    # Per-well evidence - reuse the block rendered by cache_context() when available
+    handle = context.get("cache_handle")
+    with _context_blocks_lock:
+        context_block = _context_blocks.get(handle) if handle else None
+    if context_block is None:
+        context_block = context.get("prompt_ready") or _format_context_block(context)
+
+    # Iteration context - previous violations go in the tail so the prefix stays stable.
+    # Only the compact refinement payload is sent, never earlier drafts or reflections.
+    previous_violations = context.get("previous_violations") or []
+    iteration_text = ""
+    if previous_violations:
+        persisting = set(context.get("persisting_violations") or ())
+        iteration_text = (
+            f"PREVIOUS ITERATION {context.get('iteration_number', '?')} VIOLATIONS (must be resolved):\n"
+            + "\n".join(f"- {violation}" + (" (unresolved in earlier iterations)" if violation in persisting else "")
+                        for violation in previous_violations)
+        )
+        latest_reflection = context.get("latest_reflection")
+        if latest_reflection:
+            change = f"- {latest_reflection.get('change_type', 'Change')}: {latest_reflection.get('proposed_change', '')}"
+            if latest_reflection.get("new_value"):
+                change += f" (new value: {latest_reflection['new_value']})"
+            iteration_text += f"\n\nPROPOSED CHANGE FROM VIOLATION ANALYSIS:\n{change}"
+    
+    # Stable segments first (instruction, format spec, weights), per-well context last
+    prompt = _assemble_prompt(
+        prompt_header,
+        context_block,
+        iteration_text,
+        "Generate the drilling plan JSON now:"
+    )
 
     # Validate prompt construction
     if not prompt or len(prompt.strip()) < 100:
         raise ValueError("Failed to construct valid prompt")
     
-    try:
-        result = llm_generate(prompt)
-    except Exception as e:
-        raise ConnectionError(f"LLM generation failed: {e}")
+    # Similarity hits are only allowed within the same well, objectives and evidence
+    # weights (the header), and never for refinement prompts that follow a failed validation
+    cache = get_response_cache() if use_cache and not previous_violations else None
+    dynamic_suffix = prompt[len(_PLAN_PROMPT_PREFIX):]
+    cache_scope = f"{context['well_info'].get('well_id', '')}\x00{prompt_header}"
     
+    result = cache.get(prompt, dynamic_suffix, cache_scope) if cache else None
+    if result is None:
+        try:
+            result = llm_generate_json(prompt, PLAN_JSON_SCHEMA, "drilling_plan")
+        except Exception as e:
+            raise ConnectionError(f"LLM generation failed: {e}")
+
     # STRICT result validation
-    if not result:
-        raise ValueError("LLM generated empty response")
-    
-    if len(result.strip()) < 200:
-        raise ValueError(f"Generated plan too short: {len(result)} characters")
-    
-    # Validate required sections are present
-    required_sections = ["Plan Summary", "BHA Configuration", "Drilling Parameters"]
-    missing_sections = [section for section in required_sections if section not in result]
-    
-    if missing_sections:
-        raise ValueError(f"Generated plan missing required sections: {missing_sections}")
-    
-    return result
+    raw_plan = _parse_json_object(result, "plan")
+
+    plan_summary = raw_plan.get("plan_summary")
+    if not isinstance(plan_summary, str) or not plan_summary.strip():
+        raise ValueError("Generated plan missing plan_summary")
+
+    parsed_plan = {
+        "plan_summary": plan_summary.strip(),
+        "bha_configuration": _string_rows(raw_plan.get("bha_configuration"),
+                                          ["position", "component", "specifications"], "bha_configuration"),
+        "parameters": _string_rows(raw_plan.get("parameters"),
+                                   ["section", "depth_range", "wob", "rpm", "flow_rate", "mud_weight"], "parameters"),
+        "expected_risks": _string_rows(raw_plan.get("expected_risks", []),
+                                       ["risk_type", "probability", "mitigation"], "expected_risks")
+    }
+
+    if not parsed_plan["bha_configuration"]:
+        raise ValueError("Generated plan has no BHA configuration")
+
+    if not parsed_plan["parameters"]:
+        raise ValueError("Generated plan has no drilling parameters")
 
+    performance = raw_plan.get("expected_performance") or {}
+    if not isinstance(performance, dict):
+        raise ValueError(f"expected_performance must be an object, got: {type(performance)}")
+    parsed_plan["expected_performance"] = {key: str(value) for key, value in performance.items()}
 
-def generate_reflection_markdown(validation_failures: list, current_plan: str, context: dict) -> str:
+    parsed_plan["plan_text"] = plan_to_markdown(parsed_plan)
+
+    if cache:
+        cache.set(prompt, result, dynamic_suffix, cache_scope)
+
+    return parsed_plan
+
+
+def plan_to_markdown(plan: dict) -> str:
+    """
+    Render a structured plan as markdown for display and text-based validation.
+
+    Args:
+        plan: Structured plan as returned by generate_drilling_plan_structured
+
+    Returns:
+        Markdown plan with Plan Summary, BHA Configuration, Drilling Parameters,
+        Risk Mitigation and Expected Performance sections
+    """
+    lines = ["## Plan Summary", plan.get("plan_summary", ""), ""]
+
+    lines += ["## BHA Configuration",
+              "| Position | Component | Specifications |",
+              "|----------|-----------|----------------|"]
+    lines += [f"| {row['position']} | {row['component']} | {row['specifications']} |"
+              for row in plan.get("bha_configuration", [])]
+    lines.append("")
+
+    lines += ["## Drilling Parameters",
+              "| Section | Depth Range | WOB | RPM | Flow Rate | Mud Weight |",
+              "|---------|-------------|-----|-----|-----------|------------|"]
+    lines += [f"| {row['section']} | {row['depth_range']} | {row['wob']} | {row['rpm']} | "
+              f"{row['flow_rate']} | {row['mud_weight']} |"
+              for row in plan.get("parameters", [])]
+    lines.append("")
+
+    lines += ["## Risk Mitigation",
+              "| Risk | Probability | Mitigation Strategy |",
+              "|------|-------------|-------------------|"]
+    lines += [f"| {row['risk_type']} | {row['probability']} | {row['mitigation']} |"
+              for row in plan.get("expected_risks", [])]
+    lines.append("")
+
+    performance = plan.get("expected_performance") or {}
+    lines += ["## Expected Performance",
+              f"- Estimated Days: {performance.get('estimated_days', 'N/A')}",
+              f"- Target ROP: {performance.get('target_rop', 'N/A')}",
+              f"- Cost Estimate: {performance.get('cost_estimate', 'N/A')}"]
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_reflection_structured(validation_failures: list, current_plan: str, context: dict) -> dict:
     """
-    Generate reflection and optimization suggestions using markdown format.
+    Generate reflection and optimization suggestions using schema-constrained JSON output.
     STRICT MODE - No fallbacks, comprehensive validation.
     
     Args:
@@ -298,7 +597,9 @@ def generate_reflection_markdown(validation_failures: list, current_plan: str, c
         context: Well and geological context
         
     Returns:
-        Reflection analysis and improvement recommendations in markdown format
+        Structured reflection (root_cause_analysis, change_type, proposed_change,
+        rationale, new_value, expected_impact, implementation_steps) with the
+        rendered markdown in "reflection_text"
         
     Raises:
         ValueError: If inputs are invalid
@@ -348,62 +649,73 @@ def generate_reflection_markdown(validation_failures: list, current_plan: str, c
     if not isinstance(well_id, str):
         well_id = "Unknown well"
     
-    prompt = f"""The drilling plan failed validation. Analyze and provide improvements.
+    prompt = _assemble_prompt(
+        _REFLECTION_PROMPT_PREFIX,
+        f"CONTEXT: {well_id}",
+        f"VALIDATION FAILURES:\n{violations_text}",
+        f"CURRENT PLAN EXCERPT:\n{plan_excerpt}",
+        "Provide your analysis JSON now:"
+    )
 
-VALIDATION FAILURES:
-{violations_text}
+    # Validate prompt construction
+    if not prompt or len(prompt.strip()) < 100:
+        raise ValueError("Failed to construct valid reflection prompt")
+    
+    try:
+        result = llm_generate_json(prompt, REFLECTION_JSON_SCHEMA, "plan_reflection")
+    except Exception as e:
+        raise ConnectionError(f"Reflection generation failed: {e}")
 
-CURRENT PLAN EXCERPT:
-{plan_excerpt}
+    # STRICT result validation
+    raw_reflection = _parse_json_object(result, "reflection")
 
-CONTEXT: {well_id}
+    required_fields = ["root_cause_analysis", "change_type", "specific_modification", "rationale"]
+    missing_fields = [field for field in required_fields
+                      if not isinstance(raw_reflection.get(field), str) or not raw_reflection[field].strip()]
+    if missing_fields:
+        raise ValueError(f"Generated reflection missing required fields: {missing_fields}")
 
-Provide analysis in this format:
+    steps = raw_reflection.get("implementation_steps", [])
+    if not isinstance(steps, list):
+        raise ValueError(f"implementation_steps must be a list, got: {type(steps)}")
 
-## Root Cause Analysis
-[Primary technical reason for failure]
+    parsed_reflection = {
+        "root_cause_analysis": raw_reflection["root_cause_analysis"].strip(),
+        "change_type": raw_reflection["change_type"].strip(),
+        "proposed_change": raw_reflection["specific_modification"].strip(),
+        "new_value": str(raw_reflection.get("new_value", "")).strip(),
+        "rationale": raw_reflection["rationale"].strip(),
+        "expected_impact": str(raw_reflection.get("expected_impact", "")).strip(),
+        "implementation_steps": [str(step).strip() for step in steps if str(step).strip()]
+    }
+    parsed_reflection["reflection_text"] = reflection_to_markdown(parsed_reflection)
 
-## Proposed Change
-**Change Type**: [Parameter/Component/Procedure]
-**Specific Modification**: [Exact change to implement]
-**New Value**: [Recommended value with units]
+    return parsed_reflection
 
-## Technical Rationale
-[Engineering justification for this change]
 
-## Expected Impact
-[How this addresses the failure and affects performance]
+def reflection_to_markdown(reflection: dict) -> str:
+    """Render a structured reflection as markdown for display."""
+    lines = [
+        "## Root Cause Analysis", reflection.get("root_cause_analysis", ""), "",
+        "## Proposed Change",
+        f"**Change Type**: {reflection.get('change_type', '')}",
+        f"**Specific Modification**: {reflection.get('proposed_change', '')}",
+        f"**New Value**: {reflection.get('new_value') or 'N/A'}", "",
+        "## Technical Rationale", reflection.get("rationale", ""), "",
+        "## Expected Impact", reflection.get("expected_impact") or "N/A", "",
+        "## Implementation Steps"
+    ]
+    lines += [f"{i}. {step}" for i, step in enumerate(reflection.get("implementation_steps", []), 1)]
 
-## Implementation Steps
-1. [Specific action]
-2. [Specific action]
+    return "\n".join(lines) + "\n"
 
-Provide your analysis:"""
 
-    # Validate prompt construction
-    if not prompt or len(prompt.strip()) < 100:
-        raise ValueError("Failed to construct valid reflection prompt")
-    
-    try:
-        result = llm_generate(prompt)
-    except Exception as e:
-        raise ConnectionError(f"Reflection generation failed: {e}")
-    
-    # STRICT result validation
-    if not result:
-        raise ValueError("LLM generated empty reflection")
-    
-    if len(result.strip()) < 100:
-        raise ValueError(f"Generated reflection too short: {len(result)} characters")
-    
-    # Validate required sections are present
-    required_sections = ["Root Cause Analysis", "Proposed Change"]
-    missing_sections = [section for section in required_sections if section not in result]
-    
-    if missing_sections:
-        raise ValueError(f"Generated reflection missing required sections: {missing_sections}")
-    
-    return result
+# Markdown plan tables: section header -> (parsed_plan key, column names)
+_PLAN_TABLES = {
+    "BHA Configuration": ("bha_configuration", ["position", "component", "specifications"]),
+    "Drilling Parameters": ("parameters", ["section", "depth_range", "wob", "rpm", "flow_rate", "mud_weight"]),
+    "Risk Mitigation": ("expected_risks", ["risk_type", "probability", "mitigation"])
+}
 
 
 def parse_markdown_plan(plan_text: str) -> dict:
@@ -411,6 +723,10 @@ def parse_markdown_plan(plan_text: str) -> dict:
     Parse markdown-formatted drilling plan into structured data.
     STRICT MODE - No fallbacks, comprehensive validation.
     
+    Only validate_against_constraints uses this, for plan text that arrives
+    without the structured plan; generated plans are structured already.
+
+    
     Args:
         plan_text: Markdown-formatted drilling plan
         
@@ -437,62 +753,46 @@ def parse_markdown_plan(plan_text: str) -> dict:
         "bha_configuration": []
     }
     
-    try:
-        # Extract plan summary
-        summary_match = re.search(r'## Plan Summary\n(.*?)(?=##|$)', plan_text, re.DOTALL)
-        if summary_match:
-            summary = summary_match.group(1).strip()
-            if summary:
-                parsed_plan["plan_summary"] = summary
+    # Single pass over the lines: "## " headers switch the current section,
+    # table sections skip their header + separator rows and collect the rest
+    section = None
+    table_lines = 0
+    table_done = False
+    summary_lines = []
+    
+    for line in plan_text.splitlines():
+        if line.startswith("##"):
+            section = line[3:].strip() if line.startswith("## ") else None
+            table_lines = 0
+            table_done = False
+            continue
         
-        # Extract BHA configuration from markdown table
-        bha_match = re.search(r'## BHA Configuration\n\|.*?\n\|.*?\n((?:\|.*?\n?)*)', plan_text, re.DOTALL)
-        if bha_match:
-            bha_rows = bha_match.group(1).strip().split('\n')
-            for row in bha_rows:
-                if '|' in row and row.strip() != '':
-                    parts = [cell.strip() for cell in row.split('|')[1:-1]]
-                    if len(parts) >= 3:
-                        parsed_plan["bha_configuration"].append({
-                            "position": parts[0],
-                            "component": parts[1],
-                            "specifications": parts[2]
-                        })
+        if section == "Plan Summary":
+            summary_lines.append(line)
+            continue
         
-        # Extract drilling parameters
-        params_match = re.search(r'## Drilling Parameters\n\|.*?\n\|.*?\n((?:\|.*?\n?)*)', plan_text, re.DOTALL)
-        if params_match:
-            param_rows = params_match.group(1).strip().split('\n')
-            for row in param_rows:
-                if '|' in row and row.strip() != '':
-                    parts = [cell.strip() for cell in row.split('|')[1:-1]]
-                    if len(parts) >= 6:
-                        parsed_plan["parameters"].append({
-                            "section": parts[0],
-                            "depth_range": parts[1],
-                            "wob": parts[2],
-                            "rpm": parts[3],
-                            "flow_rate": parts[4],
-                            "mud_weight": parts[5]
-                        })
+        table = _PLAN_TABLES.get(section)
+        if table is None or table_done:
+            continue
         
-        # Extract risk mitigation
-        risk_match = re.search(r'## Risk Mitigation\n\|.*?\n\|.*?\n((?:\|.*?\n?)*)', plan_text, re.DOTALL)
-        if risk_match:
-            risk_rows = risk_match.group(1).strip().split('\n')
-            for row in risk_rows:
-                if '|' in row and row.strip() != '':
-                    parts = [cell.strip() for cell in row.split('|')[1:-1]]
-                    if len(parts) >= 3:
-                        parsed_plan["expected_risks"].append({
-                            "risk_type": parts[0],
-                            "probability": parts[1],
-                            "mitigation": parts[2]
-                        })
+        stripped = line.strip()
+        if not stripped.startswith("|"):
+            # Blank lines may precede the table; anything else ends it
+            table_done = table_lines > 0 or bool(stripped)
+            continue
         
-    except Exception as e:
-        parsed_plan["parsing_error"] = str(e)
-        raise ValueError(f"Plan parsing failed: {e}")
+        table_lines += 1
+        if table_lines <= 2:
+            continue
+        
+        key, fields = table
+        parts = [cell.strip() for cell in stripped.split("|")[1:-1]]
+        if len(parts) >= len(fields):
+            parsed_plan[key].append(dict(zip(fields, parts)))
+    
+    summary = "\n".join(summary_lines).strip()
+    if summary:
+        parsed_plan["plan_summary"] = summary
     
     # Validate parsing results
     if not parsed_plan.get("plan_summary") and not parsed_plan.get("bha_configuration") and not parsed_plan.get("parameters"):
@@ -501,74 +801,6 @@ def parse_markdown_plan(plan_text: str) -> dict:
     return parsed_plan
 
 
-def parse_markdown_reflection(reflection_text: str) -> dict:
-    """
-    Parse markdown-formatted reflection into structured data.
-    STRICT MODE - No fallbacks, comprehensive validation.
-    
-    Args:
-        reflection_text: Markdown-formatted reflection analysis
-        
-    Returns:
-        Dictionary with structured reflection data
-        
-    Raises:
-        ValueError: If reflection cannot be parsed
-    """
-    # STRICT input validation
-    if not reflection_text:
-        raise ValueError("Reflection text cannot be empty")
-    
-    if not isinstance(reflection_text, str):
-        raise ValueError(f"Reflection text must be string, got: {type(reflection_text)}")
-    
-    if len(reflection_text.strip()) < 50:
-        raise ValueError(f"Reflection text too short for parsing: {len(reflection_text)} characters")
-    
-    parsed_reflection = {
-        "reflection_text": reflection_text
-    }
-    
-    try:
-        # Extract root cause analysis
-        root_cause_match = re.search(r'## Root Cause Analysis\n(.*?)(?=##|$)', reflection_text, re.DOTALL)
-        if root_cause_match:
-            root_cause = root_cause_match.group(1).strip()
-            if root_cause:
-                parsed_reflection["root_cause_analysis"] = root_cause
-        
-        # Extract proposed change details
-        change_match = re.search(r'## Proposed Change\n(.*?)(?=##|$)', reflection_text, re.DOTALL)
-        if change_match:
-            change_text = change_match.group(1)
-            if change_text:
-                parsed_reflection["proposed_change"] = change_text.strip()
-                
-                # Extract specific fields
-                change_type_match = re.search(r'\*\*Change Type\*\*: (.*?)(?=\n|\*\*|$)', change_text)
-                if change_type_match:
-                    change_type = change_type_match.group(1).strip()
-                    if change_type:
-                        parsed_reflection["change_type"] = change_type
-        
-        # Extract rationale
-        rationale_match = re.search(r'## Technical Rationale\n(.*?)(?=##|$)', reflection_text, re.DOTALL)
-        if rationale_match:
-            rationale = rationale_match.group(1).strip()
-            if rationale:
-                parsed_reflection["rationale"] = rationale
-                
-    except Exception as e:
-        parsed_reflection["parsing_error"] = str(e)
-        raise ValueError(f"Reflection parsing failed: {e}")
-    
-    # Validate parsing results
-    if not parsed_reflection.get("root_cause_analysis") and not parsed_reflection.get("proposed_change"):
-        raise ValueError("Failed to extract meaningful content from reflection")
-    
-    return parsed_reflection
-
-
 def validate_environment() -> None:
     """
     Validate that required WatsonX environment variables are configured.
@@ -2,7 +2,7 @@
 from fastapi import FastAPI, Depends
 from pydantic import BaseModel
 from typing import Optional, Literal
-from app.core.config import settings
+from app.core.config.settings import get_settings
 from app.agent.workflow import build_app, run_once
 
 # Import new components
@@ -33,6 +33,7 @@ class HealthCheck(BaseModel):
 @app.get("/health", response_model=HealthCheck)
 def health_check():
     """Enhanced health check with configuration info"""
+    settings = get_settings()
     return HealthCheck(
         status="healthy",
         environment=settings.environment,
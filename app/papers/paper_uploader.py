@@ -1,18 +1,23 @@
-import os, argparse, glob, subprocess, shlex
+import os, re, argparse, glob
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
-from neo4j import GraphDatabase
 from pdfminer.high_level import extract_text
 from app.papers.topic_suggester import suggest_topics
+from app.vector.astra_doc_ingest import ingest_files
+from app.graph.graph_rag import get_driver
 
 load_dotenv()
 
+_DOI_RE = re.compile(r"10\.[0-9]{4,9}/[-._;()/:A-Za-z0-9]+")
+_YEAR_RE = re.compile(r"(19|20)[0-9]{2}")
+
 def _neo_session():
-    from app.graph.graph_rag import URI, USER, PWD
-    return GraphDatabase.driver(URI, auth=(USER, PWD)).session()
+    # Sessions come from the shared, pooled driver - no per-call handshake
+    return get_driver().session()
 
 def _first_page_text(path: str) -> str:
-    txt = extract_text(path) or ""
+    # Only the first page is needed for title/DOI/year - stop layout analysis there
+    txt = extract_text(path, maxpages=1) or ""
     return txt[:3000]
 
 def _guess_meta(txt: str, pdf_path: str, source: Optional[str]) -> Dict:
@@ -20,11 +25,10 @@ def _guess_meta(txt: str, pdf_path: str, source: Optional[str]) -> Dict:
     lines = [l.strip() for l in txt.splitlines() if l.strip()]
     if lines:
         meta["title"] = lines[0][:300]
-    import re
-    m = re.search(r"10\.[0-9]{4,9}/[-._;()/:A-Za-z0-9]+", txt)
+    m = _DOI_RE.search(txt)
     if m:
         meta["doi"] = m.group(0)[:200]
-    ym = re.search(r"(19|20)[0-9]{2}", txt)
+    ym = _YEAR_RE.search(txt)
     if ym:
         meta["year"] = int(ym.group(0))
     if not meta["title"]:
@@ -45,11 +49,11 @@ MERGE (p)-[:ADDRESSES_TOPIC]->(topic)
               doi=meta.get("doi"), url=meta.get("url"), source=meta.get("source"),
               topics=topics or [])
 
-def _ingest_to_astra(pdf_path: str, source_tag: str):
-    cmd = f"python -m app.vector.astra_doc_ingest --files {shlex.quote(pdf_path)} --source_tag {shlex.quote(source_tag)}"
-    rc = subprocess.call(cmd, shell=True)
-    if rc != 0:
-        raise SystemExit(f"Astra ingestion failed for {pdf_path} (rc={rc})")
+def _ingest_to_astra(pdf_paths: List[str], source_tag: str) -> int:
+    try:
+        return ingest_files(pdf_paths, source_tag=source_tag)
+    except Exception as e:
+        raise SystemExit(f"Astra ingestion failed for {len(pdf_paths)} PDFs: {e}")
 
 def main():
     ap = argparse.ArgumentParser()
@@ -64,8 +68,7 @@ def main():
         paths.append(args.pdf)
     if args.pdfs:
         for p in args.pdfs:
-            import glob as _glob
-            paths.extend(_glob.glob(p))
+            paths.extend(glob.glob(p))
 
     if not paths:
         raise SystemExit("No PDFs provided. Use --pdf or --pdfs.")
@@ -81,8 +84,11 @@ def main():
         meta = _guess_meta(txt, p, args.source)
         use_topics = topics[:] if topics else suggest_topics(txt, top_k=6)
         _upsert_paper(meta, use_topics)
-        _ingest_to_astra(p, source_tag=args.source)
-        print(f"Uploaded Paper node + Astra doc: {meta.get('title')} ({p}) | topics={use_topics}")
+        print(f"Uploaded Paper node: {meta.get('title')} ({p}) | topics={use_topics}")
+
+    # One batched Astra ingest for all PDFs
+    inserted = _ingest_to_astra(paths, source_tag=args.source)
+    print(f"Inserted {inserted} Astra docs.")
 
 if __name__ == "__main__":
     main()
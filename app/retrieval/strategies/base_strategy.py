@@ -1,7 +1,7 @@
 from abc import abstractmethod
 from typing import Dict, Any, Optional
 from app.core.interfaces import RetrievalInterface, KnowledgeGraphInterface
-from app.core.config.settings import settings
+from app.core.config.settings import get_settings
 
 class BaseRetrievalStrategy(RetrievalInterface):
     """
@@ -14,6 +14,7 @@ class BaseRetrievalStrategy(RetrievalInterface):
                  vector_client: Optional[Any] = None):
         self.kg_client = kg_client
         self.vector_client = vector_client
+        settings = get_settings()
         self.graph_weight = settings.graph_weight
         self.astra_weight = settings.astra_weight
     
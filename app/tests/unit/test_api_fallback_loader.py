@@ -0,0 +1,21 @@
+"""Unit tests for the fallback loader's datasets"""
+import importlib
+import sys
+
+import pytest
+
+
+def _load_module(monkeypatch):
+    monkeypatch.setenv("NEO4J_PASSWORD", "test")
+    sys.modules.pop("app.graph.api_fallback_loader", None)
+    return importlib.import_module("app.graph.api_fallback_loader")
+
+
+def test_validate_types_numbers_and_rejects_strings(monkeypatch):
+    """Numeric dataset fields are cast to their stored types, and strings are rejected"""
+    loader = _load_module(monkeypatch)
+    row = loader._validate("wells", {"well_id": "W1", "total_depth": 12000.0, "latitude": 31, "longitude": None})
+    assert row == {"well_id": "W1", "total_depth": 12000, "latitude": 31.0, "longitude": None}
+    assert isinstance(row["total_depth"], int) and isinstance(row["latitude"], float)
+    with pytest.raises(ValueError):
+        loader._validate("wells", {"well_id": "W1", "total_depth": "12000"})
@@ -0,0 +1,33 @@
+"""Unit tests for prompt context compression"""
+import pytest
+
+from app.llm.context_compress import compress_context, estimate_tokens
+
+CONTEXT = {
+    "well_info": {"well_id": "W1", "location": "TX"},
+    "formations": [{"name": "Eagle Ford", "depth": [8000, 9000]}],
+    "docs": [
+        {"snippet": "Vibration rises with RPM in shale. The rig was painted blue. Lower RPM cut cost."},
+        {"snippet": "Vibration rises with RPM in shale. The rig was painted blue. Lower RPM cut cost."},
+        {"snippet": "Mud weight controls wellbore stability. Crews rotate weekly."}
+    ]
+}
+
+
+def test_dedupes_docs_and_keeps_relevant_sentences():
+    """Duplicate docs are dropped and only top-ranked sentences survive"""
+    block = compress_context(CONTEXT, "reduce vibration and cost", token_budget=6000, top_k=2)
+    assert block.count("Document ") == 2
+    assert "painted blue" not in block
+    assert "Vibration rises with RPM" in block
+    assert '"name":"Eagle Ford"' in block
+
+
+def test_respects_token_budget():
+    """Output stays within the budget and raises when the graph alone is too big"""
+    block = compress_context(CONTEXT, "vibration", token_budget=90, top_k=3)
+    assert estimate_tokens(block) <= 90
+    assert "Document 1:" in block
+
+    with pytest.raises(ValueError):
+        compress_context(CONTEXT, "vibration", token_budget=10)
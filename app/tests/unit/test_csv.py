@@ -0,0 +1,20 @@
+"""Unit tests for the connectors' streaming CSV reader"""
+from pyarrow import csv as pacsv
+
+from app.connectors import _csv, rrc_loader
+
+
+def test_pinned_types_survive_later_blocks(tmp_path, monkeypatch):
+    """A value that breaks the first block's inferred type loads, and leading zeros are kept"""
+    # Tiny blocks so the text API number lands well after the first one
+    monkeypatch.setattr(_csv, "_READ_OPTIONS", pacsv.ReadOptions(block_size=64))
+    path = tmp_path / "rrc.csv"
+    path.write_text("API_NUMBER,OPERATOR\n" + "0512345,Acme\n" * 50 + "42-X1,Acme\n")
+
+    rows = [row for batch in _csv.iter_csv_records(str(path), transform=rrc_loader.normalize_columns,
+                                                   column_types=rrc_loader._COLUMN_TYPES)
+            for row in batch]
+
+    assert len(rows) == 51
+    assert rows[0]["well_id"] == "0512345"
+    assert rows[-1]["well_id"] == "42-X1"
@@ -0,0 +1,80 @@
+"""Unit tests for the execution-level run cache"""
+import sys
+import types
+
+import pytest
+
+from app.agent import workflow
+from app.agent.execution_cache import ExecutionCache, execution_key
+
+
+class FakeApp:
+    """Stands in for a compiled graph: counts invocations and returns a fixed final state"""
+
+    def __init__(self, passes=True):
+        self.calls = 0
+        self.passes = passes
+
+    def invoke(self, state):
+        self.calls += 1
+        return {**state, "loop": 1, "validation": {"passes": self.passes, "violations": []}}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ExecutionCache(path=str(tmp_path / "runs.sqlite"))
+    monkeypatch.setattr(workflow, "get_execution_cache", lambda: cache)
+    monkeypatch.setitem(sys.modules, "app.graph.graph_rag",
+                        types.SimpleNamespace(get_graph_snapshot_version=lambda well_id: "v1"))
+    return cache
+
+
+def _register(app, graph_weight=0.7, profile=None):
+    workflow._APP_SETTINGS[app] = (workflow.WorkflowConfig(graph_weight, 1 - graph_weight), profile)
+    return app
+
+
+def test_hit_miss_and_expiry(tmp_path):
+    """Stored results are served until they expire; other keys miss"""
+    cache = ExecutionCache(path=str(tmp_path / "runs.sqlite"))
+    key = execution_key("W1", "min cost", 5, "v1", "0.7")
+    cache.set(key, {"plan_id": "p1"})
+    assert cache.get(key) == {"plan_id": "p1"}
+    assert cache.get(execution_key("W1", "min cost", 5, "v1", "0.5")) is None
+
+    cache.set(key, {"plan_id": "p1"}, ttl=0)
+    assert cache.get(key) is None
+
+
+def test_run_once_serves_passing_runs_and_force_replans(cache):
+    """A passing run is served from the cache; force re-plans it"""
+    app = _register(FakeApp())
+    first = workflow.run_once(app, "W1", "min cost", enable_monitoring=False)
+    second = workflow.run_once(app, "W1", "min cost", enable_monitoring=False)
+    assert app.calls == 1
+    assert second["cached"] and second["plan_id"] == first["plan_id"]
+
+    workflow.run_once(app, "W1", "min cost", enable_monitoring=False, force=True)
+    assert app.calls == 2
+
+
+def test_run_once_skips_failed_runs_and_scopes_by_app(cache):
+    """Failed runs are not stored, and differently configured apps never share entries"""
+    failing = _register(FakeApp(passes=False))
+    workflow.run_once(failing, "W1", "min cost", enable_monitoring=False)
+    workflow.run_once(failing, "W1", "min cost", enable_monitoring=False)
+    assert failing.calls == 2
+
+    graph_heavy = _register(FakeApp(), graph_weight=0.9)
+    astra_heavy = _register(FakeApp(), graph_weight=0.2)
+    workflow.run_once(graph_heavy, "W1", "min cost", enable_monitoring=False)
+    workflow.run_once(astra_heavy, "W1", "min cost", enable_monitoring=False)
+    assert (graph_heavy.calls, astra_heavy.calls) == (1, 1)
+
+
+def test_specialized_app_rejects_other_objectives_before_invoking(cache):
+    """Mismatched objectives fail fast instead of after retrieval and compression"""
+    app = _register(FakeApp(), profile=workflow.ObjectiveProfile(objectives="min cost", prompt_header="h"))
+    with pytest.raises(ValueError):
+        workflow.run_once(app, "W1", "max ROP", enable_monitoring=False)
+    assert app.calls == 0
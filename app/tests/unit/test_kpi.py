@@ -0,0 +1,66 @@
+"""Unit tests for KPI plan parsing and scoring"""
+import pytest
+
+from app.evaluation import kpi
+from app.evaluation.kpi import KPICalculator
+
+TEXT_PLAN = "Section 1\nWOB: 30\nrpm 120.5\nFlow: 600 gpm\nBit: PDC 8.5in\nmotor: 1.5 deg bend\n"
+
+
+def test_parse_text_plan_extracts_parameters_and_bha():
+    """Parameters are read case-insensitively and each BHA line becomes a component"""
+    plan = KPICalculator()._parse_text_plan(TEXT_PLAN)
+    assert plan["parameters"] == {"wob": 30.0, "rpm": 120.5, "flow_rate": 600.0}
+    assert plan["bha_components"] == [
+        {"type": "bit", "description": "PDC 8.5in"},
+        {"type": "motor", "description": "1.5 deg bend"},
+    ]
+
+
+def test_parse_text_plan_keeps_first_value_and_skips_missing():
+    """The first occurrence of a parameter wins; absent parameters are left out"""
+    plan = KPICalculator()._parse_text_plan("WOB: 25\nnotes\nWOB: 40\n")
+    assert plan["parameters"] == {"wob": 25.0}
+    assert plan["bha_components"] == []
+
+
+def test_compute_kpis_serves_repeats_from_cache():
+    """Identical inputs hit the cache and callers cannot mutate the cached result"""
+    calculator = KPICalculator()
+    validation = {"violations": 1, "confidence": 0.8, "passes": False}
+    first = calculator.compute_kpis(TEXT_PLAN, validation, "W1")
+    first["kpi_cost"] = -1.0
+    second = calculator.compute_kpis(TEXT_PLAN, validation, "W1")
+    assert second["kpi_cost"] != -1.0
+    assert len(calculator._kpi_cache) == 1
+
+    calculator.clear_cache()
+    assert len(calculator._kpi_cache) == 0
+
+
+def test_compute_kpis_batch_matches_scalar_path():
+    """The vectorized batch gives the same headline KPIs as compute_kpis per plan"""
+    calculator = KPICalculator(cache_size=0)
+    texts = [TEXT_PLAN, "WOB: 60\nRPM: 180\n", "Flow: 400\nbit: tricone\nmwd: gamma\nlwd: res\n"]
+    validations = [
+        {"violations": 0, "confidence": 0.9, "passes": True},
+        {"violations": 3, "confidence": 0.5, "passes": False, "critical_violations": 1, "hydraulics_ok": False},
+        {"violations": 1, "confidence": 0.7, "passes": False},
+    ]
+    batch = calculator.compute_kpis_batch([calculator._parse_plan(t) for t in texts], validations)
+    for i, (text, validation) in enumerate(zip(texts, validations)):
+        scalar = calculator.compute_kpis(text, validation)
+        for name in ("kpi_overall", "kpi_cost", "kpi_risk", "kpi_rop", "kpi_safety"):
+            assert batch[name][i] == pytest.approx(scalar[name])
+
+
+def test_enhanced_compute_kpis_reuses_one_calculator():
+    """The module-level entry point keeps its cache between calls until cleared"""
+    validation = {"violations": 0, "confidence": 0.9, "passes": True}
+    kpi.clear_kpi_cache()
+    kpi.enhanced_compute_kpis(TEXT_PLAN, validation, "W1")
+    kpi.enhanced_compute_kpis(TEXT_PLAN, validation, "W1")
+    assert len(kpi._shared_calculator(None, None)._kpi_cache) == 1
+
+    kpi.clear_kpi_cache()
+    assert len(kpi._shared_calculator(None, None)._kpi_cache) == 0
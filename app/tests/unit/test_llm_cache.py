@@ -0,0 +1,30 @@
+"""Unit tests for the LLM response cache"""
+from app.llm.cache import ResponseCache
+
+PREFIX = "You are an expert drilling engineer.\n\n"
+
+
+def test_exact_hit():
+    """Identical prompts are served from the exact tier"""
+    cache = ResponseCache()
+    cache.set(PREFIX + "well A", "plan A")
+    assert cache.get(PREFIX + "well A") == "plan A"
+    assert cache.get(PREFIX + "well B") is None
+
+
+def test_similarity_hit_requires_same_scope():
+    """Near-duplicate suffixes hit only within the same scope"""
+    cache = ResponseCache(similarity_threshold=0.8)
+    suffix = "OBJECTIVES: minimize cost and vibration FORMATIONS: Eagle Ford 8000-9000 ft"
+    cache.set(PREFIX + suffix, "plan", suffix, scope="W1")
+
+    similar = suffix + " shale"
+    assert cache.get(PREFIX + similar, similar, scope="W1") == "plan"
+    assert cache.get(PREFIX + similar, similar, scope="W2") is None
+
+
+def test_expired_entries_are_dropped():
+    """Entries with a non-positive TTL are never served"""
+    cache = ResponseCache()
+    cache.set(PREFIX + "well A", "plan A", ttl=0)
+    assert cache.get(PREFIX + "well A") is None
@@ -1,4 +1,7 @@
 import os, argparse, requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup as BS
 from dotenv import load_dotenv
@@ -7,6 +10,10 @@ from app.vector.doc_parsers import read_text_any
 
 load_dotenv()
 
+_FETCH_WORKERS = 8
+_INSERT_CHUNK_SIZE = 20
+
+@lru_cache(maxsize=1)
 def _collection():
     client = DataAPIClient()
     db = client.get_database(os.environ["ASTRA_DB_API_ENDPOINT"], token=os.environ["ASTRA_DB_APPLICATION_TOKEN"])
@@ -20,11 +27,43 @@ def _fetch_url(url: str):
     r.raise_for_status()
     ct = r.headers.get("content-type","").lower()
     if "text/html" in ct:
-        return BS(r.text, "html.parser").get_text(" ")
+        return BS(r.text, "lxml").get_text(" ")
     if any(x in ct for x in ["text/plain", "markdown"]):
         return r.text
     return None
 
+def _file_docs(paths: List[str], source_tag: str) -> List[Dict]:
+    # Reads are I/O bound - overlap them
+    with ThreadPoolExecutor(max_workers=_FETCH_WORKERS) as pool:
+        bodies = list(pool.map(_read_local, paths))
+    docs = []
+    for fp, body in zip(paths, bodies):
+        doc = {"source": source_tag, "path": fp}
+        if body: doc["body"] = body
+        docs.append(doc)
+    return docs
+
+def _url_docs(urls: List[str], source_tag: str) -> List[Dict]:
+    with ThreadPoolExecutor(max_workers=_FETCH_WORKERS) as pool:
+        bodies = list(pool.map(_fetch_url, urls))
+    docs = []
+    for url, body in zip(urls, bodies):
+        doc = {"source": source_tag, "url": url}
+        if body: doc["body"] = body
+        docs.append(doc)
+    return docs
+
+def _insert(docs: List[Dict], coll=None) -> None:
+    (coll or _collection()).insert_many(docs, ordered=False, chunk_size=_INSERT_CHUNK_SIZE)
+
+def ingest_files(paths: List[str], source_tag: str, coll=None) -> int:
+    """Ingest local files into AstraDB with one batched insert. Returns the number of docs inserted."""
+    if not paths:
+        raise ValueError("No files to ingest.")
+    docs = _file_docs(paths, source_tag)
+    _insert(docs, coll)
+    return len(docs)
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--files", nargs="*", default=[])
@@ -32,26 +71,12 @@ def main():
     ap.add_argument("--source_tag", default="public")
     args = ap.parse_args()
 
-    coll = _collection()
-    docs = []
-
-    for fp in args.files:
-        body = _read_local(fp)
-        doc = {"source": args.source_tag, "path": fp}
-        if body: doc["body"] = body
-        docs.append(doc)
-
-    for url in args.urls:
-        body = _fetch_url(url)
-        doc = {"source": args.source_tag, "url": url}
-        if body: doc["body"] = body
-        docs.append(doc)
+    docs = _file_docs(args.files, args.source_tag) + _url_docs(args.urls, args.source_tag)
 
     if not docs:
         raise SystemExit("No docs to ingest.")
 
-    for d in docs:
-        coll.insert_one(d)
+    _insert(docs)
     print(f"Inserted {len(docs)} docs into AstraDB.")
 
 if __name__ == "__main__":
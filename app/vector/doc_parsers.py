@@ -16,7 +16,7 @@ def read_text_any(path: str) -> Optional[str]:
     if ext in [".html", ".htm"]:
         from bs4 import BeautifulSoup as BS
         html = open(path, "r", errors="ignore").read()
-        return BS(html, "html.parser").get_text(" ")
+        return BS(html, "lxml").get_text(" ")
     return None
 
 def _read_pdf(path: str) -> Optional[str]:
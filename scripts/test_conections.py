@@ -6,7 +6,8 @@ Test individual service connections to debug the issues
 def test_neo4j_connection():
     """Test Neo4j connection with current settings"""
     try:
-        from app.core.config.settings import settings
+        from app.core.config.settings import get_neo4j_settings
+        settings = get_neo4j_settings()
         from neo4j import GraphDatabase
         
         print("🧪 Testing Neo4j Connection...")
@@ -35,7 +36,8 @@ def test_neo4j_connection():
 def test_astra_connection():
     """Test AstraDB connection"""
     try:
-        from app.core.config.settings import settings
+        from app.core.config.settings import get_astra_settings
+        settings = get_astra_settings()
         from astrapy import DataAPIClient
         
         print("🧪 Testing AstraDB Connection...")
@@ -82,7 +84,8 @@ def test_watsonx_connection():
 def create_astra_collection():
     """Create the AstraDB collection if it doesn't exist"""
     try:
-        from app.core.config.settings import settings
+        from app.core.config.settings import get_astra_settings
+        settings = get_astra_settings()
         from astrapy import DataAPIClient
         
         print("🔧 Creating AstraDB Collection...")
@@ -91,7 +91,8 @@ def validate_new_features():
     
     try:
         # Test settings
-        from app.core.config.settings import settings
+        from app.core.config.settings import get_settings
+        settings = get_settings()
         print(f"   ✅ Settings loaded: env={settings.environment}")
         
         # Test interfaces
@@ -41,7 +41,8 @@ def validate_settings_secure():
     print("=" * 60)
     
     try:
-        from app.core.config.settings import settings
+        from app.core.config.settings import get_settings
+        settings = get_settings()
         print("✅ Settings module imported successfully")
         
         print(f"\n📋 Configuration Overview:")
@@ -108,7 +109,7 @@ def test_core_imports_secure():
     
     import_tests = [
         ("RetrievalInterface", "app.core.interfaces", "RetrievalInterface"),
-        ("Settings", "app.core.config.settings", "settings"),
+        ("Settings", "app.core.config.settings", "get_settings"),
         ("DrillingOntology", "app.domain.ontology.drilling_ontology", "DrillingOntology"),
         ("ConstraintFirstStrategy", "app.retrieval.strategies", "ConstraintFirstStrategy"),
         ("Original Workflow", "app.agent.workflow", "build_app"),
@@ -119,9 +119,10 @@ def test_environment_variable_impact():
             # Test node_draft with this configuration
             try:
                 test_state = base_state.copy()
+                # Nodes return only the keys they update
                 result_state = node_draft(test_state)
                 
-                if result_state["draft"]:
+                if result_state.get("draft"):
                     print(f"   ✅ Generated draft ({len(result_state['draft'])} chars)")
                     
                     # Check if weight note appears in draft